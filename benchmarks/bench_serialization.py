@@ -0,0 +1,90 @@
+"""
+Response serialization benchmark: FastAPI's response_model path vs FastJSONResponse.
+
+    python -m benchmarks.bench_serialization
+
+The response_model path is reproduced step by step: dump the returned model, validate it again,
+dump it in JSON mode and json.dumps it in JSONResponse. The fast path encodes the model directly.
+"""
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from src.agent_orchestrator.api.models import AgentResult, OrchestrationResponse
+from src.agent_orchestrator.api.responses import FastJSONResponse, orjson
+
+ADAPTER = TypeAdapter(OrchestrationResponse)
+
+
+def analysis_result(n_columns: int, rng: np.random.Generator, as_numpy: bool = False) -> Dict[str, Any]:
+    values = rng.normal(size=(n_columns, 5))
+    if not as_numpy:
+        values = values.tolist()
+    columns = [f"col_{i}" for i in range(n_columns)]
+    return {
+        "stats": {col: {"mean": v[0], "std": v[1], "min": v[2], "max": v[3]} for col, v in zip(columns, values)},
+        "trends": {col: {"trend": "neutral", "corr": v[4]} for col, v in zip(columns, values)},
+        "insights": [f"{col} is trending upward." for col in columns[:10]],
+        "score": 0.7,
+    }
+
+
+def make_response(n_columns: int, as_numpy: bool = False) -> OrchestrationResponse:
+    rng = np.random.default_rng(42)
+    research = {"output": [{"token_str": f"w{i}", "score": 0.1 * i, "sequence": "x " * 20} for i in range(5)],
+                "citations": [], "score": 0.5}
+    analysis = analysis_result(n_columns, rng, as_numpy)
+    decision = {"decision": "proceed", "avg_confidence": 0.6, "human_review": False,
+                "details": {"research": research, "analysis": analysis}}
+    return OrchestrationResponse(workflow_id="bench", elapsed=0.1, results=[
+        AgentResult(agent_id="research", success=True, result=research, task_id="0"),
+        AgentResult(agent_id="analysis", success=True, result=analysis, task_id="1"),
+        AgentResult(agent_id="decision", success=True, result=decision, task_id="2"),
+    ])
+
+
+def response_model_path(response: OrchestrationResponse) -> bytes:
+    content = response.model_dump(by_alias=True)
+    value = ADAPTER.validate_python(content)
+    return JSONResponse(ADAPTER.dump_python(value, mode="json", by_alias=True)).body
+
+
+def fast_path(response: OrchestrationResponse) -> bytes:
+    return FastJSONResponse(response).body
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(repeat: int = 20) -> List[Dict[str, float]]:
+    rows = []
+    for n_columns in [10, 100, 1_000, 10_000]:
+        response = make_response(n_columns)
+        numpy_response = make_response(n_columns, as_numpy=True)
+        current = timed(lambda: response_model_path(response), repeat)
+        fast = timed(lambda: fast_path(response), repeat)
+        rows.append({
+            "columns": n_columns,
+            "bytes": len(fast_path(response)),
+            "response_model_ms": current * 1000,
+            "fast_ms": fast * 1000,
+            # The response_model path cannot encode NumPy values at all
+            "fast_numpy_ms": timed(lambda: fast_path(numpy_response), repeat) * 1000,
+            "speedup": current / fast if fast else float("inf"),
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"encoder: {'orjson ' + orjson.__version__ if orjson else 'json (stdlib fallback)'}")
+    print(f"{'columns':>8} {'bytes':>10} {'response_model ms':>18} {'fast ms':>9} {'fast numpy ms':>14} {'speedup':>8}")
+    for row in run():
+        print(f"{row['columns']:>8} {row['bytes']:>10} {row['response_model_ms']:>18.3f} {row['fast_ms']:>9.3f} "
+              f"{row['fast_numpy_ms']:>14.3f} {row['speedup']:>8.1f}")
@@ -0,0 +1,149 @@
+"""
+Local stand-in for the Hugging Face Inference API, for load tests that must not spend quota.
+
+    python -m benchmarks.fake_hf_server --port 8081 --latency lognormal:80,0.5 --error-rate 0.01 \
+        --rate-limit-rate 0.02 --cold-start 5
+    HUGGINGFACE_API_URL=http://127.0.0.1:8081/models/ uvicorn src.agent_orchestrator.api.main:app
+
+POST /models/{model} accepts {"inputs": str | [str, ...], "parameters": {...}} like the real API;
+a list of inputs returns a list of outputs in the same order. GET /stats shows what was served.
+"""
+import argparse
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def latency_sampler(spec: str, rng: random.Random) -> Callable[[], float]:
+    """
+    Latency distribution in milliseconds, returned in seconds:
+    fixed:MS, uniform:LOW,HIGH, normal:MEAN,STD, lognormal:MEDIAN,SIGMA, exponential:MEAN
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    if kind == "fixed":
+        return lambda: values[0] / 1000
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1]) / 1000
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(values[0], values[1])) / 1000
+    if kind == "lognormal":
+        return lambda: rng.lognormvariate(math.log(values[0]), values[1]) / 1000
+    if kind == "exponential":
+        return lambda: rng.expovariate(1 / values[0]) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class FakeInferenceConfig:
+    def __init__(self, latency: str = "fixed:50", batch_item_ms: float = 2.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, loading_rate: float = 0.0, cold_start: float = 0.0,
+                 rps_limit: Optional[float] = None, max_batch_size: int = 64, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+        self.latency_spec = latency
+        self.latency = latency_sampler(latency, self.rng)
+        self.batch_item_ms = batch_item_ms  # extra latency per additional input in a batch
+        self.error_rate = error_rate  # 500s
+        self.rate_limit_rate = rate_limit_rate  # random 429s
+        self.loading_rate = loading_rate  # random 503 "model is loading"
+        self.cold_start = cold_start  # seconds each model answers 503 after its first request
+        self.rps_limit = rps_limit  # token bucket over all requests; excess gets 429
+        self.max_batch_size = max_batch_size
+
+
+def create_app(config: FakeInferenceConfig) -> FastAPI:
+    app = FastAPI(title="Fake Hugging Face Inference API")
+    stats: Counter = Counter()
+    first_seen: Dict[str, float] = {}
+    bucket = {"tokens": config.rps_limit or 0.0, "at": time.monotonic()}
+
+    def over_rate_limit() -> bool:
+        if not config.rps_limit:
+            return False
+        now = time.monotonic()
+        bucket["tokens"] = min(config.rps_limit, bucket["tokens"] + (now - bucket["at"]) * config.rps_limit)
+        bucket["at"] = now
+        if bucket["tokens"] < 1:
+            return True
+        bucket["tokens"] -= 1
+        return False
+
+    def output(text: str, model: str) -> List[Dict[str, Any]]:
+        # Shaped so ResearchAgent finds sources to cite
+        return [{
+            "generated_text": f"[{model}] {text[:200]}",
+            "sources": [{"title": f"Source for {text[:40]}", "date": "2024-01-01"}],
+        }]
+
+    @app.post("/models/{model:path}")
+    async def infer(model: str, request: Request):
+        stats["requests"] += 1
+        body = await request.json()
+        inputs: Union[str, List[str]] = body.get("inputs", "")
+        batch = inputs if isinstance(inputs, list) else [inputs]
+        now = time.monotonic()
+        first_seen.setdefault(model, now)
+
+        if over_rate_limit() or config.rng.random() < config.rate_limit_rate:
+            stats["429"] += 1
+            return JSONResponse({"error": "Rate limit reached. You reached free usage limit (reset hourly)."},
+                                status_code=429, headers={"Retry-After": "1"})
+        loading_left = config.cold_start - (now - first_seen[model])
+        if loading_left > 0 or config.rng.random() < config.loading_rate:
+            stats["503"] += 1
+            return JSONResponse({"error": f"Model {model} is currently loading",
+                                 "estimated_time": round(max(loading_left, 1.0), 1)}, status_code=503)
+        if len(batch) > config.max_batch_size:
+            stats["400"] += 1
+            return JSONResponse({"error": f"Batch size {len(batch)} exceeds {config.max_batch_size}"}, status_code=400)
+
+        await asyncio.sleep(config.latency() + config.batch_item_ms * (len(batch) - 1) / 1000)
+        if config.rng.random() < config.error_rate:
+            stats["500"] += 1
+            return JSONResponse({"error": "Internal server error"}, status_code=500)
+
+        stats["200"] += 1
+        stats["inputs"] += len(batch)
+        if isinstance(inputs, list):
+            stats["batched_requests"] += 1
+            return [output(text, model) for text in batch]
+        return output(inputs, model)
+
+    @app.get("/stats")
+    async def get_stats():
+        return {"latency": config.latency_spec, **stats}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Hugging Face Inference API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", default="fixed:50", help="fixed:MS | uniform:LO,HI | normal:MEAN,STD | lognormal:MEDIAN,SIGMA | exponential:MEAN")
+    parser.add_argument("--batch-item-ms", type=float, default=2.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--loading-rate", type=float, default=0.0)
+    parser.add_argument("--cold-start", type=float, default=0.0)
+    parser.add_argument("--rps-limit", type=float, default=None)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+    config = FakeInferenceConfig(
+        latency=args.latency, batch_item_ms=args.batch_item_ms, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, loading_rate=args.loading_rate, cold_start=args.cold_start,
+        rps_limit=args.rps_limit, max_batch_size=args.max_batch_size, seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Timing, result files and baseline comparison shared by the benchmark suite.
+"""
+import asyncio
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+
+def measure(fn: Callable, min_time: float = 0.2, max_iterations: int = 1000, warmup: int = 1) -> Dict[str, float]:
+    """
+    Call fn (sync, or async run on a fresh loop) until min_time has elapsed or max_iterations samples
+    are taken. Very fast calls are repeated within a sample (at least SAMPLE_TIME per sample) so timer
+    resolution and loop overhead do not dominate. Returns per-call latency summary in milliseconds.
+    """
+    if inspect.iscoroutinefunction(fn):
+        return asyncio.run(measure_async(fn, min_time, max_iterations, warmup))
+    for _ in range(warmup):
+        fn()
+    number = _calibrate(time.perf_counter, fn)
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_iterations and (len(samples) < 3 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return summarize(samples, number)
+
+
+async def measure_async(fn: Callable, min_time: float = 0.2, max_iterations: int = 1000, warmup: int = 1) -> Dict[str, float]:
+    for _ in range(warmup):
+        await fn()
+    start = time.perf_counter()
+    await fn()
+    number = _repeats(time.perf_counter() - start)
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_iterations and (len(samples) < 3 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        for _ in range(number):
+            await fn()
+        samples.append((time.perf_counter() - start) / number)
+    return summarize(samples, number)
+
+
+SAMPLE_TIME = 0.001
+
+
+def _repeats(single: float) -> int:
+    return max(1, int(SAMPLE_TIME / single)) if single > 0 else 1000
+
+
+def _calibrate(clock: Callable[[], float], fn: Callable) -> int:
+    start = clock()
+    fn()
+    return _repeats(clock() - start)
+
+
+def summarize(samples: List[float], calls_per_sample: int = 1) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "iterations": len(ordered),
+        "calls_per_sample": calls_per_sample,
+        "median_ms": statistics.median(ordered) * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000,
+        "min_ms": ordered[0] * 1000,
+    }
+
+
+def case_key(result: Dict[str, Any]) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items()))
+    return f"{result['name']}[{params}]"
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=5).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def write_results(path: str, results: List[Dict[str, Any]]):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+
+
+def load_results(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+            threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Median latency of each case against the baseline run. A case regressed if it is more
+    than threshold (fraction) slower; cases missing from either side are reported as new/missing.
+    """
+    previous = {case_key(r): r for r in baseline}
+    rows = []
+    for result in results:
+        key = case_key(result)
+        before = previous.pop(key, None)
+        if before is None:
+            rows.append({"case": key, "status": "new", "median_ms": result["median_ms"]})
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        status = "regressed" if ratio > 1 + threshold else "improved" if ratio < 1 / (1 + threshold) else "same"
+        rows.append({"case": key, "status": status, "median_ms": result["median_ms"],
+                     "baseline_ms": before["median_ms"], "ratio": ratio})
+    rows.extend({"case": key, "status": "missing", "baseline_ms": r["median_ms"]} for key, r in previous.items())
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]):
+    print(f"{'case':<60} {'baseline ms':>12} {'now ms':>10} {'ratio':>7}  status")
+    for row in rows:
+        baseline = f"{row['baseline_ms']:.3f}" if "baseline_ms" in row else "-"
+        now = f"{row['median_ms']:.3f}" if "median_ms" in row else "-"
+        ratio = f"{row['ratio']:.2f}" if "ratio" in row else "-"
+        print(f"{row['case']:<60} {baseline:>12} {now:>10} {ratio:>7}  {row['status']}")
+
+
+def print_results(results: List[Dict[str, Any]]):
+    print(f"{'case':<60} {'median ms':>10} {'p95 ms':>10} {'iters':>6}")
+    for result in results:
+        print(f"{case_key(result):<60} {result['median_ms']:>10.3f} {result['p95_ms']:>10.3f} {result['iterations']:>6}")
@@ -0,0 +1,155 @@
+"""
+Open-loop load generator for POST /api/orchestrate.
+
+Requests are started on a fixed schedule (or Poisson arrivals) whether or not earlier ones
+have finished, and latency is measured from the scheduled start, so a saturated server shows
+up as growing latency instead of silently lowering the offered load.
+
+    python -m benchmarks.loadgen --rps 50 --duration 30
+    python -m benchmarks.loadgen --steps 10,25,50,100,200 --duration 15 --slo-ms 1000 --json out.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return float("nan")
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def build_request(n_tasks: int, query: str) -> Dict[str, Any]:
+    return {"tasks": [{"agent_id": "research", "query": query, "task_id": str(i)} for i in range(n_tasks)]}
+
+
+async def _one(client: httpx.AsyncClient, url: str, body: Dict[str, Any], scheduled: float,
+               latencies: List[float], errors: Counter):
+    try:
+        response = await client.post(url, json=body)
+        if response.status_code != 200:
+            errors[f"HTTP {response.status_code}"] += 1
+        elif not all(r.get("success") for r in response.json().get("results", [])):
+            # The API answered but an agent failed (e.g. upstream 429/503 after retries)
+            errors["agent_failure"] += 1
+        else:
+            latencies.append(time.perf_counter() - scheduled)
+            return
+    except httpx.TimeoutException:
+        errors["timeout"] += 1
+    except httpx.HTTPError as e:
+        errors[type(e).__name__] += 1
+
+
+async def run_level(url: str, rps: float, duration: float, body: Dict[str, Any], timeout: float,
+                    max_in_flight: int, poisson: bool = False, seed: Optional[int] = None,
+                    unique: bool = False) -> Dict[str, Any]:
+    """unique: give every request its own query so the API's inference cache cannot answer it"""
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors: Counter = Counter()
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        tasks = set()
+        start = time.perf_counter()
+        next_at = start
+        sent = 0
+        while next_at < start + duration:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(tasks) >= max_in_flight:
+                errors["client_overload"] += 1  # generator-side cap, the server never saw this one
+            else:
+                request_body = body
+                if unique:
+                    request_body = {"tasks": [dict(t, query=f"{t['query']} #{sent}") for t in body["tasks"]]}
+                task = asyncio.ensure_future(_one(client, url, request_body, next_at, latencies, errors))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            sent += 1
+            next_at += rng.expovariate(rps) if poisson else 1 / rps
+        if tasks:
+            await asyncio.wait(tasks)
+        elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    return {
+        "target_rps": rps,
+        "sent": sent,
+        "ok": len(ordered),
+        "errors": dict(errors),
+        "error_rate": (sent - len(ordered)) / sent if sent else 0.0,
+        "throughput_rps": len(ordered) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": (ordered[-1] * 1000) if ordered else float("nan"),
+    }
+
+
+def saturated(level: Dict[str, Any], slo_ms: Optional[float], max_error_rate: float) -> bool:
+    return (level["throughput_rps"] < 0.95 * level["target_rps"]
+            or level["error_rate"] > max_error_rate
+            or (slo_ms is not None and level["p99_ms"] > slo_ms))
+
+
+def print_level(level: Dict[str, Any]):
+    errors = ", ".join(f"{k}={v}" for k, v in sorted(level["errors"].items())) or "-"
+    print(f"{level['target_rps']:>8.1f} {level['throughput_rps']:>10.1f} {level['p50_ms']:>9.1f} "
+          f"{level['p95_ms']:>9.1f} {level['p99_ms']:>9.1f} {level['error_rate']:>7.1%}  {errors}")
+
+
+async def main_async(args) -> Dict[str, Any]:
+    body = build_request(args.tasks, args.query)
+    steps = [float(s) for s in args.steps.split(",")] if args.steps else [args.rps]
+    print(f"{'target':>8} {'achieved':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}  breakdown")
+    levels = []
+    saturation = None
+    for rps in steps:
+        level = await run_level(args.url, rps, args.duration, body, args.timeout, args.max_in_flight,
+                                poisson=args.poisson, seed=args.seed, unique=args.unique)
+        levels.append(level)
+        print_level(level)
+        if saturation is None and saturated(level, args.slo_ms, args.max_error_rate):
+            saturation = rps
+            if args.stop_at_saturation:
+                break
+    if len(steps) > 1:
+        print(f"saturation: {'not reached' if saturation is None else f'{saturation:g} rps'}")
+    return {"url": args.url, "tasks_per_request": args.tasks, "levels": levels, "saturation_rps": saturation}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for /api/orchestrate")
+    parser.add_argument("--url", default="http://localhost:8000/api/orchestrate/")
+    parser.add_argument("--rps", type=float, default=10.0)
+    parser.add_argument("--steps", help="comma-separated RPS levels to step through, e.g. 10,20,50,100")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per level")
+    parser.add_argument("--tasks", type=int, default=1, help="tasks per orchestration request")
+    parser.add_argument("--query", default="research the latest market information")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--unique", action="store_true", help="distinct query per request (bypasses the inference cache)")
+    parser.add_argument("--poisson", action="store_true", help="exponential inter-arrival times instead of fixed")
+    parser.add_argument("--slo-ms", type=float, default=None, help="p99 latency above this marks saturation")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--stop-at-saturation", action="store_true")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", help="write the report as JSON to this path")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Benchmark suite: router, workflow engine, AnalysisAgent, response serialization and the /api/orchestrate endpoint.
+Runs offline (agents are stubbed, no MongoDB or Hugging Face calls) and writes JSON results.
+
+    python -m benchmarks.suite --output benchmarks/results/latest.json
+    python -m benchmarks.suite --save-baseline benchmarks/results/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/results/baseline.json --fail-on-regression
+"""
+import argparse
+import asyncio
+import random
+import sys
+import warnings
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.bench_analysis_agent import make_frame
+from benchmarks.bench_serialization import make_response, response_model_path, fast_path
+from benchmarks.bench_task_router import make_table, make_query
+from benchmarks.harness import (
+    measure, measure_async, write_results, load_results, compare, print_results, print_comparison,
+)
+from src.agent_orchestrator.api.models import AgentTask, AgentResult, OrchestrationRequest
+from src.agent_orchestrator.agents.analysis_agent import AnalysisAgent
+from src.agent_orchestrator.core.agent_manager import AgentManager
+from src.agent_orchestrator.core.state_manager import StateManager
+from src.agent_orchestrator.core.task_router import TaskRouter
+from src.agent_orchestrator.core.workflow_engine import WorkflowEngine
+
+AGENTS = {
+    "research": ["research", "web", "search", "information"],
+    "analysis": ["analysis", "data", "statistics", "insights"],
+    "decision": ["decision", "recommendation", "synthesis"],
+}
+
+
+class StubAgent:
+    """Returns a canned result shaped like the real agent's, after an optional simulated I/O wait"""
+
+    RESULTS = {
+        "research": {"output": [], "citations": [], "score": 0.8},
+        "analysis": {"stats": {}, "trends": {}, "insights": ["x is trending upward."], "score": 0.7},
+        "decision": {"decision": "proceed", "avg_confidence": 0.75, "human_review": False},
+    }
+
+    def __init__(self, agent_type: str, latency: float = 0.0):
+        self.agent_type = agent_type
+        self.latency = latency
+
+    async def execute(self, task: AgentTask) -> AgentResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return AgentResult(agent_id=task.agent_id, success=True, result=dict(self.RESULTS[self.agent_type]))
+
+
+def stub_engine(latency: float = 0.0) -> WorkflowEngine:
+    manager = AgentManager()
+    for agent_type in AGENTS:
+        manager.add_replica(agent_type, StubAgent(agent_type, latency))
+    return WorkflowEngine(task_router=TaskRouter(agent_capabilities=AGENTS), agent_manager=manager,
+                          state_manager=StateManager())
+
+
+def make_request(n_tasks: int, chained: bool = False) -> OrchestrationRequest:
+    queries = ["research the market", "data analysis of sales", "decision on launch"]
+    tasks = []
+    for i in range(n_tasks):
+        depends_on = [str(i - 1)] if chained and i else []
+        tasks.append(AgentTask(agent_id="auto", query=queries[i % 3], task_id=str(i), depends_on=depends_on))
+    return OrchestrationRequest(tasks=tasks)
+
+
+# Each benchmark yields result dicts: {"group", "name", "params", <timing summary>}
+
+def bench_router(quick: bool) -> List[Dict[str, Any]]:
+    rng = random.Random(42)
+    results = []
+    sizes = [(3, 4), (50, 40)] if quick else [(3, 4), (10, 20), (50, 40), (100, 50)]
+    for n_agents, per_agent in sizes:
+        table = make_table(n_agents, per_agent, rng)
+        router = TaskRouter(agent_capabilities=table)
+        for n_words in ([10, 500] if quick else [10, 200, 2000]):
+            task = AgentTask(agent_id="bench", query=make_query(table, n_words, rng))
+
+            async def route():
+                await router.route_task(task)
+
+            timing = measure(route, min_time=0.1)
+            results.append({"group": "router", "name": "route_task",
+                            "params": {"capabilities": n_agents * per_agent, "query_words": n_words}, **timing})
+    return results
+
+
+def bench_engine(quick: bool) -> List[Dict[str, Any]]:
+    results = []
+
+    async def run_workflow_cases():
+        for n_tasks in ([1, 20] if quick else [1, 10, 50, 200]):
+            for chained in (False, True):
+                engine = stub_engine(latency=0.001)
+                req = make_request(n_tasks, chained)
+                timing = await measure_async(lambda: engine.run_workflow(req), min_time=0.2, max_iterations=200)
+                results.append({"group": "engine", "name": "run_workflow",
+                                "params": {"tasks": n_tasks, "chained": chained}, **timing})
+
+    async def run_full_workflow_cases():
+        for concurrent in ([1, 10] if quick else [1, 10, 50]):
+            engine = stub_engine(latency=0.001)
+            reqs = [OrchestrationRequest(workflow_id=f"wf{i}", tasks=[AgentTask(agent_id="research", query="research x")])
+                    for i in range(concurrent)]
+            timing = await measure_async(
+                lambda: asyncio.gather(*(engine.run_full_workflow(r) for r in reqs)), min_time=0.2, max_iterations=200
+            )
+            results.append({"group": "engine", "name": "run_full_workflow",
+                            "params": {"concurrent_workflows": concurrent}, **timing})
+
+    asyncio.run(run_workflow_cases())
+    asyncio.run(run_full_workflow_cases())
+    return results
+
+
+def bench_analysis(quick: bool) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(42)
+    agent = AnalysisAgent()
+    results = []
+
+    def analyze(df):
+        # Same steps as AnalysisAgent.execute, without the AgentTask wrapping
+        df = agent.preprocess_data(df)
+        block = agent.numeric_block(df)
+        stats = agent.compute_statistics(df, block)
+        trends = agent.detect_trends(df, block)
+        insights = agent.extract_insights(df, stats, trends)
+        return agent.get_confidence(df, stats, trends, insights)
+
+    shapes = [(100, 5), (10_000, 20)] if quick else [(100, 5), (10_000, 20), (100_000, 20), (1_000, 500)]
+    for rows, cols in shapes:
+        df = make_frame(rows, cols, rng)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            timing = measure(lambda: analyze(df), min_time=0.3, max_iterations=100)
+        results.append({"group": "analysis", "name": "analysis_agent", "params": {"rows": rows, "cols": cols}, **timing})
+    return results
+
+
+def bench_serialization(quick: bool) -> List[Dict[str, Any]]:
+    results = []
+    for n_columns in ([10, 1_000] if quick else [10, 100, 1_000, 10_000]):
+        response = make_response(n_columns)
+        for path, fn in (("response_model", response_model_path), ("fast", fast_path)):
+            timing = measure(lambda: fn(response), min_time=0.2, max_iterations=200)
+            results.append({"group": "serialization", "name": "orchestration_response",
+                            "params": {"columns": n_columns, "path": path}, **timing})
+    return results
+
+
+def bench_api(quick: bool) -> List[Dict[str, Any]]:
+    import httpx
+    from src.agent_orchestrator.api.main import create_app
+    from src.agent_orchestrator.api.dependencies import get_workflow_engine
+
+    results = []
+
+    async def cases():
+        app = create_app()
+        engine = stub_engine(latency=0.001)
+        app.dependency_overrides[get_workflow_engine] = lambda: engine
+        # ASGITransport does not run startup hooks, so no MongoDB connection is attempted
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for n_tasks in ([1, 20] if quick else [1, 10, 50]):
+                body = make_request(n_tasks).model_dump()
+
+                async def call():
+                    response = await client.post("/api/orchestrate/", json=body)
+                    response.raise_for_status()
+
+                timing = await measure_async(call, min_time=0.3, max_iterations=300)
+                results.append({"group": "api", "name": "post_orchestrate", "params": {"tasks": n_tasks}, **timing})
+
+    asyncio.run(cases())
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[bool], List[Dict[str, Any]]]] = {
+    "router": bench_router,
+    "engine": bench_engine,
+    "analysis": bench_analysis,
+    "serialization": bench_serialization,
+    "api": bench_api,
+}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Agent orchestrator benchmark suite")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="comma-separated groups: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--quick", action="store_true", help="smaller sizes, for a fast sanity run")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--save-baseline", help="write results as the new baseline to this path")
+    parser.add_argument("--baseline", help="compare against a stored baseline JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="regression threshold as a fraction (default 0.2)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    groups = [group.strip() for group in args.only.split(",")]
+    results = []
+    for group in groups:
+        results.extend(BENCHMARKS[group](args.quick))
+    print_results(results)
+    for path in filter(None, [args.output, args.save_baseline]):
+        write_results(path, results)
+
+    if args.baseline:
+        baseline = [r for r in load_results(args.baseline) if r["group"] in groups]
+        rows = compare(results, baseline, args.threshold)
+        print()
+        print_comparison(rows)
+        if args.fail_on_regression and any(r["status"] == "regressed" for r in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -38,7 +38,21 @@ def call_api(endpoint, method="GET", data=None):
             response = requests.get(url)
         elif method == "POST":
             response = requests.post(url, json=data)
-        return response.json() if response.status_code == 200 else None
+        return response.json() if response.ok else None
+    except Exception as e:
+        st.error(f"API Error: {str(e)}")
+        return None
+
+def upload_dataset(uploaded_file):
+    """Send an uploaded file to the dataset spool as raw bytes; returns {"dataset_id", "format", "bytes"}"""
+    try:
+        response = requests.post(
+            f"{API_BASE_URL}/datasets/",
+            params={"filename": uploaded_file.name},
+            data=uploaded_file,  # streamed from the file object, not decoded
+            headers={"Content-Type": "application/octet-stream"},
+        )
+        return response.json() if response.ok else None
     except Exception as e:
         st.error(f"API Error: {str(e)}")
         return None
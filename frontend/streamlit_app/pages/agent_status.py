@@ -4,54 +4,52 @@ st.title("🤖 Agent Status Dashboard")
 if st.button("🔄 Refresh Status"):
     st.rerun()
 
-# Mock agent data (replace with real API calls)
+def format_ago(seconds):
+    if seconds is None:
+        return "never"
+    if seconds < 60:
+        return f"{int(seconds)} secs ago"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} mins ago"
+    return f"{int(seconds // 3600)} hours ago"
+
+def format_uptime(seconds):
+    hours, rem = divmod(int(seconds), 3600)
+    return f"{hours}h {rem // 60}m"
+
+# Live numbers from the API's metrics registry (in-process since the API started)
+status = call_api("/agents/status")
+if not status:
+    st.warning("Agent status is unavailable; is the API running?")
+    st.stop()
+
 agents_data = {
-    "Research Agent": {
-        "status": "healthy",
-        "load": 2,
-        "max_load": 10,
-        "success_rate": 0.94,
-        "avg_response_time": 8.5,
-        "last_used": "2 mins ago"
-    },
-    "Analysis Agent": {
-        "status": "healthy", 
-        "load": 1,
-        "max_load": 8,
-        "success_rate": 0.89,
-        "avg_response_time": 12.3,
-        "last_used": "5 mins ago"
-    },
-    "Decision Agent": {
-        "status": "healthy",
-        "load": 0,
-        "max_load": 5,
-        "success_rate": 0.97,
-        "avg_response_time": 3.2,
-        "last_used": "1 hour ago"
-    }
+    f"{agent_id.capitalize()} Agent": data
+    for agent_id, data in status["agents"].items()
 }
 
 # Agent status cards
 st.subheader("🔍 Agent Overview")
 
-cols = st.columns(3)
+cols = st.columns(max(len(agents_data), 1))
 
 for idx, (agent_name, data) in enumerate(agents_data.items()):
     with cols[idx]:
         status_color = "🟢" if data["status"] == "healthy" else "🔴"
         st.markdown(f"### {status_color} {agent_name}")
-        
+
         # Metrics
         st.metric("Current Load", f"{data['load']}/{data['max_load']}")
-        st.metric("Success Rate", f"{data['success_rate']*100:.1f}%")
-        st.metric("Avg Response", f"{data['avg_response_time']}s")
-        
+        success_rate = data["success_rate"]
+        st.metric("Success Rate", f"{success_rate*100:.1f}%" if success_rate is not None else "n/a")
+        avg_response = data["avg_response_time"]
+        st.metric("Avg Response", f"{avg_response:.2f}s" if avg_response is not None else "n/a")
+
         # Load progress bar
-        load_percentage = data['load'] / data['max_load']
-        st.progress(load_percentage)
-        
-        st.caption(f"Last used: {data['last_used']}")
+        load_percentage = data['load'] / data['max_load'] if data['max_load'] else 0.0
+        st.progress(min(load_percentage, 1.0))
+
+        st.caption(f"Tasks: {data['tasks']} · Retries: {data['retries']} · Last used: {format_ago(data['last_used_seconds_ago'])}")
 
 # Performance metrics
 st.subheader("📊 Performance Metrics")
@@ -61,27 +59,63 @@ col1, col2 = st.columns(2)
 with col1:
     st.markdown("#### Success Rates")
     success_data = {
-        agent: data["success_rate"] * 100 
+        agent: data["success_rate"] * 100
         for agent, data in agents_data.items()
+        if data["success_rate"] is not None
     }
     st.bar_chart(success_data)
 
 with col2:
     st.markdown("#### Response Times")
-    response_data = {
-        agent: data["avg_response_time"] 
-        for agent, data in agents_data.items()
-    }
+    response_data = pd.DataFrame({
+        "avg (s)": {agent: data["avg_response_time"] or 0.0 for agent, data in agents_data.items()},
+        "p95 (s)": {agent: data["p95_response_time"] or 0.0 for agent, data in agents_data.items()},
+        "queue wait (s)": {agent: data["avg_queue_wait"] or 0.0 for agent, data in agents_data.items()},
+    })
     st.bar_chart(response_data)
 
+if status["upstream"]:
+    st.markdown("#### Hugging Face Latency")
+    st.dataframe(pd.DataFrame(status["upstream"]).T, use_container_width=True)
+
+# History, aggregated in MongoDB (one small query per refresh, cached briefly by the API)
+st.subheader("📈 History")
+
+window_label = st.selectbox("Window", ["Last hour", "Last 24 hours", "Last 7 days"], index=1)
+window, bucket = {"Last hour": (3600, 300), "Last 24 hours": (86400, 3600), "Last 7 days": (7 * 86400, 6 * 3600)}[window_label]
+history = call_api(f"/stats/agents?window={window}&bucket={bucket}")
+workflow_history = call_api(f"/stats/workflows?window={window}&bucket={bucket}")
+
+if history and history["rows"]:
+    rows = pd.DataFrame(history["rows"])
+    rows["bucket"] = pd.to_datetime(rows["bucket"])
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### Success Rate")
+        st.line_chart(rows.pivot(index="bucket", columns="agent_id", values="success_rate"))
+    with col2:
+        st.markdown("#### Avg Latency (s)")
+        st.line_chart(rows.pivot(index="bucket", columns="agent_id", values="avg_latency"))
+    st.markdown("#### Throughput (tasks/s)")
+    st.area_chart(rows.pivot(index="bucket", columns="agent_id", values="throughput"))
+else:
+    st.info("No stored agent results in this window.")
+
+if workflow_history and workflow_history["rows"]:
+    workflows = pd.DataFrame(workflow_history["rows"])
+    workflows["bucket"] = pd.to_datetime(workflows["bucket"])
+    st.markdown("#### Workflows: success and human-review rates")
+    st.line_chart(workflows.set_index("bucket")[["success_rate", "human_review_rate"]])
+
 # System health
 st.subheader("🏥 System Health")
 
+system = status["system"]
 health_metrics = {
-    "Total Requests": 1247,
-    "Active Workflows": 3,
-    "Queue Length": 2,
-    "Uptime": "23h 45m"
+    "Total Requests": system["total_tasks"],
+    "Active Workflows": system["active_workflows"],
+    "Queue Length": system["queued_tasks"] + system["queued_jobs"],
+    "Uptime": format_uptime(system["uptime_seconds"])
 }
 
 cols = st.columns(4)
@@ -24,7 +24,7 @@ with st.form("task_form"):
         # File upload for additional context
         uploaded_file = st.file_uploader(
             "Upload Context File (optional):",
-            type=['txt', 'csv', 'json', 'pdf']
+            type=['txt', 'csv', 'json', 'ndjson', 'jsonl', 'arrow', 'feather', 'parquet', 'pdf']
         )
         
         # Advanced parameters
@@ -51,23 +51,34 @@ with st.form("task_form"):
             ]
         }
         
-        # Add file content if uploaded
-        if uploaded_file:
-            file_content = uploaded_file.read().decode('utf-8')
+        # Datasets go to the API as raw bytes and are analyzed from the spool by id;
+        # plain text is still passed inline as research context
+        if uploaded_file and uploaded_file.name.lower().endswith(('.txt', '.json', '.pdf')):
+            file_content = uploaded_file.read().decode('utf-8', errors='replace')
             workflow_request["tasks"][0]["params"]["context"] = file_content
+        elif uploaded_file:
+            dataset = upload_dataset(uploaded_file)
+            if dataset:
+                workflow_request["tasks"].append({
+                    "agent_id": "analysis",
+                    "query": f"Data analysis of {uploaded_file.name}",
+                    "params": {"dataset_id": dataset["dataset_id"]}
+                })
+            else:
+                st.error("❌ Dataset upload failed")
         
-        # Submit to API
-        result = call_api("/orchestrate", "POST", workflow_request)
+        # Submit as a background job; the API returns as soon as it is queued
+        result = call_api("/orchestrate/jobs", "POST", workflow_request)
         
         if result:
-            st.success(f"✅ Workflow started! ID: {workflow_request['workflow_id']}")
-            st.session_state.workflows[workflow_request['workflow_id']] = {
-                "status": "running",
+            st.success(f"✅ Workflow queued! ID: {result['workflow_id']}")
+            st.session_state.workflows[result['workflow_id']] = {
+                "status": result["status"],
                 "created_at": datetime.now(),
                 "query": task_query,
                 "type": workflow_type
             }
-            st.session_state.current_workflow_id = workflow_request['workflow_id']
+            st.session_state.current_workflow_id = result['workflow_id']
             st.rerun()
         else:
             st.error("❌ Failed to start workflow")
@@ -75,6 +86,13 @@ with st.form("task_form"):
 # Recent workflows
 st.subheader("📋 Recent Workflows")
 if st.session_state.workflows:
+    # One quick status poll per unfinished workflow; nothing here waits on a workflow to finish
+    for wf_id, data in st.session_state.workflows.items():
+        if data["status"] in ("pending", "running"):
+            job = call_api(f"/orchestrate/jobs/{wf_id}")
+            if job:
+                data["status"] = job["status"]
+                data["results"] = job["results"]
     workflows_df = pd.DataFrame([
         {
             "Workflow ID": wf_id,
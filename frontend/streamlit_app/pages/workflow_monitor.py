@@ -1,11 +1,140 @@
+import altair as alt
+
 st.title("🔍 Workflow Monitor")
 
-# Auto-refresh toggle
-auto_refresh = st.sidebar.checkbox("Auto-refresh (5s)", value=True)
+# Live updates come from the API's server-sent event stream instead of rerunning on a timer
+live_updates = st.sidebar.checkbox("Live updates", value=True)
+
+if "workflow_events" not in st.session_state:
+    st.session_state.workflow_events = {}
+
+
+def progress_from_events(events):
+    """Fold step events into {step: {"agent", "status", "confidence", "time"}}"""
+    progress = {}
+    for event in events:
+        if event["type"] == "workflow_started":
+            for step in event["steps"]:
+                progress[step["step"]] = {"agent": step["agent_id"], "status": "pending", "confidence": 0.0, "time": "0s"}
+        elif event["type"] == "step":
+            entry = progress.setdefault(event["step"], {"agent": event.get("agent_id", event["step"]),
+                                                         "status": "pending", "confidence": 0.0, "time": "0s"})
+            entry["status"] = {"started": "running", "finished": "completed"}.get(event["status"], event["status"])
+            if event.get("confidence") is not None:
+                entry["confidence"] = event["confidence"]
+            if event.get("elapsed") is not None:
+                entry["time"] = f"{event['elapsed']:.1f}s"
+        elif event["type"] == "workflow_finished":
+            for step in event.get("steps", []):
+                if step["step"] in progress and progress[step["step"]]["status"] in ("pending", "running"):
+                    progress[step["step"]]["status"] = "completed" if step["success"] else "skipped"
+    return progress
+
+
+def render_progress(container, progress):
+    with container.container():
+        for step, data in progress.items():
+            agent_name = f"{data['agent'].title()} Agent ({step})"
+            col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
+
+            with col1:
+                if data["status"] == "completed":
+                    st.success(f"✅ {agent_name}")
+                elif data["status"] == "running":
+                    st.warning(f"⏳ {agent_name}")
+                elif data["status"] in ("error", "skipped"):
+                    st.error(f"❌ {agent_name}")
+                else:
+                    st.info(f"⏸️ {agent_name}")
+
+            with col2:
+                st.write(f"Status: {data['status'].title()}")
+
+            with col3:
+                if data["confidence"] > 0:
+                    st.write(f"Confidence: {data['confidence']:.2f}")
+                else:
+                    st.write("Confidence: N/A")
+
+            with col4:
+                st.write(f"Time: {data['time']}")
+
+
+def trace_rows(trace):
+    """Flatten spans into waterfall rows in tree order: parents above their children, siblings by start time"""
+    spans = trace["spans"]
+    if not spans:
+        return []
+    ids = {span["span_id"] for span in spans}
+    children = {}
+    for span in spans:
+        parent = span["parent_id"] if span["parent_id"] in ids else None
+        children.setdefault(parent, []).append(span)
+    t0 = min(span["start"] for span in spans)
+    rows = []
 
-if auto_refresh:
-    time.sleep(5)
-    st.rerun()
+    def visit(parent, depth):
+        for span in sorted(children.get(parent, []), key=lambda s: s["start"]):
+            attrs = span["attributes"]
+            detail = attrs.get("step") or attrs.get("agent") or attrs.get("status") or ""
+            end = span["end"] if span["end"] is not None else span["start"]
+            rows.append({
+                "order": len(rows),
+                # Numbered so repeated spans (retries, parallel tasks) get their own row
+                "span": f"{len(rows) + 1:>3}. {'  ' * depth}{span['name']}" + (f" ({detail})" if detail else ""),
+                "component": span["name"].split(".")[0],
+                "start_ms": (span["start"] - t0) * 1000,
+                "end_ms": (end - t0) * 1000,
+                "duration_ms": (end - span["start"]) * 1000,
+                "status": span["status"],
+            })
+            visit(span["span_id"], depth + 1)
+
+    visit(None, 0)
+    return rows
+
+
+def render_trace(container, workflow_id):
+    """Waterfall of the workflow's spans: routing, queueing, agents, inference calls, retries, db writes"""
+    trace = call_api(f"/orchestrate/jobs/{workflow_id}/trace")
+    with container.container():
+        if not trace:
+            st.info("No trace for this workflow yet (it may not have been sampled).")
+            return
+        rows = trace_rows(trace)
+        if not rows:
+            st.info("No spans recorded.")
+            return
+        chart_data = pd.DataFrame(rows)
+        chart = alt.Chart(chart_data).mark_bar(minBarLength=2).encode(
+            x=alt.X("start_ms:Q", title="ms since workflow start"),
+            x2="end_ms:Q",
+            y=alt.Y("span:N", sort=alt.SortField("order"), title=None,
+                    axis=alt.Axis(labelLimit=400)),
+            color=alt.Color("component:N", legend=alt.Legend(title="Component")),
+            tooltip=["span", alt.Tooltip("duration_ms:Q", format=".1f"), "status"],
+        ).properties(height=max(120, 22 * len(rows)))
+        st.altair_chart(chart, use_container_width=True)
+        if trace.get("dropped_spans"):
+            st.caption(f"{trace['dropped_spans']} spans dropped (TRACE_MAX_SPANS)")
+
+
+def stream_events(workflow_id, events, on_event):
+    """Consume the SSE stream, resuming after the last event already received"""
+    headers = {"Last-Event-ID": str(events[-1]["id"])} if events else {}
+    url = f"{API_BASE_URL}/orchestrate/jobs/{workflow_id}/events"
+    try:
+        with requests.get(url, headers=headers, stream=True, timeout=(3, 60)) as response:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data: "):
+                    continue
+                event = json.loads(line[len("data: "):])
+                events.append(event)
+                on_event()
+                if event["type"] == "workflow_finished":
+                    break
+    except requests.RequestException as e:
+        st.caption(f"Live updates paused: {e}")
 
 # Current workflow selector
 if st.session_state.workflows:
@@ -38,52 +167,23 @@ if st.session_state.workflows:
         # Workflow visualization
         st.subheader("🔄 Workflow Progress")
         
-        # Mock progress data (replace with real API calls)
-        progress_data = {
-            "Research Agent": {"status": "completed", "confidence": 0.85, "time": "12s"},
-            "Analysis Agent": {"status": "running", "confidence": 0.0, "time": "8s"},
-            "Decision Agent": {"status": "pending", "confidence": 0.0, "time": "0s"}
-        }
-        
-        for agent_name, data in progress_data.items():
-            with st.container():
-                col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
-                
-                with col1:
-                    if data["status"] == "completed":
-                        st.success(f"✅ {agent_name}")
-                    elif data["status"] == "running":
-                        st.warning(f"⏳ {agent_name}")
-                    else:
-                        st.info(f"⏸️ {agent_name}")
-                
-                with col2:
-                    st.write(f"Status: {data['status'].title()}")
-                
-                with col3:
-                    if data["confidence"] > 0:
-                        st.write(f"Confidence: {data['confidence']:.2f}")
-                    else:
-                        st.write("Confidence: N/A")
-                
-                with col4:
-                    st.write(f"Time: {data['time']}")
-        
-        # Real-time logs
-        st.subheader("📝 Execution Logs")
-        
-        logs_container = st.container()
-        with logs_container:
-            log_messages = [
-                "2024-10-05 14:33:01 - Research Agent started",
-                "2024-10-05 14:33:05 - Perplexity API called successfully",
-                "2024-10-05 14:33:12 - Research completed with confidence 0.85",
-                "2024-10-05 14:33:13 - Analysis Agent started",
-                "2024-10-05 14:33:15 - Processing research data...",
-            ]
-            
-            for log in log_messages:
-                st.text(log)
+        events = st.session_state.workflow_events.setdefault(selected_workflow, [])
+        progress_container = st.empty()
+
+        # Where the time went, span by span
+        st.subheader("⏱️ Execution Trace")
+        trace_container = st.empty()
+
+        def refresh():
+            render_progress(progress_container, progress_from_events(events))
+
+        refresh()
+        finished = any(e["type"] == "workflow_finished" for e in events)
+        if live_updates and not finished:
+            stream_events(selected_workflow, events, refresh)
+            if any(e["type"] == "workflow_finished" for e in events):
+                st.session_state.workflows[selected_workflow]["status"] = "completed"
+        render_trace(trace_container, selected_workflow)
 
 else:
     st.info("No workflows to monitor. Create a workflow first!")
@@ -1,23 +1,37 @@
 import pandas as pd
 import numpy as np
 import asyncio
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from src.agent_orchestrator.api.models import AgentTask, AgentResult
+from src.agent_orchestrator.agents.streaming_analysis import analyze_stream
+from src.agent_orchestrator.agents.columnar_input import read_columnar
+from src.agent_orchestrator.services.dataset_spool import dataset_spool
+from src.agent_orchestrator.core.tracing import tracer
 
 class AnalysisAgent:
+    # pandas/NumPy work; AgentManager runs it in the agent executor instead of on the event loop
+    cpu_bound = True
+
     def __init__(self):
         pass
 
     async def execute(self, task: AgentTask) -> AgentResult:
         try:
-            df = self.preprocess_data(task.params or task.query)
+            if task.params and task.params.get("dataset_id"):
+                return await self.execute_file(task)
+            with tracer.span("analysis.preprocess"):
+                df = self.preprocess_data(task.params or task.query)
             if df is None or df.empty:
                 raise ValueError("No valid data for analysis.")
 
-            stats = self.compute_statistics(df)
-            trends = self.detect_trends(df)
-            insights = self.extract_insights(df, stats, trends)
-            score = self.get_confidence(df, stats, trends, insights)
+            with tracer.span("analysis.statistics", rows=len(df), columns=len(df.columns)):
+                block = self.numeric_block(df)
+                stats = self.compute_statistics(df, block)
+            with tracer.span("analysis.trends"):
+                trends = self.detect_trends(df, block)
+            with tracer.span("analysis.insights"):
+                insights = self.extract_insights(df, stats, trends)
+                score = self.get_confidence(df, stats, trends, insights)
 
             return AgentResult(
                 agent_id=task.agent_id,
@@ -28,6 +42,55 @@ class AnalysisAgent:
         except Exception as e:
             return self.handle_error(e)
 
+    async def execute_file(self, task: AgentTask) -> AgentResult:
+        """
+        File input instead of inline data: params = {"dataset_id": ..., "chunk_size": rows} for an upload
+        in the dataset spool. Only spooled datasets can be read; task params never name a server path.
+        Arrow/Parquet are memory-mapped and only numeric columns are materialized; CSV/NDJSON are
+        streamed in chunks. Same result as loading the file into a DataFrame.
+        """
+        params = task.params
+        found = dataset_spool.locate(params["dataset_id"])
+        if found is None:
+            raise ValueError(f"Unknown dataset {params['dataset_id']}")
+        path, fmt = found["path"], found["format"]
+        if fmt in ("arrow", "parquet"):
+            return await asyncio.to_thread(self._analyze_columnar, task, path, fmt)
+        with tracer.span("analysis.stream", format=fmt):
+            summary = await asyncio.to_thread(analyze_stream, path, fmt, params.get("chunk_size"))
+        if summary.rows == 0 or not summary.columns:
+            raise ValueError("No valid data for analysis.")
+        corr = summary.aggregates.correlations().tolist() if summary.rows >= 2 else []
+        trends = {
+            col: {"trend": self._trend_label(c), "corr": c}
+            for col, c in zip(summary.aggregates.columns, corr)
+        }
+        return self._file_result(task, summary.stats, trends, summary.rows, summary.completeness)
+
+    def _analyze_columnar(self, task: AgentTask, path: str, fmt: str) -> AgentResult:
+        with tracer.span("analysis.read", format=fmt):
+            data = read_columnar(path, fmt)
+        df = data.frame
+        if not data.columns or data.rows == 0:
+            raise ValueError("No valid data for analysis.")
+        with tracer.span("analysis.statistics", rows=data.rows, columns=len(data.columns)):
+            block = self.numeric_block(df)
+            stats = self.compute_statistics(df, block)
+        with tracer.span("analysis.trends"):
+            trends = self.detect_trends(df, block)
+        return self._file_result(task, stats, trends, data.rows, data.completeness)
+
+    def _file_result(self, task: AgentTask, stats: Dict[str, Any], trends: Dict[str, Any],
+                     n_rows: int, completeness: float) -> AgentResult:
+        insights = self.extract_insights(None, stats, trends)
+        score = self._confidence(n_rows, completeness, insights)
+        return AgentResult(
+            agent_id=task.agent_id,
+            success=True,
+            result={"stats": stats, "trends": trends, "insights": insights, "score": score},
+            error=None
+        )
+
     def preprocess_data(self, data: Any) -> Optional[pd.DataFrame]:
         # Accepts DataFrame, list/dict, JSON. Handles missing/bad input.
         try:
@@ -50,29 +113,61 @@ class AnalysisAgent:
         except Exception:
             return None
 
-    def compute_statistics(self, df: pd.DataFrame) -> Dict[str, Any]:
-        stats = {}
-        for col in df.select_dtypes(include=np.number).columns:
-            stats[col] = {
-                "mean": float(df[col].mean()),
-                "std": float(df[col].std()),
-                "min": float(df[col].min()),
-                "max": float(df[col].max()),
-            }
-        return stats
+    def numeric_block(self, df: pd.DataFrame) -> Tuple[List[str], np.ndarray]:
+        """Numeric columns as one 2-D float64 array (NaN for missing), column-major so each column is contiguous"""
+        numeric = df.select_dtypes(include=np.number)
+        values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+        return list(numeric.columns), np.asfortranarray(values)
 
-    def detect_trends(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def compute_statistics(self, df: pd.DataFrame, block: Optional[Tuple[List[str], np.ndarray]] = None) -> Dict[str, Any]:
+        # Same reductions as pandas' skipna mean/std(ddof=1)/min/max, for all columns at once
+        columns, values = block or self.numeric_block(df)
+        missing = np.isnan(values)
+        count = values.shape[0] - missing.sum(axis=0)
+        filled = np.where(missing, 0.0, values)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = filled.sum(axis=0) / count
+            sqr = np.where(missing, 0.0, (mean - values) ** 2)
+            var = sqr.sum(axis=0) / np.where(count > 1, count - 1, np.nan)
+        std = np.sqrt(var)
+        empty = count == 0
+        col_min = np.where(empty, np.nan, np.where(missing, np.inf, values).min(axis=0, initial=np.inf))
+        col_max = np.where(empty, np.nan, np.where(missing, -np.inf, values).max(axis=0, initial=-np.inf))
+        # tolist() converts each array to Python floats in one call instead of a float() per element
+        mean, std, col_min, col_max = mean.tolist(), std.tolist(), col_min.tolist(), col_max.tolist()
+        return {
+            col: {"mean": mean[i], "std": std[i], "min": col_min[i], "max": col_max[i]}
+            for i, col in enumerate(columns)
+        }
+
+    def detect_trends(self, df: pd.DataFrame, block: Optional[Tuple[List[str], np.ndarray]] = None) -> Dict[str, Any]:
+        # Pearson correlation of every column with the row index, as one matrix-vector product
+        columns, values = block or self.numeric_block(df)
+        n = values.shape[0]
+        if n < 2 or not columns:
+            return {}
+        index = np.arange(n, dtype=np.float64)
+        index -= index.mean()
+        centered = values - values.mean(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # Normalized in the same order as np.corrcoef
+            cov = (index @ centered) / (n - 1)
+            index_std = np.sqrt((index @ index) / (n - 1))
+            std = np.sqrt(np.einsum("ij,ij->j", centered, centered) / (n - 1))
+            corr = cov / index_std / std
+        corr = np.clip(corr, -1.0, 1.0)
         trends = {}
-        for col in df.select_dtypes(include=np.number).columns:
-            arr = df[col].values
-            if len(arr) >= 2:
-                trend_corr = np.corrcoef(np.arange(len(arr)), arr)[0, 1]
-                trends[col] = {
-                    "trend": ("upward" if trend_corr > 0.35 else "downward" if trend_corr < -0.35 else "neutral"),
-                    "corr": float(trend_corr)
-                }
+        for col, trend_corr in zip(columns, corr.tolist()):
+            trends[col] = {
+                "trend": self._trend_label(trend_corr),
+                "corr": trend_corr
+            }
         return trends
 
+    @staticmethod
+    def _trend_label(corr: float) -> str:
+        return "upward" if corr > 0.35 else "downward" if corr < -0.35 else "neutral"
+
     def extract_insights(self, df: pd.DataFrame, stats: Dict[str, Any], trends: Dict[str, Any]) -> List[str]:
         insights = []
         for col, s in stats.items():
@@ -86,8 +181,12 @@ class AnalysisAgent:
 
     def get_confidence(self, df, stats, trends, insights) -> float:
         completeness = 1.0 - df.isnull().mean().mean()
+        return self._confidence(len(df), completeness, insights)
+
+    @staticmethod
+    def _confidence(n_rows: int, completeness: float, insights: List[str]) -> float:
         insight_bonus = min(0.3, 0.05 * len(insights))
-        confidence = min(1.0, 0.4 + 0.25 * (len(df) > 10) + 0.3 * completeness + insight_bonus)
+        confidence = min(1.0, 0.4 + 0.25 * (n_rows > 10) + 0.3 * completeness + insight_bonus)
         return confidence
 
     def handle_error(self, error: Exception) -> AgentResult:
@@ -0,0 +1,107 @@
+from typing import List
+import numpy as np
+import pandas as pd
+from src.agent_orchestrator.agents.streaming_analysis import COLUMN_THRESHOLD, ROW_THRESHOLD
+
+
+class ColumnarData:
+    __slots__ = ("frame", "rows", "columns", "completeness")
+
+    def __init__(self, frame: pd.DataFrame, rows: int, columns: List[str], completeness: float):
+        self.frame = frame  # numeric columns only, rows already filtered
+        self.rows = rows
+        self.columns = columns  # every column kept by the null threshold
+        self.completeness = completeness
+
+
+def _numeric(field) -> bool:
+    import pyarrow as pa
+    # Matches DataFrame.select_dtypes(include=np.number): ints and floats, not bools/decimals
+    return pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+
+
+def _open_arrow(path: str):
+    import pyarrow as pa
+    source = pa.memory_map(path, "r")
+    try:
+        return pa.ipc.open_file(source).read_all()
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return pa.ipc.open_stream(source).read_all()
+
+
+def read_columnar(path: str, fmt: str) -> ColumnarData:
+    """
+    Load an Arrow IPC or Parquet file for analysis, applying preprocess_data's null thresholds.
+    Arrow files are memory-mapped, so buffers are not copied until a numeric column is converted.
+    Parquet is read with column projection. Non-numeric columns are only read when a null-based
+    row filter needs their validity, and even then they are never converted to pandas.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Arrow/Parquet input requires the pyarrow package")
+
+    if fmt == "arrow":
+        table = _open_arrow(path)
+        schema, rows = table.schema, table.num_rows
+        null_counts = {name: table.column(name).null_count for name in schema.names}
+        read = table.select
+    elif fmt == "parquet":
+        parquet = pq.ParquetFile(path, memory_map=True)
+        schema, rows = parquet.schema_arrow, parquet.metadata.num_rows
+        null_counts = _parquet_null_counts(parquet, schema.names)
+        read = lambda columns: parquet.read(columns=columns)
+    else:
+        raise ValueError(f"Unsupported columnar format: {fmt}")
+
+    # Columns with too many nulls; a column without statistics is read to count them
+    unknown = [name for name, n in null_counts.items() if n is None]
+    if unknown:
+        counted = read(unknown)
+        null_counts.update({name: counted.column(name).null_count for name in unknown})
+    kept = [name for name in schema.names if rows - null_counts[name] >= int(COLUMN_THRESHOLD * rows)]
+    numeric = [name for name in kept if _numeric(schema.field(name))]
+
+    with_nulls = [name for name in kept if null_counts[name]]
+    mask = None
+    if with_nulls:
+        # Rows need int(0.3 * kept) non-null values; null-free columns count for every row
+        validity = read(with_nulls)
+        valid = {name: pc.is_valid(validity.column(name)).to_numpy(zero_copy_only=False) for name in with_nulls}
+        present = np.full(rows, len(kept) - len(with_nulls), dtype=np.int64)
+        for v in valid.values():
+            present += v
+        mask = present >= int(ROW_THRESHOLD * len(kept))
+        kept_nulls = {name: int((mask & ~v).sum()) for name, v in valid.items()}
+    else:
+        kept_nulls = {}
+
+    table = read(numeric)
+    if mask is not None and not mask.all():
+        table = table.filter(pa.array(mask))
+    frame = table.to_pandas()
+    kept_rows = int(mask.sum()) if mask is not None else rows
+    if kept and kept_rows:
+        completeness = 1.0 - float(np.mean([kept_nulls.get(name, 0) / kept_rows for name in kept]))
+    else:
+        completeness = 1.0
+    return ColumnarData(frame, kept_rows, kept, completeness)
+
+
+def _parquet_null_counts(parquet, names: List[str]):
+    """Null counts from row-group statistics, None where a column has no statistics"""
+    counts = {name: 0 for name in names}
+    metadata = parquet.metadata
+    paths = {metadata.schema.column(i).path: i for i in range(metadata.num_columns)}
+    for name in names:
+        index = paths.get(name)
+        for rg in range(metadata.num_row_groups):
+            stats = metadata.row_group(rg).column(index).statistics if index is not None else None
+            if stats is None or not stats.has_null_count:
+                counts[name] = None
+                break
+            counts[name] += stats.null_count
+    return counts
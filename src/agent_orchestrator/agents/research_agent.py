@@ -1,40 +1,48 @@
 import os
+import time
 import httpx
 import asyncio
 from typing import Any, Dict, Optional
 from src.agent_orchestrator.api.models import AgentTask, AgentResult
+from src.agent_orchestrator.services.http_pool import HttpClientPool, http_pool as default_http_pool
+from src.agent_orchestrator.services.inference_cache import InferenceCache, inference_cache as default_cache
+from src.agent_orchestrator.services.inference_batcher import InferenceBatcher, inference_batcher as default_batcher
+from src.agent_orchestrator.services.rate_limiter import RateLimiter, rate_limiter as default_rate_limiter
+from src.agent_orchestrator.services.resilience import CircuitOpenError, ResiliencePolicy, resilience as default_resilience
+from src.agent_orchestrator.core.metrics import metrics
+from src.agent_orchestrator.core.tracing import tracer
 
 class ResearchAgent:
-    def __init__(self):
-        self.api_key = os.getenv("HUGGINGFACE_API_KEY")
-        self.api_url = os.getenv("HUGGINGFACE_API_URL", "https://api-inference.huggingface.co/models/")
+    def __init__(self, http_pool: HttpClientPool = None, cache: InferenceCache = None,
+                 batcher: InferenceBatcher = None, api_key: Optional[str] = None, api_url: Optional[str] = None,
+                 resilience: ResiliencePolicy = None, rate_limiter: RateLimiter = None):
+        self.api_key = api_key or os.getenv("HUGGINGFACE_API_KEY")
+        self.api_url = api_url or os.getenv("HUGGINGFACE_API_URL", "https://api-inference.huggingface.co/models/")
         self.model = os.getenv("RESEARCH_AGENT_MODEL", "google-bert/bert-base-uncased")
-        self.max_retries = 3
         self.timeout = 20
+        self.http_pool = http_pool or default_http_pool
+        self.cache = cache or default_cache
+        self.batcher = batcher or default_batcher
+        # Retry/backoff, circuit breaker and hedging; max attempts come from RETRY_MAX_ATTEMPTS
+        self.resilience = resilience or default_resilience
+        self.rate_limiter = rate_limiter or default_rate_limiter
 
     async def execute(self, task: AgentTask) -> AgentResult:
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-        data = {"inputs": task.query}
         url = f"{self.api_url}{self.model}"
+        # params={"use_cache": False} forces a fresh upstream call
+        use_cache = (task.params or {}).get("use_cache", True)
         result = None
         error = None
-
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(url, headers=headers, json=data)
-                    response.raise_for_status()
-                    result = response.json()
-                    break
-            except httpx.HTTPStatusError as e:
-                error = f"HTTP {e.response.status_code}: {e.response.text}"
-                if e.response.status_code == 429:
-                    await asyncio.sleep(2 * attempt)  # Backoff for rate limit
-                else:
-                    break
-            except Exception as e:
-                error = str(e)
-                await asyncio.sleep(1 * attempt)
+        # Filled by _query; stays empty when the cache (or another caller's in-flight fetch) answers
+        upstream = {"latency": 0.0, "calls": 0, "attempts": 0}
+        try:
+            key = self.cache.make_key(url, task.query)
+            with tracer.span("inference_cache", bypass=not use_cache) as span:
+                result = await self.cache.get_or_fetch(key, lambda: self._query(url, task.query, upstream),
+                                                       bypass=not use_cache)
+                span.set(upstream_calls=upstream["calls"])
+        except Exception as e:
+            error = str(e)
 
         citations = self.extract_citations(result)
         score = self.get_confidence(result, citations)
@@ -44,8 +52,61 @@ class ResearchAgent:
             success=bool(result),
             result={"output": result, "citations": citations, "score": score},
             error=error,
+            upstream_latency=upstream["latency"] if upstream["calls"] else None,
+            retries=max(0, upstream["attempts"] - 1),
         )
 
+    async def _query(self, url: str, query: str, upstream: Optional[Dict[str, Any]] = None) -> Any:
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        data = {"inputs": query}
+        upstream = upstream if upstream is not None else {"latency": 0.0, "calls": 0, "attempts": 0}
+        # Batched calls take their token per batch, in the batcher; otherwise every request sent takes one,
+        # outside the hedge timing so queueing for it is not mistaken for endpoint latency
+        prepare = None if self.batcher.enabled else (lambda: self.rate_limiter.acquire(url, self.api_key))
+        try:
+            return await self.resilience.call(
+                url, lambda attempt: self._attempt(url, query, headers, data, upstream, attempt), label="research",
+                prepare=prepare,
+            )
+        except httpx.HTTPStatusError as e:
+            raise RuntimeError(f"HTTP {e.response.status_code}: {e.response.text}") from e
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            raise RuntimeError(str(e) or type(e).__name__) from e
+
+    async def _attempt(self, url: str, query: str, headers: Dict[str, str], data: Dict[str, Any],
+                       upstream: Dict[str, Any], attempt: int = 1) -> Any:
+        """One upstream call, timed into the hf_request_duration_seconds histogram"""
+        upstream["attempts"] = max(upstream["attempts"], attempt)
+        start = time.perf_counter()
+        status: Any = "error"
+        with tracer.span("hf.request", model=self.model, attempt=attempt, batched=self.batcher.enabled) as span:
+            try:
+                if self.batcher.enabled:
+                    output = await asyncio.wait_for(self.batcher.submit(url, self.api_key, query, timeout=self.timeout),
+                                                    self.timeout)
+                    status = 200
+                    return output
+                response = await self.http_pool.client.post(url, headers=headers, json=data, timeout=self.timeout)
+                status = response.status_code
+                await self.rate_limiter.observe(url, self.api_key, response)
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                raise
+            except asyncio.CancelledError:
+                # The losing copy of a hedged request
+                status = "cancelled"
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                upstream["latency"] += elapsed
+                upstream["calls"] += 1
+                metrics.record_upstream(self.model, elapsed, status)
+                span.set(status=status)
+
     def extract_citations(self, result: Optional[Any]) -> list:
         # Custom citation/source extraction (adjust based on output schema)
         if not result:
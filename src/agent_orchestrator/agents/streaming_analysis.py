@@ -0,0 +1,164 @@
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Same thresholds as AnalysisAgent.preprocess_data
+COLUMN_THRESHOLD = 0.3
+ROW_THRESHOLD = 0.3
+
+
+def infer_format(path: str) -> str:
+    return "ndjson" if path.lower().endswith((".ndjson", ".jsonl")) else "csv"
+
+
+def read_chunks(path: str, fmt: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if fmt == "csv":
+        reader = pd.read_csv(path, chunksize=chunk_size)
+    elif fmt == "ndjson":
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size)
+    else:
+        raise ValueError(f"Unsupported streaming format: {fmt}")
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+class ColumnAggregates:
+    """
+    Running per-column aggregates over row chunks. Each chunk is reduced with NumPy and merged
+    into the totals with the pairwise form of Welford's update (Chan et al.), so nothing but
+    O(columns) state is kept between chunks.
+    """
+
+    def __init__(self, columns: List[str]):
+        k = len(columns)
+        self.columns = columns
+        # skipna statistics
+        self.count = np.zeros(k)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+        # Co-moments against the row index for the trend correlation; like np.corrcoef, any NaN makes it NaN
+        self.rows = 0
+        self.has_nan = np.zeros(k, dtype=bool)
+        self.x_mean = 0.0
+        self.x_m2 = 0.0
+        self.y_mean = np.zeros(k)
+        self.y_m2 = np.zeros(k)
+        self.cxy = np.zeros(k)
+
+    def update(self, values: np.ndarray):
+        """values: rows x columns float64, NaN for missing"""
+        nb = values.shape[0]
+        if nb == 0:
+            return
+        missing = np.isnan(values)
+        filled = np.where(missing, 0.0, values)
+
+        cnt = nb - missing.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_b = filled.sum(axis=0) / cnt
+            m2_b = np.where(missing, 0.0, (values - mean_b) ** 2).sum(axis=0)
+            total = self.count + cnt
+            delta = mean_b - self.mean
+            has = cnt > 0
+            self.mean = np.where(has, self.mean + delta * cnt / total, self.mean)
+            self.m2 = np.where(has, self.m2 + m2_b + delta ** 2 * self.count * cnt / total, self.m2)
+        self.count = total
+        self.min = np.fmin(self.min, np.where(missing, np.inf, values).min(axis=0))
+        self.max = np.fmax(self.max, np.where(missing, -np.inf, values).max(axis=0))
+
+        x = np.arange(self.rows, self.rows + nb, dtype=np.float64)
+        x_mean_b = x.mean()
+        xc = x - x_mean_b
+        y_mean_b = filled.sum(axis=0) / nb
+        yc = filled - y_mean_b
+        n = self.rows + nb
+        dx = x_mean_b - self.x_mean
+        dy = y_mean_b - self.y_mean
+        weight = self.rows * nb / n
+        self.cxy += xc @ yc + dx * dy * weight
+        self.x_m2 += xc @ xc + dx * dx * weight
+        self.y_m2 += np.einsum("ij,ij->j", yc, yc) + dy * dy * weight
+        self.x_mean += dx * nb / n
+        self.y_mean += dy * nb / n
+        self.has_nan |= missing.any(axis=0)
+        self.rows = n
+
+    def statistics(self) -> Dict[str, Dict[str, float]]:
+        empty = self.count == 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self.m2 / np.where(self.count > 1, self.count - 1, np.nan))
+        mean = np.where(empty, np.nan, self.mean)
+        col_min = np.where(empty, np.nan, self.min)
+        col_max = np.where(empty, np.nan, self.max)
+        return {
+            col: {"mean": float(mean[i]), "std": float(std[i]), "min": float(col_min[i]), "max": float(col_max[i])}
+            for i, col in enumerate(self.columns)
+        }
+
+    def correlations(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = self.cxy / np.sqrt(self.x_m2) / np.sqrt(self.y_m2)
+        return np.clip(np.where(self.has_nan, np.nan, corr), -1.0, 1.0)
+
+
+class StreamSummary:
+    __slots__ = ("rows", "columns", "stats", "aggregates", "completeness")
+
+    def __init__(self, rows: int, columns: List[str], aggregates: ColumnAggregates, completeness: float):
+        self.rows = rows
+        self.columns = columns
+        self.aggregates = aggregates
+        self.stats = aggregates.statistics()
+        self.completeness = completeness
+
+
+def scan_columns(path: str, fmt: str, chunk_size: int) -> Tuple[int, Dict[str, int], Dict[str, bool]]:
+    """First pass: row count, non-null count and numeric-ness of every column"""
+    rows = 0
+    non_null: Dict[str, int] = {}
+    numeric: Dict[str, bool] = {}
+    for chunk in read_chunks(path, fmt, chunk_size):
+        rows += len(chunk)
+        counts = chunk.notna().sum()
+        for col in chunk.columns:
+            non_null[col] = non_null.get(col, 0) + int(counts[col])
+            # An all-null chunk says nothing about the column's type
+            chunk_numeric = pd.api.types.is_numeric_dtype(chunk[col]) and not pd.api.types.is_bool_dtype(chunk[col])
+            numeric[col] = numeric.get(col, True) and (chunk_numeric or counts[col] == 0)
+    return rows, non_null, numeric
+
+
+def analyze_stream(path: str, fmt: Optional[str] = None, chunk_size: Optional[int] = None) -> StreamSummary:
+    """
+    Out-of-core equivalent of preprocess_data + compute_statistics + detect_trends for a CSV/NDJSON file.
+    The file is read twice in chunks: first to decide which columns survive the null threshold,
+    then to filter rows and accumulate. Peak memory is one chunk plus per-column state.
+    """
+    fmt = fmt or infer_format(path)
+    chunk_size = chunk_size or int(os.getenv("ANALYSIS_CHUNK_SIZE", "100000"))
+
+    rows, non_null, numeric = scan_columns(path, fmt, chunk_size)
+    kept = [col for col, n in non_null.items() if n >= int(COLUMN_THRESHOLD * rows)]
+    numeric_cols = [col for col in kept if numeric[col]]
+    row_thresh = int(ROW_THRESHOLD * len(kept))
+
+    aggregates = ColumnAggregates(numeric_cols)
+    nulls = pd.Series(0, index=kept, dtype="int64")
+    kept_rows = 0
+    for chunk in read_chunks(path, fmt, chunk_size):
+        chunk = chunk.reindex(columns=kept)
+        present = chunk.notna()
+        mask = present.sum(axis=1) >= row_thresh
+        if not mask.all():
+            chunk, present = chunk[mask], present[mask]
+        kept_rows += len(chunk)
+        nulls += (~present).sum()
+        if numeric_cols:
+            aggregates.update(chunk[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    completeness = 1.0 - float((nulls / kept_rows).mean()) if kept_rows and kept else 1.0
+    return StreamSummary(kept_rows, kept, aggregates, completeness)
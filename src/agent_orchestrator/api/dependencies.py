@@ -0,0 +1,71 @@
+import os
+
+# Instantiate orchestration classes globally
+
+from src.agent_orchestrator.core.task_router import TaskRouter
+from src.agent_orchestrator.core.agent_factory import build_agent_manager
+from src.agent_orchestrator.core.workflow_engine import WorkflowEngine
+from src.agent_orchestrator.core.state_manager import StateManager
+from src.agent_orchestrator.core.event_bus import WorkflowEventBus
+from src.agent_orchestrator.core.admission import AdmissionController
+from src.agent_orchestrator.core.job_runner import WorkflowJobRunner
+from src.agent_orchestrator.core.task_queue import MongoTaskQueue
+from src.agent_orchestrator.core.checkpoints import MongoCheckpointStore
+from src.agent_orchestrator.db.operations import db_ops
+
+
+# AGENTS mapping with proper keys for agents
+AGENTS = {
+    "research": ["research", "web", "search", "information"],
+    "analysis": ["analysis", "data", "statistics", "insights"],
+    "decision": ["decision", "recommendation", "synthesis"],
+}
+
+
+
+task_router = TaskRouter(agent_capabilities=AGENTS)
+agent_manager = build_agent_manager(db_ops)
+# ORCHESTRATOR_EXECUTION=queue: the API only schedules and enqueues, worker nodes
+# (python -m src.agent_orchestrator.worker) run the agents
+task_queue = MongoTaskQueue() if os.getenv("ORCHESTRATOR_EXECUTION", "local") == "queue" else None
+# WORKFLOW_CHECKPOINTS=off: a retried chained job (POST /jobs/{id}/retry) re-executes every step
+checkpoints = MongoCheckpointStore() if os.getenv("WORKFLOW_CHECKPOINTS", "mongo") == "mongo" else None
+event_bus = WorkflowEventBus()
+state_manager = StateManager(event_bus=event_bus, spill=db_ops.store_workflow_state)
+admission = AdmissionController()
+workflow_engine = WorkflowEngine(
+    task_router=task_router,
+    agent_manager=agent_manager,
+    state_manager=state_manager,
+    admission=admission,
+    task_queue=task_queue,
+    checkpoints=checkpoints
+)
+job_runner = WorkflowJobRunner(engine=workflow_engine, db_ops=db_ops)
+
+
+# Create FastAPI dependency functions
+
+def get_task_router():
+    return task_router
+
+def get_agent_manager():
+    return agent_manager
+
+def get_state_manager():
+    return state_manager
+
+def get_workflow_engine():
+    return workflow_engine
+
+def get_event_bus():
+    return event_bus
+
+def get_admission_controller():
+    return admission
+
+def get_job_runner():
+    return job_runner
+
+def get_database_operations():
+    return db_ops
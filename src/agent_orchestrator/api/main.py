@@ -1,10 +1,7 @@
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from src.agent_orchestrator.api.routers import agent_router, orchestrate_router, health_router
-from src.agent_orchestrator.agents.research_agent import ResearchAgent
-from src.agent_orchestrator.agents.analysis_agent import AnalysisAgent
-from src.agent_orchestrator.agents.decision_agent import DecisionAgent
+from src.agent_orchestrator.api.routers import agent_router, orchestrate_router, health_router, dataset_router, metrics_router, stats_router
 
 def create_app() -> FastAPI:
     app = FastAPI(title="Agent Orchestration API")
@@ -30,62 +27,39 @@ def create_app() -> FastAPI:
     app.include_router(agent_router, prefix="/api/agents")
     app.include_router(orchestrate_router, prefix="/api/orchestrate")
     app.include_router(health_router, prefix="/api/health")
+    app.include_router(dataset_router, prefix="/api/datasets")
+    app.include_router(stats_router, prefix="/api/stats")
+    app.include_router(metrics_router)  # /metrics, where Prometheus expects it
 
     return app
 
 app = create_app()
 
 
-# Dependency functions for FastAPI
-
-from fastapi import Depends
-
-
-
-#Instantiate orchestration classes globally
-
-from src.agent_orchestrator.core.task_router import TaskRouter
-from src.agent_orchestrator.core.agent_manager import AgentManager
-from src.agent_orchestrator.core.workflow_engine import WorkflowEngine
-from src.agent_orchestrator.core.state_manager import StateManager
-from src.agent_orchestrator.db.operations import db_ops
-
-
-
-
-# AGENTS mapping with proper keys for agents
-AGENTS = {
-    "research": ["research", "web", "search", "information"],
-    "analysis": ["analysis", "data", "statistics", "insights"],
-    "decision": ["decision", "recommendation", "synthesis"],
-}
-
-task_router = TaskRouter(agent_capabilities=AGENTS)
-agent_manager = AgentManager(db_ops=db_ops)
-agent_manager.registry["research"] = ResearchAgent()
-agent_manager.registry["analysis"] = AnalysisAgent()
-agent_manager.registry["decision"] = DecisionAgent()
-state_manager = StateManager()
-workflow_engine = WorkflowEngine(
-    task_router=task_router,
-    agent_manager=agent_manager,
-    state_manager=state_manager
+# Orchestration singletons and FastAPI dependency functions live in api.dependencies
+# (so routers can import them without importing this module); re-exported here
+
+from src.agent_orchestrator.api.dependencies import (
+    AGENTS,
+    task_router,
+    agent_manager,
+    state_manager,
+    event_bus,
+    admission,
+    workflow_engine,
+    job_runner,
+    get_task_router,
+    get_agent_manager,
+    get_state_manager,
+    get_event_bus,
+    get_workflow_engine,
+    get_admission_controller,
+    get_job_runner,
+    get_database_operations,
 )
-
-
-# Create FastAPI dependency functions
-
-def get_task_router():
-    return task_router
-
-def get_agent_manager():
-    return agent_manager
-
-def get_state_manager():
-    return state_manager
-
-def get_workflow_engine():
-    return workflow_engine
+from src.agent_orchestrator.db.operations import db_ops
+from src.agent_orchestrator.services.http_pool import http_pool
+from src.agent_orchestrator.core.executor import agent_executor
 
 
 from src.agent_orchestrator.db.database import connect_to_mongo, close_mongo_connection, init_database
@@ -94,15 +68,16 @@ from src.agent_orchestrator.db.database import connect_to_mongo, close_mongo_con
 async def startup_event():
     await connect_to_mongo()
     await init_database()
+    await admission.load_limits(db_ops)
+    await http_pool.open()
+    agent_executor.start()
+    job_runner.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await job_runner.stop()
+    await http_pool.close()
+    agent_executor.close()
     await close_mongo_connection()
 
-# Database dependency
-from src.agent_orchestrator.db.operations import db_ops
-
-def get_database_operations():
-    return db_ops
-
 
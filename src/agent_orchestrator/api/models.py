@@ -1,22 +1,47 @@
 from pydantic import BaseModel, Field, validator
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 class AgentTask(BaseModel):
     agent_id: str = Field(..., min_length=3)
     query: str = Field(..., min_length=1)
     params: Optional[Dict[str, Any]] = None
+    task_id: Optional[str] = None  # defaults to the task's position in the request
+    depends_on: List[str] = []  # task_ids whose results are passed in params["dependencies"]
 
 class AgentResult(BaseModel):
     agent_id: str
     success: bool
     result: Any
     error: Optional[str] = None
+    task_id: Optional[str] = None
+    elapsed: Optional[float] = None
+    queue_wait: Optional[float] = None  # seconds spent waiting for an agent slot (and for a worker in queue mode)
+    upstream_latency: Optional[float] = None  # seconds spent in inference API calls
+    retries: Optional[int] = None  # upstream calls retried
+    # AgentResultDocument id when the result is already stored (queue mode); not part of responses
+    result_id: Optional[str] = Field(None, exclude=True)
 
 class OrchestrationRequest(BaseModel):
     tasks: List[AgentTask]
     workflow_id: Optional[str] = None
+    # chained: research -> analysis -> decision on tasks[0], checkpointed per step so a failed job
+    # retried with POST /jobs/{id}/retry resumes after the last step that succeeded
+    mode: Literal["dag", "chained"] = "dag"
 
 class OrchestrationResponse(BaseModel):
     workflow_id: str
     results: List[AgentResult]
     elapsed: float
+
+class JobSubmission(BaseModel):
+    workflow_id: str
+    status: str
+
+class JobStatusResponse(BaseModel):
+    workflow_id: str
+    status: str
+    results: List[AgentResult] = []
+    elapsed: Optional[float] = None
+    human_review_required: bool = False
+    confidence_score: Optional[float] = None
+    error: Optional[str] = None
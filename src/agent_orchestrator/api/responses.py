@@ -0,0 +1,73 @@
+import json
+import math
+import os
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+import numpy as np
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback, same values (NaN/inf as null); only the byte layout may differ
+    orjson = None
+
+# FAST_JSON_RESPONSES=true: routes hand their (already validated) models straight to FastJSONResponse
+fast_json_enabled = os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+
+
+def _default(obj: Any) -> Any:
+    # Models are unpacked field by field rather than copied with model_dump()
+    if isinstance(obj, BaseModel):
+        return dict(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _finite(obj: Any) -> Any:
+    # NaN/inf become None in plain data, as orjson writes them; the stdlib would emit invalid JSON
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def _finite_default(obj: Any) -> Any:
+    return _finite(_default(obj))
+
+
+def dumps(content: Any) -> bytes:
+    """JSON-encode pydantic models, NumPy scalars/arrays and plain data; NaN/inf are written as null"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_finite(content), default=_finite_default, allow_nan=False, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse that serializes its content directly. Returned from a route, FastAPI skips the
+    response_model round trip (dump, re-validate, jsonable encode), so only return models that were
+    validated when they were built.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def respond(content: Any) -> Any:
+    """Wrap a route's return value in FastJSONResponse when the fast path is enabled"""
+    return FastJSONResponse(content) if fast_json_enabled else content
@@ -0,0 +1,6 @@
+from src.agent_orchestrator.api.routers.agent_router import agent_router
+from src.agent_orchestrator.api.routers.orchestrate_router import orchestrate_router
+from src.agent_orchestrator.api.routers.health_router import health_router
+from src.agent_orchestrator.api.routers.dataset_router import dataset_router
+from src.agent_orchestrator.api.routers.metrics_router import metrics_router
+from src.agent_orchestrator.api.routers.stats_router import stats_router
@@ -1,5 +1,9 @@
+import time
 from fastapi import APIRouter, Depends, HTTPException
 from src.agent_orchestrator.api.models import AgentTask, AgentResult
+from src.agent_orchestrator.api.responses import respond
+from src.agent_orchestrator.api.dependencies import get_agent_manager, get_admission_controller, get_job_runner
+from src.agent_orchestrator.core.metrics import metrics
 from src.agent_orchestrator.services.huggingface_service import HuggingFaceService
 
 agent_router = APIRouter()
@@ -13,7 +17,36 @@ async def run_agent(
     hf_service: HuggingFaceService = Depends(get_hf_service)
 ):
     try:
-        inference = await hf_service.query_model("bert-base-uncased", task.query)
-        return AgentResult(agent_id=task.agent_id, success=True, result=inference)
+        use_cache = (task.params or {}).get("use_cache", True)
+        inference = await hf_service.query_model("bert-base-uncased", task.query, use_cache=use_cache)
+        return respond(AgentResult(agent_id=task.agent_id, success=True, result=inference))
     except Exception as e:
-        return AgentResult(agent_id=task.agent_id, success=False, result=None, error=str(e))
+        return respond(AgentResult(agent_id=task.agent_id, success=False, result=None, error=str(e)))
+
+@agent_router.get("/status")
+async def agent_status(
+    agent_manager=Depends(get_agent_manager),
+    admission=Depends(get_admission_controller),
+    job_runner=Depends(get_job_runner)
+):
+    """Live per-agent load, success rate and latency for the dashboard (times in seconds)"""
+    agents = {}
+    for agent_type, replicas in agent_manager.replica_stats().items():
+        agents[agent_type] = {
+            "status": "healthy" if any(r["healthy"] for r in replicas) else "unhealthy",
+            "replicas": len(replicas),
+            "load": sum(r["load"] for r in replicas),
+            "max_load": admission.gate(agent_type).max_concurrency,
+            **metrics.agent_summary(agent_type),
+        }
+    return {
+        "agents": agents,
+        "upstream": metrics.upstream_summary(),
+        "system": {
+            "total_tasks": sum(a["tasks"] for a in agents.values()),
+            "active_workflows": int(metrics.gauge("workflows_in_progress")),
+            "queued_tasks": sum(gate["waiting"] for gate in admission.stats().values()),
+            "queued_jobs": job_runner.pending,
+            "uptime_seconds": time.time() - metrics.started_at,
+        },
+    }
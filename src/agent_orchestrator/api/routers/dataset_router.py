@@ -0,0 +1,42 @@
+import os
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request
+from src.agent_orchestrator.services.dataset_spool import dataset_spool, DatasetTooLarge
+
+dataset_router = APIRouter()
+
+# Content types that name the format when the client does not pass ?format=
+CONTENT_TYPES = {
+    "application/vnd.apache.arrow.file": "arrow",
+    "application/vnd.apache.arrow.stream": "arrow",
+    "application/vnd.apache.parquet": "parquet",
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+}
+
+@dataset_router.post("/", status_code=201)
+async def upload_dataset(request: Request, filename: Optional[str] = None, format: Optional[str] = None):
+    """
+    Raw binary upload (no multipart, no base64/JSON wrapping), streamed to the spool directory.
+    Analysis tasks then reference it with params={"dataset_id": ...}.
+    """
+    fmt = format or CONTENT_TYPES.get(request.headers.get("content-type", "").split(";")[0].strip())
+    try:
+        return await dataset_spool.save(request.stream(), filename=filename, fmt=fmt)
+    except DatasetTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+@dataset_router.get("/{dataset_id}")
+async def get_dataset(dataset_id: str):
+    found = dataset_spool.locate(dataset_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    return {"dataset_id": dataset_id, "format": found["format"], "bytes": os.path.getsize(found["path"])}
+
+@dataset_router.delete("/{dataset_id}")
+async def delete_dataset(dataset_id: str):
+    if not dataset_spool.delete(dataset_id):
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    return {"deleted": dataset_id}
@@ -1,7 +1,52 @@
 from fastapi import APIRouter
+from src.agent_orchestrator.services.http_pool import http_pool
+from src.agent_orchestrator.services.inference_cache import inference_cache
+from src.agent_orchestrator.services.inference_batcher import inference_batcher
+from src.agent_orchestrator.services.resilience import resilience
+from src.agent_orchestrator.services.rate_limiter import rate_limiter
+from src.agent_orchestrator.api.routers.stats_router import stats_cache
+from src.agent_orchestrator.db.operations import db_ops
+from src.agent_orchestrator.core.executor import agent_executor
+from src.agent_orchestrator.core.tracing import tracer
 
 health_router = APIRouter()
 
 @health_router.get("/")
 async def health():
     return {"status": "ok"}
+
+@health_router.get("/http-pool")
+async def http_pool_stats():
+    return http_pool.stats()
+
+@health_router.get("/inference-cache")
+async def inference_cache_stats():
+    return inference_cache.stats()
+
+@health_router.get("/inference-batcher")
+async def inference_batcher_stats():
+    return inference_batcher.stats()
+
+@health_router.get("/db-write-behind")
+async def db_write_behind_stats():
+    return db_ops.buffer.stats() if db_ops.buffer else {"enabled": False}
+
+@health_router.get("/agent-executor")
+async def agent_executor_stats():
+    return agent_executor.stats()
+
+@health_router.get("/tracer")
+async def tracer_stats():
+    return tracer.stats()
+
+@health_router.get("/resilience")
+async def resilience_stats():
+    return resilience.stats()
+
+@health_router.get("/rate-limiter")
+async def rate_limiter_stats():
+    return rate_limiter.stats()
+
+@health_router.get("/stats-cache")
+async def stats_cache_stats():
+    return stats_cache.stats()
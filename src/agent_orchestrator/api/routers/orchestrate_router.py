@@ -1,4 +1,7 @@
-from src.agent_orchestrator.api.main import get_workflow_engine
+from src.agent_orchestrator.api.dependencies import (
+    get_workflow_engine, get_admission_controller, get_job_runner, get_database_operations, get_event_bus,
+    get_state_manager
+)
 
 from fastapi import APIRouter, Depends
 from src.agent_orchestrator.api.models import OrchestrationRequest, OrchestrationResponse, AgentResult
@@ -51,15 +54,149 @@ async def orchestrate(
 
 # Inject into route handlers using FastAPI
 
-from fastapi import APIRouter, Depends
-from src.agent_orchestrator.api.models import OrchestrationRequest, OrchestrationResponse
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi.responses import StreamingResponse
+from src.agent_orchestrator.api.models import OrchestrationRequest, OrchestrationResponse, JobSubmission, JobStatusResponse
+from src.agent_orchestrator.core.event_bus import WorkflowEventBus, TERMINAL_EVENT
+from src.agent_orchestrator.core.state_manager import StateManager
 from src.agent_orchestrator.core.workflow_engine import WorkflowEngine
+from src.agent_orchestrator.core.dag_scheduler import WorkflowGraphError, DagScheduler
+from src.agent_orchestrator.core.admission import (
+    AdmissionController, AdmissionRejected, WorkflowExceedsCapacity, retry_after_header
+)
+from src.agent_orchestrator.core.job_runner import (
+    WorkflowJobRunner, JobQueueFull, JobAlreadyExists, JobNotFound, JobNotRetryable
+)
+from src.agent_orchestrator.core.tracing import tracer
+from src.agent_orchestrator.db.models import TaskStatus
+from src.agent_orchestrator.api.responses import respond
 
 orchestrate_router = APIRouter()
 
+def _check_chained(req: OrchestrationRequest):
+    if req.mode == "chained" and not req.tasks:
+        raise WorkflowGraphError("A chained workflow needs a research task")
+
 @orchestrate_router.post("/", response_model=OrchestrationResponse)
 async def orchestrate(
     req: OrchestrationRequest,
     engine: WorkflowEngine = Depends(get_workflow_engine)  # <-- Dependency injection!
 ):
-    return await engine.run_workflow(req)
+    try:
+        _check_chained(req)
+        return respond(await engine.run(req))
+    except (WorkflowGraphError, WorkflowExceedsCapacity) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=str(e), headers=retry_after_header(e))
+
+@orchestrate_router.get("/admission")
+async def admission_stats(admission: AdmissionController = Depends(get_admission_controller)):
+    return admission.stats()
+
+@orchestrate_router.post("/jobs", response_model=JobSubmission, status_code=202)
+async def submit_job(
+    req: OrchestrationRequest,
+    runner: WorkflowJobRunner = Depends(get_job_runner)
+):
+    try:
+        DagScheduler().plan(req.tasks)  # reject bad graphs now rather than in the background
+        _check_chained(req)
+        workflow_id = await runner.submit(req)
+    except WorkflowGraphError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except JobAlreadyExists as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return JobSubmission(workflow_id=workflow_id, status=TaskStatus.PENDING.value)
+
+@orchestrate_router.post("/jobs/{workflow_id}/retry", response_model=JobSubmission, status_code=202)
+async def retry_job(workflow_id: str, runner: WorkflowJobRunner = Depends(get_job_runner)):
+    """Re-queue a failed job; chained jobs skip the steps that already succeeded"""
+    try:
+        await runner.retry(workflow_id)
+    except JobNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except JobNotRetryable as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    return JobSubmission(workflow_id=workflow_id, status=TaskStatus.PENDING.value)
+
+@orchestrate_router.get("/jobs/{workflow_id}", response_model=JobStatusResponse)
+async def get_job(workflow_id: str, db_ops=Depends(get_database_operations)):
+    execution = await db_ops.get_workflow_execution(workflow_id)
+    if execution is None:
+        raise HTTPException(status_code=404, detail=f"Unknown workflow '{workflow_id}'")
+    results = await db_ops.get_agent_results(execution.agent_results) if execution.agent_results else []
+    return respond(JobStatusResponse(
+        workflow_id=workflow_id,
+        status=execution.status.value,
+        results=[
+            AgentResult(agent_id=doc.agent_id, success=doc.success, result=doc.result, error=doc.error,
+                        task_id=doc.task_id.split(":", 1)[-1], elapsed=doc.execution_time)
+            for doc in results
+        ],
+        elapsed=execution.elapsed,
+        human_review_required=execution.human_review_required,
+        confidence_score=execution.confidence_score,
+        error=execution.error,
+    ))
+
+@orchestrate_router.get("/jobs/{workflow_id}/state")
+async def get_job_state(
+    workflow_id: str,
+    state_manager: StateManager = Depends(get_state_manager),
+    db_ops=Depends(get_database_operations)
+):
+    """Per-step state; served from memory, or from Mongo once evicted"""
+    steps = state_manager.get_workflow(workflow_id)
+    if steps is None:
+        execution = await db_ops.get_workflow_execution(workflow_id)
+        if execution is None:
+            raise HTTPException(status_code=404, detail=f"Unknown workflow '{workflow_id}'")
+        steps = execution.step_states
+    return {"workflow_id": workflow_id, "steps": steps}
+
+@orchestrate_router.get("/jobs/{workflow_id}/trace")
+async def get_job_trace(workflow_id: str):
+    """
+    Spans of the workflow's latest completed run (or of the run in progress, before any completed),
+    ordered by start time; only kept for sampled workflows
+    """
+    trace = tracer.get(workflow_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail=f"No trace for workflow '{workflow_id}'")
+    return trace
+
+@orchestrate_router.get("/jobs/{workflow_id}/events")
+async def stream_job_events(
+    workflow_id: str,
+    last_event_id: int = 0,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    bus: WorkflowEventBus = Depends(get_event_bus),
+    db_ops=Depends(get_database_operations)
+):
+    """Server-sent events of step transitions; resumes after Last-Event-ID (header or query param)"""
+    after = int(last_event_id_header) if last_event_id_header and last_event_id_header.isdigit() else last_event_id
+    if not bus.has(workflow_id):
+        # Only workflows this node knows about get a stream; no log is created for arbitrary ids
+        execution = await db_ops.get_workflow_execution(workflow_id)
+        if execution is None:
+            raise HTTPException(status_code=404, detail=f"Unknown workflow '{workflow_id}'")
+        if execution.status in (TaskStatus.COMPLETED, TaskStatus.FAILED) and not bus.has(workflow_id):
+            # Finished and its events evicted: the stream is just the outcome
+            bus.publish(workflow_id, TERMINAL_EVENT, status=execution.status.value, error=execution.error)
+
+    async def event_stream():
+        async for event in bus.subscribe(workflow_id, last_event_id=after, heartbeat=15, create=True):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {event.id}\nevent: {event.type}\ndata: {json.dumps(event.to_dict(), default=str)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
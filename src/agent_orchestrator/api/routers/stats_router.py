@@ -0,0 +1,50 @@
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from src.agent_orchestrator.api.dependencies import get_database_operations
+from src.agent_orchestrator.services.inference_cache import InferenceCache
+
+stats_router = APIRouter()
+
+# Dashboards poll these; a few seconds of staleness saves one aggregation per viewer per refresh,
+# and concurrent misses for the same window share one query
+stats_cache = InferenceCache(max_entries=256, ttl=float(os.getenv("STATS_CACHE_TTL", "10")))
+
+MAX_BUCKETS = 1000
+
+
+def _window(window: int, bucket: int):
+    if bucket and window / bucket > MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"window/bucket must give at most {MAX_BUCKETS} buckets")
+    until = datetime.utcnow()
+    return until - timedelta(seconds=window), until
+
+
+@stats_router.get("/agents")
+async def agent_stats(
+    window: int = Query(3600, ge=1, le=30 * 86400, description="seconds to look back"),
+    bucket: int = Query(300, ge=0, description="bucket width in seconds; 0 for one row per agent"),
+    agent_id: Optional[str] = None,
+    db_ops=Depends(get_database_operations)
+):
+    """Per-agent success rate, latency, retries and throughput per time bucket"""
+    since, until = _window(window, bucket)
+    key = stats_cache.make_key("agents", agent_id, {"window": window, "bucket": bucket})
+    rows = await stats_cache.get_or_fetch(
+        key, lambda: db_ops.aggregate_agent_stats(since, until, bucket or None, agent_id)
+    )
+    return {"window": window, "bucket": bucket, "rows": rows}
+
+
+@stats_router.get("/workflows")
+async def workflow_stats(
+    window: int = Query(3600, ge=1, le=30 * 86400, description="seconds to look back"),
+    bucket: int = Query(300, ge=0, description="bucket width in seconds; 0 for a single row"),
+    db_ops=Depends(get_database_operations)
+):
+    """Workflow throughput, success rate, human-review rate and latency per time bucket"""
+    since, until = _window(window, bucket)
+    key = stats_cache.make_key("workflows", None, {"window": window, "bucket": bucket})
+    rows = await stats_cache.get_or_fetch(key, lambda: db_ops.aggregate_workflow_stats(since, until, bucket or None))
+    return {"window": window, "bucket": bucket, "rows": rows}
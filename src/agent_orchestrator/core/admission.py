@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when an agent's queue is full or a task waited longer than the queue-time budget."""
+
+    def __init__(self, agent_id: str, retry_after: float, reason: str = "queue full"):
+        super().__init__(f"Agent '{agent_id}' is overloaded ({reason}); retry after {retry_after:.1f}s")
+        self.agent_id = agent_id
+        self.retry_after = retry_after
+
+
+class WorkflowExceedsCapacity(ValueError):
+    """Raised when a workflow routes more tasks to one agent than its gate can ever hold; retrying cannot help."""
+
+
+class AgentGate:
+    """
+    Concurrency limit (the agent's max_load) plus a bounded wait queue for one agent.
+    """
+
+    def __init__(self, agent_id: str, max_concurrency: int, max_queue: int, queue_timeout: float):
+        # A limit of 0 would be a semaphore nobody can ever acquire
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency of agent '{agent_id}' must be >= 1, got {max_concurrency}")
+        if max_queue < 0:
+            raise ValueError(f"max_queue of agent '{agent_id}' must be >= 0, got {max_queue}")
+        self.agent_id = agent_id
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.reserved = 0  # admitted workflows' tasks that have not reached the queue yet
+        self.rejected = 0
+        self.avg_service_time: Optional[float] = None  # EWMA, seconds
+
+    def retry_after(self) -> float:
+        # Time for the current backlog (queued plus reserved by admitted workflows) to drain
+        # at the observed service rate
+        if not self.avg_service_time:
+            return 1.0
+        drain_rate = self.max_concurrency / self.avg_service_time
+        return (self.waiting + self.reserved + 1) / drain_rate
+
+    @property
+    def capacity(self) -> int:
+        return self.max_concurrency + self.max_queue
+
+    def has_room(self, incoming: int = 1) -> bool:
+        return self.active + self.waiting + self.reserved + incoming <= self.capacity
+
+    def reject(self, reason: str = "queue full") -> AdmissionRejected:
+        self.rejected += 1
+        return AdmissionRejected(self.agent_id, self.retry_after(), reason)
+
+    @asynccontextmanager
+    async def admit(self, reserved: bool = False):
+        """
+        reserved: the caller already holds a slot from AdmissionController.reserve()
+        """
+        if not reserved and not self.has_room():
+            raise self.reject()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self.reject("queue time budget exceeded")
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._sem.release()
+            elapsed = time.perf_counter() - start
+            self.avg_service_time = elapsed if self.avg_service_time is None else 0.8 * self.avg_service_time + 0.2 * elapsed
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "reserved": self.reserved,
+            "rejected": self.rejected,
+            "avg_service_time": self.avg_service_time or 0.0,
+        }
+
+
+class AdmissionController:
+    def __init__(self, default_max_load: Optional[int] = None, max_queue: Optional[int] = None,
+                 queue_timeout: Optional[float] = None):
+        self.default_max_load = (default_max_load if default_max_load is not None
+                                 else int(os.getenv("ADMISSION_DEFAULT_MAX_LOAD", "10")))
+        if self.default_max_load < 1:
+            raise ValueError(f"default_max_load must be >= 1, got {self.default_max_load}")
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("ADMISSION_MAX_QUEUE", "20"))
+        self.queue_timeout = queue_timeout or float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+        self.gates: Dict[str, AgentGate] = {}
+
+    def configure(self, agent_id: str, max_load: int):
+        self.gates[agent_id] = AgentGate(agent_id, max_load, self.max_queue, self.queue_timeout)
+
+    async def load_limits(self, db_ops):
+        """Take each agent's concurrency limit from AgentStatusDocument.max_load"""
+        for agent_id, max_load in (await db_ops.get_agent_limits()).items():
+            if max_load < 1:
+                # Keep the default rather than a gate that admits nothing
+                logger.warning("Ignoring max_load %s of agent %s; limits must be >= 1", max_load, agent_id)
+                continue
+            self.configure(agent_id, max_load)
+
+    def gate(self, agent_id: str) -> AgentGate:
+        if agent_id not in self.gates:
+            self.configure(agent_id, self.default_max_load)
+        return self.gates[agent_id]
+
+    def reserve(self, agent_ids: Iterable[str]) -> "Reservation":
+        """
+        Reserve queue slots for every task of a workflow, or reject the whole workflow
+        up front if any agent cannot take its share. Raises WorkflowExceedsCapacity (not
+        AdmissionRejected) when the share is larger than the agent's gate even when idle.
+        """
+        counts: Dict[str, int] = {}
+        for agent_id in agent_ids:
+            counts[agent_id] = counts.get(agent_id, 0) + 1
+        for agent_id, n in counts.items():
+            gate = self.gate(agent_id)
+            if n > gate.capacity:
+                raise WorkflowExceedsCapacity(
+                    f"Workflow routes {n} tasks to agent '{agent_id}', which holds at most {gate.capacity}"
+                )
+        for agent_id, n in counts.items():
+            gate = self.gates[agent_id]
+            if not gate.has_room(n):
+                raise gate.reject()
+        for agent_id, n in counts.items():
+            self.gates[agent_id].reserved += n
+        return Reservation(self, counts)
+
+    def admit(self, agent_id: str, reservation: Optional["Reservation"] = None):
+        reserved = reservation is not None and reservation.claim(agent_id)
+        return self.gate(agent_id).admit(reserved=reserved)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {agent_id: gate.stats() for agent_id, gate in self.gates.items()}
+
+
+class Reservation:
+    def __init__(self, controller: AdmissionController, counts: Dict[str, int]):
+        self.controller = controller
+        self.counts = counts
+
+    def claim(self, agent_id: str) -> bool:
+        if self.counts.get(agent_id, 0) <= 0:
+            return False
+        self.counts[agent_id] -= 1
+        self.controller.gates[agent_id].reserved -= 1
+        return True
+
+    def release(self):
+        """Give back slots of tasks that never ran (e.g. skipped after a failed dependency)"""
+        for agent_id, n in self.counts.items():
+            self.controller.gates[agent_id].reserved -= n
+        self.counts = {}
+
+
+def retry_after_header(exc: AdmissionRejected) -> Dict[str, str]:
+    return {"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
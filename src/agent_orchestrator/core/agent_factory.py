@@ -0,0 +1,19 @@
+import os
+from src.agent_orchestrator.agents.research_agent import ResearchAgent
+from src.agent_orchestrator.agents.analysis_agent import AnalysisAgent
+from src.agent_orchestrator.agents.decision_agent import DecisionAgent
+from src.agent_orchestrator.services.http_pool import http_pool
+from src.agent_orchestrator.core.agent_manager import AgentManager
+from src.agent_orchestrator.core.executor import agent_executor
+
+
+def build_agent_manager(db_ops=None) -> AgentManager:
+    """Agent replicas for this process; shared by the API node and worker nodes"""
+    manager = AgentManager(db_ops=db_ops, executor=agent_executor)
+    # One ResearchAgent replica per API key in RESEARCH_AGENT_API_KEYS (comma-separated), else a single one
+    research_api_keys = [k.strip() for k in os.getenv("RESEARCH_AGENT_API_KEYS", "").split(",") if k.strip()]
+    for api_key in research_api_keys or [None]:
+        manager.add_replica("research", ResearchAgent(http_pool=http_pool, api_key=api_key))
+    manager.add_replica("analysis", AnalysisAgent())
+    manager.add_replica("decision", DecisionAgent())
+    return manager
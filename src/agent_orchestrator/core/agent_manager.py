@@ -1,60 +1,150 @@
 import asyncio
-from typing import Dict, Any, Optional
+import random
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
+
+
+class Replica:
+    __slots__ = ("replica_id", "agent", "load", "healthy", "served")
+
+    def __init__(self, replica_id: str, agent: Any):
+        self.replica_id = replica_id
+        self.agent = agent
+        self.load = 0
+        self.healthy = True
+        self.served = 0
+
+
+class ReplicaPool:
+    """
+    Interchangeable instances of one agent type (e.g. ResearchAgents with different API keys).
+    Selection is power-of-two-choices: sample two healthy replicas, take the less loaded one.
+    """
+
+    def __init__(self, agent_type: str):
+        self.agent_type = agent_type
+        self.replicas: List[Replica] = []
+        self._healthy: List[Replica] = []
+
+    def add(self, agent: Any, replica_id: Optional[str] = None) -> Replica:
+        replica = Replica(replica_id or f"{self.agent_type}#{len(self.replicas)}", agent)
+        self.replicas.append(replica)
+        self._refresh()
+        return replica
+
+    def set_status(self, healthy: bool, replica_id: Optional[str] = None):
+        for replica in self.replicas:
+            if replica_id is None or replica.replica_id == replica_id:
+                replica.healthy = healthy
+        self._refresh()
+
+    def _refresh(self):
+        self._healthy = [r for r in self.replicas if r.healthy]
+
+    def choose(self) -> Optional[Replica]:
+        healthy = self._healthy
+        if len(healthy) < 2:
+            return healthy[0] if healthy else None
+        a, b = random.sample(healthy, 2)
+        return a if a.load <= b.load else b
+
+    @property
+    def healthy(self) -> List[Replica]:
+        return list(self._healthy)
+
+    @property
+    def load(self) -> int:
+        return sum(r.load for r in self.replicas)
+
 
 class AgentManager:
-    def __init__(self, db_ops=None):
-        # In-memory (default): agent_id: {"status": "healthy"/"unreachable", "load": int}
-        self.registry: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, db_ops=None, executor=None):
+        """
+        executor: AgentExecutor that runs agents marked cpu_bound off the event loop
+        """
+        # agent_type: first registered replica, for callers that use a single instance directly
+        self.registry: Dict[str, Any] = {}
+        self.pools: Dict[str, ReplicaPool] = {}
         self.lock = asyncio.Lock()
         self.db_ops = db_ops
+        self.executor = executor
+
+    def add_replica(self, agent_type: str, agent: Any, replica_id: Optional[str] = None) -> Replica:
+        pool = self.pools.setdefault(agent_type, ReplicaPool(agent_type))
+        self.registry.setdefault(agent_type, agent)
+        return pool.add(agent, replica_id)
+
+    @asynccontextmanager
+    async def lease(self, agent_type: str):
+        """
+        Pick a replica, count it as loaded for the duration of the block and yield its agent.
+        Load bookkeeping happens between awaits, so it needs no lock on the event loop.
+        """
+        pool = self.pools.get(agent_type)
+        replica = pool.choose() if pool else None
+        if replica is None:
+            raise KeyError(f"No healthy agent registered for '{agent_type}'")
+        replica.load += 1
+        replica.served += 1
+        if self.db_ops:
+            # Outside the try below: a failed increment must not be decremented
+            try:
+                await self.db_ops.increment_agent_load(agent_type)
+            except BaseException:
+                replica.load -= 1
+                raise
+        try:
+            yield replica.agent
+        finally:
+            replica.load -= 1
+            if self.db_ops:
+                await self.db_ops.decrement_agent_load(agent_type)
+
+    async def execute(self, agent: Any, task) -> Any:
+        if self.executor is not None and getattr(agent, "cpu_bound", False):
+            return await self.executor.run(agent, task)
+        return await agent.execute(task)
 
     # In-memory agent registration/status for backward compatibility
     async def register_agent(self, agent_id: str):
-        async with self.lock:
-            self.registry[agent_id] = {"status": "healthy", "load": 0}
+        self.pools.setdefault(agent_id, ReplicaPool(agent_id))
 
     async def update_status(self, agent_id: str, status: str):
-        async with self.lock:
-            if agent_id in self.registry:
-                self.registry[agent_id]["status"] = status
+        # agent_id may name a whole agent type or a single replica ("research#1")
+        agent_type = agent_id.split("#", 1)[0]
+        if agent_type in self.pools:
+            self.pools[agent_type].set_status(status == "healthy", None if agent_id == agent_type else agent_id)
 
     async def get_healthy_agents(self):
-        async with self.lock:
-            return [aid for aid, entry in self.registry.items() if entry["status"] == "healthy"]
+        return [aid for aid, pool in self.pools.items() if pool.healthy]
 
     async def get_least_loaded_agent(self) -> Optional[str]:
-        async with self.lock:
-            healthy = [
-                (aid, self.registry[aid]["load"])
-                for aid, entry in self.registry.items()
-                if entry["status"] == "healthy"
-            ]
-            if not healthy:
-                return None
-            return min(healthy, key=lambda x: x[1])[0]
+        healthy = [(aid, pool.load) for aid, pool in self.pools.items() if pool.healthy]
+        if not healthy:
+            return None
+        return min(healthy, key=lambda x: x[1])[0]
 
-    # Shared public interface for load operations (works for both modes)
+    # Shared public interface for load operations (works for both modes);
+    # in-memory load is tracked per replica by lease()
     async def increment_load(self, agent_id: str):
         if self.db_ops:
             await self.db_ops.increment_agent_load(agent_id)
-        else:
-            async with self.lock:
-                if agent_id in self.registry:
-                    self.registry[agent_id]["load"] += 1
 
     async def decrement_load(self, agent_id: str):
         if self.db_ops:
             await self.db_ops.decrement_agent_load(agent_id)
-        else:
-            async with self.lock:
-                if agent_id in self.registry and self.registry[agent_id]["load"] > 0:
-                    self.registry[agent_id]["load"] -= 1
 
     async def get_load(self, agent_id: str) -> int:
         if self.db_ops:
             return await self.db_ops.get_agent_load(agent_id)
-        else:
-            async with self.lock:
-                if agent_id in self.registry:
-                    return self.registry[agent_id]["load"]
-                return 0
+        pool = self.pools.get(agent_id)
+        return pool.load if pool else 0
+
+    def replica_stats(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {
+            agent_type: [
+                {"replica_id": r.replica_id, "load": r.load, "served": r.served, "healthy": r.healthy}
+                for r in pool.replicas
+            ]
+            for agent_type, pool in self.pools.items()
+        }
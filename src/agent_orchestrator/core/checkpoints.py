@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Tuple
+from src.agent_orchestrator.api.models import AgentTask, AgentResult
+from src.agent_orchestrator.db.models import WorkflowCheckpointDocument
+from src.agent_orchestrator.db.database import get_collection
+
+CheckpointKey = Tuple[str, str, str]  # (workflow_id, step, input_hash)
+
+
+def input_hash(agent_type: str, task: AgentTask) -> str:
+    """
+    Content hash of what a step runs on. Later steps take earlier outputs as params, so a changed
+    upstream result also changes the hash of everything downstream of it.
+    """
+    raw = json.dumps([agent_type, task.query, task.params or {}], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class MongoCheckpointStore:
+    """Successful step results of chained workflows, in the workflow_checkpoints collection"""
+
+    async def load(self, workflow_id: str, step: str, key: str) -> Optional[AgentResult]:
+        doc = await get_collection(WorkflowCheckpointDocument).find_one(
+            {"workflow_id": workflow_id, "step": step, "input_hash": key}
+        )
+        return AgentResult(**doc["result"]) if doc else None
+
+    async def save(self, workflow_id: str, step: str, key: str, result: AgentResult):
+        await get_collection(WorkflowCheckpointDocument).update_one(
+            {"workflow_id": workflow_id, "step": step, "input_hash": key},
+            {"$set": {"result": result.model_dump(), "created_at": datetime.utcnow()}},
+            upsert=True,
+        )
+
+
+class InMemoryCheckpointStore:
+    """Same interface as MongoCheckpointStore, kept in this process (tests, local dev); LRU-bounded"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or int(os.getenv("WORKFLOW_CHECKPOINT_MAX_ENTRIES", "10000"))
+        self._entries: "OrderedDict[CheckpointKey, AgentResult]" = OrderedDict()
+
+    async def load(self, workflow_id: str, step: str, key: str) -> Optional[AgentResult]:
+        result = self._entries.get((workflow_id, step, key))
+        if result is None:
+            return None
+        self._entries.move_to_end((workflow_id, step, key))
+        return result.model_copy()
+
+    async def save(self, workflow_id: str, step: str, key: str, result: AgentResult):
+        self._entries[(workflow_id, step, key)] = result.model_copy()
+        self._entries.move_to_end((workflow_id, step, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,136 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from src.agent_orchestrator.api.models import AgentTask, AgentResult
+from src.agent_orchestrator.core.admission import AdmissionController, AdmissionRejected, Reservation
+from src.agent_orchestrator.core.tracing import tracer
+
+# runner(task, agent_id, dependency_results) -> AgentResult; task.task_id is always set
+TaskRunner = Callable[[AgentTask, str, Dict[str, AgentResult]], Awaitable[AgentResult]]
+
+
+class WorkflowGraphError(ValueError):
+    """Raised when task dependencies are unknown, duplicated or cyclic."""
+
+
+def task_key(task: AgentTask, index: int) -> str:
+    # Tasks without an explicit task_id are addressed by their position in the request
+    return task.task_id or str(index)
+
+
+class DagScheduler:
+    def __init__(self, max_concurrency: int = 8, agent_concurrency: Optional[Dict[str, int]] = None,
+                 default_agent_concurrency: int = 4, admission: Optional[AdmissionController] = None):
+        """
+        max_concurrency: cap on tasks executing at once across all workflows
+        agent_concurrency: {agent_id: cap} overrides for individual agents
+        admission: when given, per-agent limits and queueing come from its gates instead
+        """
+        limits = [max_concurrency, default_agent_concurrency, *(agent_concurrency or {}).values()]
+        if min(limits) < 1:
+            raise ValueError(f"Concurrency limits must be >= 1, got {min(limits)}")
+        self.max_concurrency = max_concurrency
+        self.agent_concurrency = agent_concurrency or {}
+        self.default_agent_concurrency = default_agent_concurrency
+        self.admission = admission
+        self._global_sem = asyncio.Semaphore(max_concurrency)
+        self._agent_sems: Dict[str, asyncio.Semaphore] = {}
+
+    def _agent_slot(self, agent_id: str, reservation: Optional[Reservation]):
+        if self.admission:
+            return self.admission.admit(agent_id, reservation)
+        sem = self._agent_sems.get(agent_id)
+        if sem is None:
+            limit = self.agent_concurrency.get(agent_id, self.default_agent_concurrency)
+            sem = self._agent_sems[agent_id] = asyncio.Semaphore(limit)
+        return sem
+
+    def plan(self, tasks: List[AgentTask]) -> List[List[int]]:
+        """
+        Validate the dependency graph and return it as levels of task indexes.
+        Every task in a level only depends on tasks from earlier levels.
+        """
+        keys = [task_key(task, i) for i, task in enumerate(tasks)]
+        index_of: Dict[str, int] = {}
+        for i, key in enumerate(keys):
+            if key in index_of:
+                raise WorkflowGraphError(f"Duplicate task_id '{key}'")
+            index_of[key] = i
+
+        indegree = [0] * len(tasks)
+        dependents: List[List[int]] = [[] for _ in tasks]
+        for i, task in enumerate(tasks):
+            for dep in task.depends_on:
+                if dep not in index_of:
+                    raise WorkflowGraphError(f"Task '{keys[i]}' depends on unknown task '{dep}'")
+                dependents[index_of[dep]].append(i)
+                indegree[i] += 1
+
+        levels: List[List[int]] = []
+        ready = [i for i, d in enumerate(indegree) if d == 0]
+        seen = 0
+        while ready:
+            levels.append(ready)
+            seen += len(ready)
+            nxt = []
+            for i in ready:
+                for j in dependents[i]:
+                    indegree[j] -= 1
+                    if indegree[j] == 0:
+                        nxt.append(j)
+            ready = nxt
+        if seen != len(tasks):
+            cyclic = [keys[i] for i, d in enumerate(indegree) if d > 0]
+            raise WorkflowGraphError(f"Dependency cycle between tasks: {', '.join(cyclic)}")
+        return levels
+
+    async def run(self, routed: List[Tuple[AgentTask, str]], runner: TaskRunner,
+                  reservation: Optional[Reservation] = None) -> List[AgentResult]:
+        """
+        Execute (task, agent_id) pairs as soon as their dependencies finish.
+        Results are returned in request order. AdmissionRejected from an agent's gate (e.g. the
+        queue-time budget) cancels the remaining tasks and propagates, so callers can answer 429.
+        """
+        tasks = [task for task, _ in routed]
+        self.plan(tasks)
+        keys = [task_key(task, i) for i, task in enumerate(tasks)]
+        loop = asyncio.get_running_loop()
+        done: Dict[str, asyncio.Future] = {key: loop.create_future() for key in keys}
+
+        async def run_one(index: int) -> AgentResult:
+            task, agent_id = routed[index]
+            key = keys[index]
+            try:
+                deps = {dep: await done[dep] for dep in task.depends_on}
+                failed = [dep for dep, res in deps.items() if not res.success]
+                if failed:
+                    result = AgentResult(agent_id=agent_id, task_id=key, success=False, result=None,
+                                         error=f"Skipped: dependency failed ({', '.join(failed)})")
+                else:
+                    if task.task_id is None:
+                        task = task.model_copy(update={"task_id": key})
+                    queued, queued_at = time.perf_counter(), time.time()
+                    async with self._agent_slot(agent_id, reservation), self._global_sem:
+                        start = time.perf_counter()
+                        tracer.record("queue", queued_at, time.time(), step=key, agent=agent_id)
+                        result = await runner(task, agent_id, deps)
+                        result.elapsed = time.perf_counter() - start
+                        # In queue mode the result already carries its wait for a worker
+                        result.queue_wait = start - queued + (result.queue_wait or 0.0)
+                    result.task_id = key
+            except AdmissionRejected:
+                raise
+            except Exception as e:
+                result = AgentResult(agent_id=agent_id, task_id=key, success=False, result=None, error=str(e))
+            done[key].set_result(result)
+            return result
+
+        runs = [asyncio.ensure_future(run_one(i)) for i in range(len(routed))]
+        try:
+            return list(await asyncio.gather(*runs))
+        except BaseException:
+            # Dependents of a rejected task would otherwise wait on it forever
+            for run in runs:
+                run.cancel()
+            await asyncio.gather(*runs, return_exceptions=True)
+            raise
@@ -0,0 +1,127 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+TERMINAL_EVENT = "workflow_finished"
+
+
+class WorkflowEvent:
+    __slots__ = ("id", "type", "data", "ts")
+
+    def __init__(self, id: int, type: str, data: Dict[str, Any]):
+        self.id = id
+        self.type = type
+        self.data = data
+        self.ts = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "type": self.type, "ts": self.ts, **self.data}
+
+
+class _WorkflowLog:
+    __slots__ = ("events", "next_id", "subscribers", "finished")
+
+    def __init__(self, max_events: int):
+        self.events: Deque[WorkflowEvent] = deque(maxlen=max_events)
+        self.next_id = 1
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.finished = False
+
+
+class WorkflowEventBus:
+    """
+    Per-workflow ordered event log with live fan-out to subscribers.
+    Event ids increase per workflow so a reconnecting client can resume after the last id it saw.
+    """
+
+    def __init__(self, max_workflows: Optional[int] = None, max_events: Optional[int] = None):
+        self.max_workflows = max_workflows or int(os.getenv("EVENT_BUS_MAX_WORKFLOWS", "1000"))
+        self.max_events = max_events or int(os.getenv("EVENT_BUS_MAX_EVENTS", "500"))
+        self._logs: "OrderedDict[str, _WorkflowLog]" = OrderedDict()
+
+    def _log(self, workflow_id: str) -> _WorkflowLog:
+        log = self._logs.get(workflow_id)
+        if log is None:
+            log = self._logs[workflow_id] = _WorkflowLog(self.max_events)
+            self._evict()
+        return log
+
+    def _evict(self):
+        # Drop the oldest finished workflows nobody is listening to
+        for workflow_id in list(self._logs):
+            if len(self._logs) <= self.max_workflows:
+                break
+            log = self._logs[workflow_id]
+            if log.finished and not log.subscribers:
+                del self._logs[workflow_id]
+
+    def publish(self, workflow_id: str, event_type: str, **data: Any) -> WorkflowEvent:
+        log = self._log(workflow_id)
+        event = WorkflowEvent(log.next_id, event_type, data)
+        log.next_id += 1
+        log.events.append(event)
+        if event_type == TERMINAL_EVENT:
+            log.finished = True
+        for queue in log.subscribers:
+            queue.put_nowait(event)
+        return event
+
+    def has(self, workflow_id: str) -> bool:
+        return workflow_id in self._logs
+
+    def finished(self, workflow_id: str) -> bool:
+        log = self._logs.get(workflow_id)
+        return log is not None and log.finished
+
+    def reopen(self, workflow_id: str):
+        """Start a new run of a finished workflow: old events are dropped, ids keep increasing"""
+        log = self._logs.get(workflow_id)
+        if log is not None:
+            log.events.clear()
+            log.finished = False
+
+    def history(self, workflow_id: str, after: int = 0) -> List[WorkflowEvent]:
+        log = self._logs.get(workflow_id)
+        return [e for e in log.events if e.id > after] if log else []
+
+    async def subscribe(self, workflow_id: str, last_event_id: int = 0, heartbeat: Optional[float] = None,
+                        create: bool = False) -> AsyncIterator[Optional[WorkflowEvent]]:
+        """
+        Yield events after last_event_id, then live events until the workflow finishes.
+        With heartbeat, yields None after that many idle seconds so callers can keep the connection alive.
+        A workflow without a log ends the stream at once, unless create (the caller knows it exists
+        but it has not published anything yet, e.g. a queued job).
+        """
+        log = self._logs.get(workflow_id)
+        if log is None:
+            if not create:
+                return
+            log = self._log(workflow_id)
+        queue: asyncio.Queue = asyncio.Queue()
+        log.subscribers.add(queue)
+        try:
+            seen = last_event_id
+            for event in self.history(workflow_id, after=last_event_id):
+                seen = event.id
+                yield event
+                if event.type == TERMINAL_EVENT:
+                    return
+            if log.finished:
+                # Resumed at or past the end (EventSource reconnects after every close): nothing more will come
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event.id <= seen:
+                    continue  # already replayed from history
+                seen = event.id
+                yield event
+                if event.type == TERMINAL_EVENT:
+                    return
+        finally:
+            log.subscribers.discard(queue)
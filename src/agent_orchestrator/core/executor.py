@@ -0,0 +1,290 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import pickle
+import signal
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.agent_orchestrator.api.models import AgentTask, AgentResult
+from src.agent_orchestrator.core.tracing import RemoteContext, Span, tracer
+
+logger = logging.getLogger(__name__)
+
+_ALIGN = 64
+
+
+class CpuTimeExceeded(BaseException):
+    # BaseException so agents' blanket `except Exception` handlers cannot swallow it
+    pass
+
+
+class SharedArray:
+    """Descriptor of an array placed in a shared memory segment; resolved back to a view in the worker"""
+    __slots__ = ("offset", "shape", "dtype")
+
+    def __init__(self, offset: int, shape: Tuple[int, ...], dtype: str):
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+
+
+class SharedFrame:
+    __slots__ = ("columns", "index")
+
+    def __init__(self, columns: List[Tuple[Any, Any]], index: Any):
+        self.columns = columns
+        self.index = index
+
+
+def _shareable(arr: Any, min_bytes: int) -> bool:
+    return isinstance(arr, np.ndarray) and arr.dtype.kind in "biuf" and arr.nbytes >= min_bytes
+
+
+class _Packer:
+    """Moves large numeric arrays (and numeric DataFrame columns) in task params into one shared memory segment"""
+
+    def __init__(self, min_bytes: int):
+        self.min_bytes = min_bytes
+        self.arrays: List[Tuple[SharedArray, np.ndarray]] = []
+        self.size = 0
+
+    def _place(self, arr: np.ndarray) -> SharedArray:
+        ref = SharedArray(self.size, arr.shape, arr.dtype.str)
+        self.arrays.append((ref, arr))
+        self.size += -(-arr.nbytes // _ALIGN) * _ALIGN
+        return ref
+
+    def pack(self, value: Any) -> Any:
+        if _shareable(value, self.min_bytes):
+            return self._place(value)
+        if isinstance(value, pd.DataFrame) and value.columns.is_unique:
+            columns = []
+            for col in value.columns:
+                arr = value[col].to_numpy() if isinstance(value[col].dtype, np.dtype) else None
+                columns.append((col, self._place(arr) if _shareable(arr, self.min_bytes // 8) else value[col]))
+            return SharedFrame(columns, value.index)
+        if isinstance(value, dict):
+            return {k: self.pack(v) for k, v in value.items()}
+        return value
+
+    def write(self) -> Optional[shared_memory.SharedMemory]:
+        if not self.arrays:
+            return None
+        shm = shared_memory.SharedMemory(create=True, size=self.size)
+        for ref, arr in self.arrays:
+            view = np.ndarray(ref.shape, dtype=ref.dtype, buffer=shm.buf, offset=ref.offset)
+            view[...] = arr
+            del view
+        return shm
+
+
+def _unpack(value: Any, buf) -> Any:
+    if isinstance(value, SharedArray):
+        return np.ndarray(value.shape, dtype=value.dtype, buffer=buf, offset=value.offset)
+    if isinstance(value, SharedFrame):
+        return pd.DataFrame({col: _unpack(v, buf) for col, v in value.columns}, index=value.index, copy=False)
+    if isinstance(value, dict):
+        return {k: _unpack(v, buf) for k, v in value.items()}
+    return value
+
+
+def _on_cpu_limit(signum, frame):
+    raise CpuTimeExceeded()
+
+
+def _run_in_worker(agent: Any, task: AgentTask, shm_name: Optional[str], cpu_timeout: float,
+                   trace: Optional[RemoteContext] = None) -> Tuple[AgentResult, List[Span]]:
+    """Entry point in the pool process; returns the result and the spans the agent recorded"""
+    with tracer.collect(trace) as spans:
+        return _run_limited(agent, task, shm_name, cpu_timeout), spans
+
+
+def _run_limited(agent: Any, task: AgentTask, shm_name: Optional[str], cpu_timeout: float) -> AgentResult:
+    """Attach shared arrays, run the agent under a CPU-time limit"""
+    shm = shared_memory.SharedMemory(name=shm_name) if shm_name else None
+    try:
+        if shm is not None:
+            task = task.model_copy(update={"params": _unpack(task.params, shm.buf)})
+        # ITIMER_PROF counts CPU time (user + system) of this process, not wall time
+        signal.signal(signal.SIGPROF, _on_cpu_limit)
+        signal.setitimer(signal.ITIMER_PROF, cpu_timeout)
+        try:
+            return asyncio.run(agent.execute(task))
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+    except CpuTimeExceeded:
+        return AgentResult(agent_id=task.agent_id, success=False, result=None,
+                           error=f"CPU time limit of {cpu_timeout:.0f}s exceeded")
+    finally:
+        if shm is not None:
+            task = None
+            try:
+                shm.close()
+            except BufferError:
+                pass  # a view is still referenced; released when the worker collects it
+
+
+def _run_traced(agent: Any, task: AgentTask, trace: Optional[RemoteContext]) -> Tuple[AgentResult, List[Span]]:
+    # Executor threads do not inherit the caller's context variables
+    with tracer.collect(trace) as spans:
+        return asyncio.run(agent.execute(task)), spans
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+class AgentExecutor:
+    """
+    Runs CPU-bound agents (agent.cpu_bound = True) off the event loop.
+    mode "process" uses a process pool and falls back to threads if the pool cannot be
+    started or the task cannot be pickled; "thread" always uses threads; "inline" runs on the loop.
+    Large numeric arrays in task params go through shared memory instead of being pickled.
+    """
+
+    def __init__(self, mode: Optional[str] = None, workers: Optional[int] = None,
+                 cpu_timeout: Optional[float] = None, shm_min_bytes: Optional[int] = None,
+                 start_method: Optional[str] = None):
+        self.mode = mode or os.getenv("AGENT_EXECUTOR", "process")
+        self.workers = workers or int(os.getenv("AGENT_EXECUTOR_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+        self.cpu_timeout = cpu_timeout or float(os.getenv("AGENT_TASK_CPU_TIMEOUT", "60"))
+        self.shm_min_bytes = shm_min_bytes if shm_min_bytes is not None else int(os.getenv("AGENT_EXECUTOR_SHM_MIN_BYTES", "1048576"))
+        self.start_method = start_method or os.getenv("AGENT_EXECUTOR_START_METHOD", "spawn")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._picklable: Dict[type, bool] = {}  # per agent class, checked on first use
+        self.process_runs = 0
+        self.thread_runs = 0
+        self.fallbacks = 0
+        self.timeouts = 0
+        self.pool_restarts = 0
+
+    def start(self):
+        if self.mode == "process" and self._processes is None:
+            try:
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(self.start_method)
+                )
+                # Spawn the workers now rather than on the first analysis
+                for _ in range(self.workers):
+                    self._processes.submit(_warm_up)
+            except (OSError, NotImplementedError, ValueError) as e:
+                logger.warning("Process pool unavailable (%s); using threads for CPU-bound agents", e)
+                self.mode = "thread"
+                self._processes = None
+
+    def close(self):
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+            self._processes = None
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+            self._threads = None
+
+    def _thread_pool(self) -> Executor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="agent")
+        return self._threads
+
+    def _restart_processes(self, pool: ProcessPoolExecutor):
+        """
+        Replace pool, the one the failed task was submitted to. A stuck or dead worker cannot be
+        reclaimed individually, so the whole pool goes; the other tasks it was running then fail with
+        BrokenProcessPool, but by then the pool has already been replaced and they do not restart it again.
+        """
+        if self._processes is not pool:
+            return
+        self._processes = None
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+        self.pool_restarts += 1
+        self.start()
+
+    def _can_pickle(self, agent: Any) -> bool:
+        # Agents of one class share their (stateless) makeup, so one pickling test per class is enough
+        picklable = self._picklable.get(type(agent))
+        if picklable is None:
+            try:
+                pickle.dumps(agent)
+                picklable = True
+            except Exception:
+                picklable = False
+            self._picklable[type(agent)] = picklable
+        return picklable
+
+    async def run(self, agent: Any, task: AgentTask, cpu_timeout: Optional[float] = None) -> AgentResult:
+        cpu_timeout = cpu_timeout or self.cpu_timeout
+        if self.mode == "inline":
+            return await agent.execute(task)
+        if self.mode == "process":
+            self.start()
+            if self._processes is not None:
+                if self._can_pickle(agent):
+                    with tracer.span("executor.process"):
+                        return await self._run_process(agent, task, cpu_timeout)
+                self.fallbacks += 1
+        with tracer.span("executor.thread"):
+            return await self._run_thread(agent, task, cpu_timeout)
+
+    async def _run_process(self, agent: Any, task: AgentTask, cpu_timeout: float) -> AgentResult:
+        packer = _Packer(self.shm_min_bytes)
+        params = packer.pack(task.params) if task.params else task.params
+        shm = packer.write()
+        shipped = task.model_copy(update={"params": params}) if shm else task
+        self.process_runs += 1
+        pool = self._processes
+        try:
+            future = pool.submit(_run_in_worker, agent, shipped, shm.name if shm else None, cpu_timeout,
+                                            tracer.remote_context())
+            # The CPU timer fires inside the worker; this wall-clock guard catches workers stuck
+            # in native code (or waiting for I/O) that never reach a bytecode boundary
+            result, spans = await asyncio.wait_for(asyncio.wrap_future(future), cpu_timeout * 2 + 5)
+            tracer.adopt(spans)
+            return result
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._restart_processes(pool)
+            return AgentResult(agent_id=task.agent_id, success=False, result=None,
+                               error=f"Agent did not finish within {cpu_timeout * 2 + 5:.0f}s")
+        except BrokenProcessPool as e:
+            self._restart_processes(pool)
+            return AgentResult(agent_id=task.agent_id, success=False, result=None, error=f"Agent worker died: {e}")
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+    async def _run_thread(self, agent: Any, task: AgentTask, cpu_timeout: float) -> AgentResult:
+        # Threads cannot be interrupted; the timeout only stops waiting for the result
+        self.thread_runs += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._thread_pool(), _run_traced, agent, task, tracer.remote_context())
+        try:
+            result, spans = await asyncio.wait_for(future, cpu_timeout)
+            tracer.adopt(spans)
+            return result
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return AgentResult(agent_id=task.agent_id, success=False, result=None,
+                               error=f"Agent did not finish within {cpu_timeout:.0f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "cpu_timeout": self.cpu_timeout,
+            "process_runs": self.process_runs,
+            "thread_runs": self.thread_runs,
+            "fallbacks": self.fallbacks,
+            "timeouts": self.timeouts,
+            "pool_restarts": self.pool_restarts,
+        }
+
+
+agent_executor = AgentExecutor()
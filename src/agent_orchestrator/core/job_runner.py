@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import os
+import uuid
+from typing import List, Optional, Set
+from src.agent_orchestrator.api.models import OrchestrationRequest, OrchestrationResponse
+from src.agent_orchestrator.core.workflow_engine import WorkflowEngine
+from src.agent_orchestrator.core.admission import AdmissionRejected
+from src.agent_orchestrator.core.event_bus import TERMINAL_EVENT
+from src.agent_orchestrator.db.models import TaskStatus
+from src.agent_orchestrator.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """Raised when the background worker pool already has max_pending workflows queued."""
+
+
+class JobAlreadyExists(Exception):
+    """Raised when a submitted workflow_id already has an execution record."""
+
+
+class JobNotFound(Exception):
+    """Raised when a retried workflow_id has no execution record."""
+
+
+class JobNotRetryable(Exception):
+    """Raised when a retried workflow is not failed (or was submitted without a stored request)."""
+
+
+class WorkflowJobRunner:
+    """
+    Bounded in-process worker pool that runs submitted workflows in the background.
+    Progress and results are recorded on WorkflowExecutionDocument so clients can poll.
+    """
+
+    def __init__(self, engine: WorkflowEngine, db_ops, workers: Optional[int] = None,
+                 max_pending: Optional[int] = None):
+        self.engine = engine
+        self.db_ops = db_ops
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "4"))
+        self.max_pending = max_pending or int(os.getenv("JOB_QUEUE_SIZE", "100"))
+        self.admission_retries = 3
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._reserved = 0  # queue slots held by submits still writing their execution record
+        self._running: Set[str] = set()
+        self._submitting: Set[str] = set()
+
+    def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the workers and mark every job they had not finished as failed"""
+        # Taken before cancelling: cancelled workers drop their job from _running on the way out
+        unfinished = list(self._running)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while self._queue is not None and not self._queue.empty():
+            unfinished.append(self._queue.get_nowait().workflow_id)
+            self._queue.task_done()
+        for workflow_id in unfinished:
+            try:
+                await self._fail(workflow_id, "Cancelled: job runner shut down")
+            except Exception:
+                logger.exception("Could not mark workflow %s as cancelled", workflow_id)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def submit(self, req: OrchestrationRequest) -> str:
+        """Queue a workflow and return its id without waiting for it to run"""
+        if self._queue is None:
+            self.start()
+        if self._queue.qsize() + self._reserved >= self.max_pending:
+            raise JobQueueFull(f"{self.max_pending} workflows already queued")
+        # Hold the slot across the awaits below so put_nowait cannot find the queue full
+        self._reserved += 1
+        try:
+            workflow_id = req.workflow_id or f"workflow_{uuid.uuid4().hex}"
+            # _submitting covers two submits of the same id racing past the lookup below
+            if workflow_id in self._submitting:
+                raise JobAlreadyExists(f"Workflow '{workflow_id}' already exists")
+            self._submitting.add(workflow_id)
+            try:
+                if req.workflow_id and await self.db_ops.get_workflow_execution(workflow_id) is not None:
+                    raise JobAlreadyExists(f"Workflow '{workflow_id}' already exists")
+                req = req.model_copy(update={"workflow_id": workflow_id})
+                await self.db_ops.create_workflow_execution(workflow_id, request=req.model_dump())
+            finally:
+                self._submitting.discard(workflow_id)
+        finally:
+            self._reserved -= 1
+        self._queue.put_nowait(req)
+        return workflow_id
+
+    async def retry(self, workflow_id: str):
+        """
+        Queue a failed job again under the same id. Chained jobs resume from their checkpoints, so
+        steps that already succeeded are not re-run.
+        """
+        if self._queue is None:
+            self.start()
+        if self._queue.qsize() + self._reserved >= self.max_pending:
+            raise JobQueueFull(f"{self.max_pending} workflows already queued")
+        self._reserved += 1
+        try:
+            if workflow_id in self._submitting or workflow_id in self._running:
+                raise JobNotRetryable(f"Workflow '{workflow_id}' is already running")
+            self._submitting.add(workflow_id)
+            try:
+                execution = await self.db_ops.get_workflow_execution(workflow_id)
+                if execution is None:
+                    raise JobNotFound(f"Unknown workflow '{workflow_id}'")
+                if execution.request is None:
+                    raise JobNotRetryable(f"Workflow '{workflow_id}' has no stored request to retry")
+                # Conditional on the record still being failed, so concurrent retries queue it once
+                if not await self.db_ops.restart_workflow_execution(workflow_id):
+                    raise JobNotRetryable(
+                        f"Workflow '{workflow_id}' is {execution.status.value}; only failed jobs can be retried"
+                    )
+                req = OrchestrationRequest(**execution.request)
+            finally:
+                self._submitting.discard(workflow_id)
+        finally:
+            self._reserved -= 1
+        self.engine.state_manager.restart(workflow_id)
+        self._queue.put_nowait(req)
+
+    async def _worker(self):
+        while True:
+            req = await self._queue.get()
+            self._running.add(req.workflow_id)
+            try:
+                # One trace per job: the engine's spans plus the result/status writes around them
+                with tracer.workflow(req.workflow_id, "job"):
+                    await self._run(req)
+            except Exception:
+                logger.exception("Background workflow %s failed", req.workflow_id)
+            finally:
+                self._running.discard(req.workflow_id)
+                self._queue.task_done()
+
+    async def _run(self, req: OrchestrationRequest):
+        await self.db_ops.update_workflow_status(req.workflow_id, TaskStatus.RUNNING)
+        for attempt in range(1, self.admission_retries + 1):
+            try:
+                # A rejection is not the end of the job (its streams stay open); _fail ends it after the last attempt
+                response = await self.engine.run(req, retries_admission=True)
+                break
+            except AdmissionRejected as e:
+                # Background jobs can wait out an overload instead of failing
+                if attempt == self.admission_retries:
+                    await self._fail(req.workflow_id, str(e))
+                    return
+                await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                await self._fail(req.workflow_id, str(e))
+                return
+        await self._record(response)
+
+    async def _fail(self, workflow_id: str, error: str):
+        await self.db_ops.complete_workflow_execution(workflow_id, TaskStatus.FAILED, error=error)
+        # Event streams of a job that failed before the engine started it would otherwise never end
+        bus = self.engine.state_manager.event_bus
+        if bus is not None and not bus.finished(workflow_id):
+            self.engine.state_manager.workflow_event(workflow_id, TERMINAL_EVENT, error=error)
+
+    async def _record(self, response: OrchestrationResponse):
+        result_ids = []
+        for result in response.results:
+            # Chained steps carry no task_id; their agent id names the step
+            task_id = f"{response.workflow_id}:{result.task_id or result.agent_id}"
+            if result.result_id is not None:
+                # Already stored by the task queue; a second copy would count twice in the agent stats
+                await self.db_ops.label_agent_result(result.result_id, task_id, result.queue_wait)
+                result_ids.append(result.result_id)
+                continue
+            doc = await self.db_ops.store_agent_result(result, task_id=task_id)
+            result_ids.append(str(doc.id))
+        decisions = [r.result for r in response.results if isinstance(r.result, dict) and "human_review" in r.result]
+        await self.db_ops.complete_workflow_execution(
+            response.workflow_id,
+            TaskStatus.COMPLETED if all(r.success for r in response.results) else TaskStatus.FAILED,
+            result_ids=result_ids,
+            elapsed=response.elapsed,
+            human_review_required=any(d["human_review"] for d in decisions),
+            confidence_score=decisions[-1].get("avg_confidence") if decisions else None,
+        )
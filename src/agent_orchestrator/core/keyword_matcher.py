@@ -0,0 +1,70 @@
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of lower-cased keywords.
+    Building is O(total keyword length); scanning is a single pass over the text.
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = [k.lower() for k in keywords]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for idx, keyword in enumerate(self.keywords):
+            if keyword:
+                self._insert(keyword, idx)
+        self._build_failure_links()
+
+    def _insert(self, keyword: str, idx: int):
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(idx)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Inherit matches that end at the failure state (suffix keywords)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str, word_boundaries: bool = False) -> Iterator[Tuple[int, int]]:
+        """
+        Yield (start, keyword_index) for every occurrence in text (already lower-cased).
+        With word_boundaries, a match must not be preceded or followed by a word character.
+        """
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for idx in out[state]:
+                start = pos - len(keywords[idx]) + 1
+                if word_boundaries and (
+                    (start > 0 and _is_word_char(text[start - 1]))
+                    or (pos + 1 < len(text) and _is_word_char(text[pos + 1]))
+                ):
+                    continue
+                yield start, idx
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
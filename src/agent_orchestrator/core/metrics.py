@@ -0,0 +1,205 @@
+import math
+import os
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Seconds; covers cache hits through slow cold-start inference calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts[i] holds observations <= buckets[i], the last slot is +Inf"""
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Linear interpolation within the bucket holding rank q, like PromQL histogram_quantile"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            if n and cumulative + n >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]  # +Inf bucket: the largest finite bound is all we know
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / n
+            cumulative += n
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    In-process counters, gauges and histograms keyed by metric name and labels, rendered in the
+    Prometheus text format by /metrics. Everything is updated from the event loop, so no locking.
+    """
+
+    # name: (type, help)
+    METRICS = {
+        "agent_task_duration_seconds": ("histogram", "Agent execution time per task"),
+        "agent_queue_wait_seconds": ("histogram", "Time a task waited for an agent slot"),
+        "agent_tasks_total": ("counter", "Agent tasks by outcome"),
+        "agent_retries_total": ("counter", "Upstream call retries made by agents"),
+        "agent_tasks_in_progress": ("gauge", "Tasks currently executing per agent"),
+        "hf_request_duration_seconds": ("histogram", "Latency of Hugging Face inference calls"),
+        "hf_requests_total": ("counter", "Hugging Face inference calls by status"),
+        "workflows_in_progress": ("gauge", "Workflows currently running"),
+    }
+
+    def __init__(self, buckets: Optional[Iterable[float]] = None):
+        if buckets is None:
+            env = os.getenv("METRICS_BUCKETS")
+            buckets = [float(b) for b in env.split(",")] if env else DEFAULT_BUCKETS
+        self.buckets = tuple(sorted(buckets))
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.gauges: Dict[str, Dict[Labels, float]] = {}
+        self.last_seen: Dict[str, float] = {}  # agent_id: wall-clock time of its last finished task
+        self.started_at = time.time()
+
+    def observe(self, name: str, value: float, **labels: Any):
+        series = self.histograms.setdefault(name, {})
+        key = _labels(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1.0, **labels: Any):
+        series = self.counters.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0.0) + amount
+
+    def add(self, name: str, amount: float, **labels: Any):
+        series = self.gauges.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0.0) + amount
+
+    def histogram(self, name: str, **labels: Any) -> Optional[Histogram]:
+        return self.histograms.get(name, {}).get(_labels(labels))
+
+    def counter(self, name: str, **labels: Any) -> float:
+        return self.counters.get(name, {}).get(_labels(labels), 0.0)
+
+    def gauge(self, name: str, **labels: Any) -> float:
+        return self.gauges.get(name, {}).get(_labels(labels), 0.0)
+
+    # Agent-level helpers used by the engine and the agents
+
+    def record_task(self, agent_id: str, execution_time: float, success: bool):
+        self.observe("agent_task_duration_seconds", execution_time, agent=agent_id)
+        self.inc("agent_tasks_total", agent=agent_id, outcome="success" if success else "failure")
+        self.last_seen[agent_id] = time.time()
+
+    def record_queue_wait(self, agent_id: str, seconds: float):
+        # Known only once the scheduler hands the task an agent slot, so recorded apart from record_task
+        self.observe("agent_queue_wait_seconds", seconds, agent=agent_id)
+
+    def record_upstream(self, model: str, seconds: float, status: Any):
+        self.observe("hf_request_duration_seconds", seconds, model=model)
+        self.inc("hf_requests_total", model=model, status=status)
+
+    def record_retry(self, agent_id: str, reason: str):
+        self.inc("agent_retries_total", agent=agent_id, reason=reason)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines: List[str] = []
+        for name, (kind, help_text) in self.METRICS.items():
+            store = {"histogram": self.histograms, "counter": self.counters, "gauge": self.gauges}[kind]
+            series = store.get(name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(series.items()):
+                if kind != "histogram":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, n in zip(value.buckets + (math.inf,), value.counts):
+                    cumulative += n
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value.sum)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+    def agent_summary(self, agent_id: str) -> Dict[str, Any]:
+        """Per-agent numbers for the dashboard (times in seconds)"""
+        successes = self.counter("agent_tasks_total", agent=agent_id, outcome="success")
+        failures = self.counter("agent_tasks_total", agent=agent_id, outcome="failure")
+        total = successes + failures
+        duration = self.histogram("agent_task_duration_seconds", agent=agent_id)
+        wait = self.histogram("agent_queue_wait_seconds", agent=agent_id)
+        retries = sum(v for labels, v in self.counters.get("agent_retries_total", {}).items()
+                      if ("agent", agent_id) in labels)
+        last_seen = self.last_seen.get(agent_id)
+        return {
+            "tasks": int(total),
+            "failures": int(failures),
+            "success_rate": successes / total if total else None,
+            "avg_response_time": duration.mean if duration else None,
+            "p95_response_time": duration.quantile(0.95) if duration else None,
+            "avg_queue_wait": wait.mean if wait else None,
+            "retries": int(retries),
+            "in_progress": int(self.gauge("agent_tasks_in_progress", agent=agent_id)),
+            "last_used_seconds_ago": time.time() - last_seen if last_seen else None,
+        }
+
+    def upstream_summary(self) -> Dict[str, Dict[str, Any]]:
+        summary = {}
+        for labels, histogram in self.histograms.get("hf_request_duration_seconds", {}).items():
+            model = dict(labels)["model"]
+            summary[model] = {"requests": histogram.count, "avg_latency": histogram.mean,
+                              "p95_latency": histogram.quantile(0.95)}
+        return summary
+
+
+def result_confidence(result) -> Optional[float]:
+    # Agents report confidence as "score" (research/analysis) or "avg_confidence" (decision)
+    if isinstance(result.result, dict):
+        value: Any = result.result.get("score", result.result.get("avg_confidence"))
+        return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+    return None
+
+
+# Process-wide registry scraped at /metrics
+metrics = MetricsRegistry()
@@ -1,13 +1,124 @@
 import asyncio
-from typing import Dict
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+from src.agent_orchestrator.core.event_bus import WorkflowEventBus, TERMINAL_EVENT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKFLOW = "default"
+
+# spill(workflow_id, {step: status}) persists state that is evicted from memory
+SpillFn = Callable[[str, Dict[str, str]], Awaitable[Any]]
+
+
+class _WorkflowState:
+    __slots__ = ("steps", "finished", "updated_at")
 
-class StateManager:
     def __init__(self):
-        self.status: Dict[str, str] = {}
+        self.steps: Dict[str, str] = {}
+        self.finished = False
+        self.updated_at = time.monotonic()
+
+
+class StateManager:
+    def __init__(self, event_bus: Optional[WorkflowEventBus] = None, max_workflows: Optional[int] = None,
+                 finished_ttl: Optional[float] = None, idle_ttl: Optional[float] = None,
+                 spill: Optional[SpillFn] = None):
+        """
+        State is kept per (workflow_id, step). At most max_workflows are held in memory;
+        finished workflows are evicted after finished_ttl seconds, any workflow after idle_ttl
+        seconds without updates, and the least recently updated finished ones go first when the cap
+        is hit (running workflows are never evicted for space).
+        Evicted state is handed to spill if given.
+        """
+        self.workflows: "OrderedDict[str, _WorkflowState]" = OrderedDict()
+        self.max_workflows = max_workflows or int(os.getenv("STATE_MAX_WORKFLOWS", "10000"))
+        self.finished_ttl = finished_ttl if finished_ttl is not None else float(os.getenv("STATE_FINISHED_TTL", "3600"))
+        self.idle_ttl = idle_ttl if idle_ttl is not None else float(os.getenv("STATE_IDLE_TTL", "86400"))
+        self.spill = spill
         self.lock = asyncio.Lock()
+        self.event_bus = event_bus
+        self.evictions = 0
+
+    def set_status(self, task_id: str, status: str, workflow_id: Optional[str] = None, **details: Any):
+        state = self._touch(workflow_id or DEFAULT_WORKFLOW)
+        state.steps[task_id] = status
+        # Push the transition to anyone streaming this workflow
+        if self.event_bus and workflow_id:
+            self.event_bus.publish(workflow_id, "step", step=task_id, status=status, **details)
+
+    def workflow_event(self, workflow_id: Optional[str], event_type: str, **details: Any):
+        if event_type == TERMINAL_EVENT:
+            self._touch(workflow_id or DEFAULT_WORKFLOW).finished = True
+        if self.event_bus and workflow_id:
+            self.event_bus.publish(workflow_id, event_type, **details)
+
+    def restart(self, workflow_id: str):
+        """A finished workflow runs again (a retried job): it is running until its next terminal event"""
+        state = self.workflows.get(workflow_id)
+        if state is not None:
+            state.finished = False
+        if self.event_bus:
+            self.event_bus.reopen(workflow_id)
+
+    def get_status(self, task_id: str, workflow_id: Optional[str] = None) -> str:
+        state = self.workflows.get(workflow_id or DEFAULT_WORKFLOW)
+        return state.steps.get(task_id, "unknown") if state else "unknown"
+
+    def get_workflow(self, workflow_id: str) -> Optional[Dict[str, str]]:
+        state = self.workflows.get(workflow_id)
+        return dict(state.steps) if state else None
+
+    def _touch(self, workflow_id: str) -> _WorkflowState:
+        state = self.workflows.get(workflow_id)
+        if state is None:
+            state = self.workflows[workflow_id] = _WorkflowState()
+        else:
+            self.workflows.move_to_end(workflow_id)
+        state.updated_at = time.monotonic()
+        self._evict()
+        return state
+
+    def _evict(self):
+        # Oldest entries are at the front. Over the cap only finished workflows are dropped (LRU first);
+        # running ones stay until they finish or pass idle_ttl.
+        now = time.monotonic()
+        excess = len(self.workflows) - self.max_workflows
+        newest_ttl = min(self.idle_ttl, self.finished_ttl)
+        victims = []
+        for workflow_id, state in self.workflows.items():
+            age = now - state.updated_at
+            expired = age > self.idle_ttl or (state.finished and age > self.finished_ttl)
+            if expired or (excess > 0 and state.finished):
+                victims.append((workflow_id, state))
+                excess -= 1
+            elif excess <= 0 and age <= newest_ttl:
+                break  # everything after this is younger still
+        for workflow_id, state in victims:
+            del self.workflows[workflow_id]
+            self.evictions += 1
+            self._spill(workflow_id, state)
 
-    def set_status(self, task_id: str, status: str):
-        self.status[task_id] = status
+    def _spill(self, workflow_id: str, state: _WorkflowState):
+        if self.spill is None or workflow_id == DEFAULT_WORKFLOW:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = asyncio.ensure_future(self.spill(workflow_id, state.steps))
+        task.add_done_callback(
+            lambda t: t.cancelled() or not t.exception()
+            or logger.warning("Spilling state of %s failed: %s", workflow_id, t.exception())
+        )
 
-    def get_status(self, task_id: str) -> str:
-        return self.status.get(task_id, "unknown")
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workflows": len(self.workflows),
+            "max_workflows": self.max_workflows,
+            "finished_ttl": self.finished_ttl,
+            "evictions": self.evictions,
+        }
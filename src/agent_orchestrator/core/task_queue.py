@@ -0,0 +1,222 @@
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from beanie import PydanticObjectId
+from pymongo import ReturnDocument
+from src.agent_orchestrator.api.models import AgentTask, AgentResult
+from src.agent_orchestrator.db.models import AgentTaskDocument, AgentResultDocument, TaskStatus
+from src.agent_orchestrator.db.database import get_collection
+from src.agent_orchestrator.core.metrics import result_confidence
+
+
+class QueuedTask:
+    __slots__ = ("task_id", "agent_id", "task", "attempts", "queue_wait")
+
+    def __init__(self, task_id: str, agent_id: str, task: AgentTask, attempts: int, queue_wait: Optional[float] = None):
+        self.task_id = task_id
+        self.agent_id = agent_id
+        self.task = task
+        self.attempts = attempts
+        self.queue_wait = queue_wait  # seconds between enqueue and this lease
+
+
+def _exhausted(task_id: str, agent_id: str, attempts: int) -> AgentResult:
+    return AgentResult(agent_id=agent_id, task_id=task_id, success=False, result=None,
+                       error=f"Task abandoned after {attempts} expired leases")
+
+
+class MongoTaskQueue:
+    """
+    Work queue over agent_tasks. Workers lease a PENDING task (or one whose lease expired)
+    with an atomic find-and-modify that flips it to RUNNING, so each task runs on one worker at a time.
+    A task whose lease expired max_attempts times (it keeps killing or hanging its worker) is failed.
+    """
+
+    def __init__(self, poll_interval: Optional[float] = None, result_timeout: Optional[float] = None,
+                 max_attempts: Optional[int] = None, sweep_interval: float = 5.0):
+        self.poll_interval = poll_interval or float(os.getenv("QUEUE_POLL_INTERVAL", "0.2"))
+        self.result_timeout = result_timeout or float(os.getenv("QUEUE_RESULT_TIMEOUT", "300"))
+        self.max_attempts = max_attempts or int(os.getenv("QUEUE_MAX_ATTEMPTS", "3"))
+        self.sweep_interval = sweep_interval
+        self._last_sweep = 0.0
+
+    async def enqueue(self, agent_id: str, task: AgentTask, workflow_id: Optional[str] = None) -> str:
+        doc = AgentTaskDocument(agent_id=agent_id, query=task.query, params=task.params,
+                                workflow_id=workflow_id, task_key=task.task_id)
+        await doc.insert()
+        return str(doc.id)
+
+    async def lease(self, worker_id: str, agent_ids: List[str], lease_seconds: float) -> Optional[QueuedTask]:
+        now = datetime.utcnow()
+        if time.monotonic() - self._last_sweep > self.sweep_interval:
+            self._last_sweep = time.monotonic()
+            await self._fail_exhausted(now)
+        raw = await get_collection(AgentTaskDocument).find_one_and_update(
+            {
+                "agent_id": {"$in": agent_ids},
+                "$or": [
+                    {"status": TaskStatus.PENDING.value},
+                    {"status": TaskStatus.RUNNING.value, "lease_expires_at": {"$lt": now},
+                     "attempts": {"$lt": self.max_attempts}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": TaskStatus.RUNNING.value,
+                    "lease_owner": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if raw is None:
+            return None
+        task = AgentTask(agent_id=raw["agent_id"], query=raw["query"], params=raw.get("params"),
+                         task_id=raw.get("task_key"))
+        created_at = raw.get("created_at")
+        queue_wait = max(0.0, (now - created_at).total_seconds()) if created_at else None
+        return QueuedTask(str(raw["_id"]), raw["agent_id"], task, raw.get("attempts", 1), queue_wait)
+
+    async def renew(self, task_id: str, worker_id: str, lease_seconds: float) -> bool:
+        result = await get_collection(AgentTaskDocument).update_one(
+            {"_id": PydanticObjectId(task_id), "lease_owner": worker_id},
+            {"$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds)}},
+        )
+        return result.modified_count > 0
+
+    async def _fail_exhausted(self, now: datetime):
+        """Fail expired tasks that already used up max_attempts leases, so their waiters get an answer"""
+        expired = {"status": TaskStatus.RUNNING.value, "lease_expires_at": {"$lt": now},
+                   "attempts": {"$gte": self.max_attempts}}
+        async for raw in get_collection(AgentTaskDocument).find(expired, {"agent_id": 1, "attempts": 1}):
+            closed = await get_collection(AgentTaskDocument).update_one(
+                {"_id": raw["_id"], **expired},
+                {"$set": {"status": TaskStatus.FAILED.value, "updated_at": now}},
+            )
+            if closed.modified_count:
+                task_id = str(raw["_id"])
+                await self._store_result(task_id, _exhausted(task_id, raw["agent_id"], raw["attempts"]), None, None)
+
+    async def _store_result(self, task_id: str, result: AgentResult, execution_time: Optional[float],
+                            queue_wait: Optional[float]):
+        # Keyed by task_id: a task re-run after an expired lease replaces the earlier result instead of adding one
+        await get_collection(AgentResultDocument).update_one(
+            {"task_id": task_id},
+            {"$set": {
+                "agent_id": result.agent_id,
+                "success": result.success,
+                "result": result.result,
+                "error": result.error,
+                "confidence_score": result_confidence(result),
+                "execution_time": execution_time,
+                "queue_wait": queue_wait,
+                "upstream_latency": result.upstream_latency,
+                "retries": result.retries,
+                "created_at": datetime.utcnow(),
+            }},
+            upsert=True,
+        )
+
+    async def complete(self, queued: QueuedTask, worker_id: str, result: AgentResult, execution_time: float) -> bool:
+        """
+        Store the result, then close the task unless the lease was lost to another worker.
+        The result goes first so a crash in between cannot leave a closed task without one.
+        """
+        owner = {"_id": PydanticObjectId(queued.task_id), "lease_owner": worker_id, "status": TaskStatus.RUNNING.value}
+        if await get_collection(AgentTaskDocument).count_documents(owner, limit=1) == 0:
+            return False
+        await self._store_result(queued.task_id, result, execution_time, queued.queue_wait)
+        closed = await get_collection(AgentTaskDocument).update_one(
+            owner,
+            {"$set": {
+                "status": (TaskStatus.COMPLETED if result.success else TaskStatus.FAILED).value,
+                "updated_at": datetime.utcnow(),
+            }},
+        )
+        # Lost in between: the new owner's result will replace this one when it completes
+        return closed.modified_count > 0
+
+    async def wait_result(self, task_id: str, timeout: Optional[float] = None) -> AgentResult:
+        deadline = time.monotonic() + (timeout or self.result_timeout)
+        delay = self.poll_interval
+        while time.monotonic() < deadline:
+            doc = await AgentResultDocument.find_one(AgentResultDocument.task_id == task_id)
+            if doc is not None:
+                return AgentResult(agent_id=doc.agent_id, success=doc.success, result=doc.result, error=doc.error,
+                                   elapsed=doc.execution_time, queue_wait=doc.queue_wait,
+                                   upstream_latency=doc.upstream_latency, retries=doc.retries,
+                                   result_id=str(doc.id))
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, 2.0)
+        raise TimeoutError(f"No worker finished task {task_id} in time")
+
+
+class InMemoryTaskQueue:
+    """
+    Same interface as MongoTaskQueue, for running API and workers in one process (tests, local dev).
+    """
+
+    def __init__(self, result_timeout: Optional[float] = None, max_attempts: Optional[int] = None):
+        self.result_timeout = result_timeout or float(os.getenv("QUEUE_RESULT_TIMEOUT", "300"))
+        self.max_attempts = max_attempts or int(os.getenv("QUEUE_MAX_ATTEMPTS", "3"))
+        self._tasks: Dict[str, dict] = {}
+        self._results: Dict[str, AgentResult] = {}
+        self._done: Dict[str, asyncio.Event] = {}
+
+    async def enqueue(self, agent_id: str, task: AgentTask, workflow_id: Optional[str] = None) -> str:
+        task_id = uuid.uuid4().hex
+        self._tasks[task_id] = {"agent_id": agent_id, "task": task, "status": TaskStatus.PENDING,
+                                "lease_owner": None, "lease_expires_at": 0.0, "attempts": 0,
+                                "enqueued_at": time.monotonic()}
+        self._done[task_id] = asyncio.Event()
+        return task_id
+
+    async def lease(self, worker_id: str, agent_ids: List[str], lease_seconds: float) -> Optional[QueuedTask]:
+        now = time.monotonic()
+        for task_id, entry in list(self._tasks.items()):
+            if entry["agent_id"] not in agent_ids:
+                continue
+            expired = entry["status"] == TaskStatus.RUNNING and entry["lease_expires_at"] < now
+            if expired and entry["attempts"] >= self.max_attempts:
+                del self._tasks[task_id]
+                self._results[task_id] = _exhausted(task_id, entry["agent_id"], entry["attempts"])
+                self._done[task_id].set()
+                continue
+            if entry["status"] == TaskStatus.PENDING or expired:
+                entry.update(status=TaskStatus.RUNNING, lease_owner=worker_id,
+                             lease_expires_at=now + lease_seconds, attempts=entry["attempts"] + 1)
+                return QueuedTask(task_id, entry["agent_id"], entry["task"], entry["attempts"],
+                                  now - entry["enqueued_at"])
+        return None
+
+    async def renew(self, task_id: str, worker_id: str, lease_seconds: float) -> bool:
+        entry = self._tasks.get(task_id)
+        if entry is None or entry["lease_owner"] != worker_id:
+            return False
+        entry["lease_expires_at"] = time.monotonic() + lease_seconds
+        return True
+
+    async def complete(self, queued: QueuedTask, worker_id: str, result: AgentResult, execution_time: float) -> bool:
+        entry = self._tasks.get(queued.task_id)
+        if entry is None or entry["lease_owner"] != worker_id or entry["status"] != TaskStatus.RUNNING:
+            return False
+        del self._tasks[queued.task_id]
+        self._results[queued.task_id] = result.model_copy(
+            update={"elapsed": execution_time, "queue_wait": queued.queue_wait}
+        )
+        self._done[queued.task_id].set()
+        return True
+
+    async def wait_result(self, task_id: str, timeout: Optional[float] = None) -> AgentResult:
+        try:
+            await asyncio.wait_for(self._done[task_id].wait(), timeout or self.result_timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"No worker finished task {task_id} in time")
+        self._done.pop(task_id)
+        return self._results.pop(task_id)
@@ -1,19 +1,66 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
 from src.agent_orchestrator.api.models import AgentTask
+from src.agent_orchestrator.core.keyword_matcher import KeywordMatcher
 
 class TaskRouter:
-    def __init__(self, agent_capabilities: Dict[str, List[str]]):
+    def __init__(self, agent_capabilities: Dict[str, Union[List[str], Dict[str, float]]],
+                 word_boundaries: bool = False):
         """
         agent_capabilities: {agent_id: [list of capabilities/keywords]}
+            or {agent_id: {keyword: weight}} to weight individual keywords
+        word_boundaries: only count keywords that appear as whole words
         """
         self.agent_capabilities = agent_capabilities
+        self.word_boundaries = word_boundaries
+        self.agent_ids = list(agent_capabilities.keys())
+
+        # Compile the whole capability table into one automaton
+        keywords: List[str] = []
+        self._keyword_owners: List[Tuple[int, float]] = []  # keyword index -> (agent index, weight)
+        for agent_idx, capabilities in enumerate(agent_capabilities.values()):
+            weighted = capabilities.items() if isinstance(capabilities, dict) else ((k, 1.0) for k in capabilities)
+            for keyword, weight in weighted:
+                keywords.append(keyword)
+                self._keyword_owners.append((agent_idx, float(weight)))
+        self.matcher = KeywordMatcher(keywords)
+
+    def score(self, query: str) -> Dict[str, float]:
+        """
+        Sum of weights of the distinct keywords each agent matched in the query.
+        """
+        return {self.agent_ids[i]: s for i, (s, _) in self._scan(query).items()}
+
+    def _scan(self, query: str) -> Dict[int, Tuple[float, int]]:
+        # agent index -> (score, position of first match)
+        scores: Dict[int, Tuple[float, int]] = {}
+        seen = set()
+        for start, kw_idx in self.matcher.iter_matches(query.lower(), self.word_boundaries):
+            if kw_idx in seen:
+                continue
+            seen.add(kw_idx)
+            agent_idx, weight = self._keyword_owners[kw_idx]
+            score, first = scores.get(agent_idx, (0.0, start))
+            scores[agent_idx] = (score + weight, min(first, start))
+        return scores
+
+    def best_agent(self, query: str) -> Optional[str]:
+        scores = self._scan(query)
+        if not scores:
+            return None
+        # Highest score wins; ties go to the agent matched earliest in the query, then declaration order
+        best = min(scores.items(), key=lambda item: (-item[1][0], item[1][1], item[0]))
+        return self.agent_ids[best[0]]
 
     async def route_task(self, task: AgentTask) -> str:
         """
         Analyze the task and return the best agent_id.
         """
-        for agent_id, capabilities in self.agent_capabilities.items():
-            if any(keyword in task.query.lower() for keyword in capabilities):
-                return agent_id
         # Default: first agent if no match
-        return next(iter(self.agent_capabilities.keys()))
+        return self.best_agent(task.query) or self.agent_ids[0]
+
+    async def route_many(self, tasks: List[AgentTask]) -> List[str]:
+        """
+        Route every task of a workflow in one call.
+        """
+        default = self.agent_ids[0]
+        return [self.best_agent(task.query) or default for task in tasks]
@@ -0,0 +1,261 @@
+import functools
+import os
+import random
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+# (workflow_id, parent span id): what a worker thread/process needs to attach its spans to the caller's
+RemoteContext = Tuple[str, Optional[str]]
+
+
+class Span:
+    __slots__ = ("span_id", "parent_id", "name", "start", "end", "attributes", "status", "error")
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any], start: Optional[float] = None):
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start = start if start is not None else time.time()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "duration_ms": (self.end - self.start) * 1000 if self.end is not None else None,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stands in for a span when the workflow is not sampled"""
+    __slots__ = ()
+
+    def set(self, **attributes: Any):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _Trace:
+    __slots__ = ("workflow_id", "run_id", "spans", "dropped", "max_spans")
+
+    def __init__(self, workflow_id: str, max_spans: int):
+        self.workflow_id = workflow_id
+        self.run_id = uuid.uuid4().hex[:16]  # one per run, so re-runs of a workflow id do not mix spans
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self.max_spans = max_spans
+
+    def add(self, span: Span) -> bool:
+        if len(self.spans) >= self.max_spans:
+            self.dropped += 1
+            return False
+        self.spans.append(span)
+        return True
+
+
+# Propagated into tasks created by gather/ensure_future and into asyncio.to_thread calls
+_current_trace: ContextVar[Optional[_Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+
+
+class _SpanScope:
+    __slots__ = ("name", "attributes", "span", "token")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.span: Optional[Span] = None
+        self.token = None
+
+    def __enter__(self):
+        trace = _current_trace.get()
+        if trace is None:
+            return NOOP_SPAN
+        span = Span(self.name, _current_span.get(), self.attributes)
+        if not trace.add(span):
+            return NOOP_SPAN
+        self.span = span
+        self.token = _current_span.set(span.span_id)
+        return span
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.span is None:
+            return False
+        self.span.end = time.time()
+        if exc_type is not None:
+            self.span.status = "error"
+            self.span.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self.token)
+        return False
+
+
+class _TraceScope:
+    """Root of a workflow's trace: installs the trace (None when not sampled) in the current context"""
+    __slots__ = ("tracer", "trace", "scope", "tokens")
+
+    def __init__(self, tracer: "Tracer", trace: Optional[_Trace], scope: _SpanScope):
+        self.tracer = tracer
+        self.trace = trace
+        self.scope = scope
+        self.tokens = None
+
+    def __enter__(self):
+        self.tokens = (_current_trace.set(self.trace), _current_span.set(None))
+        return self.scope.__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.scope.__exit__(exc_type, exc, tb)
+        _current_span.reset(self.tokens[1])
+        _current_trace.reset(self.tokens[0])
+        if self.trace is not None:
+            self.tracer._finish(self.trace)
+        return False
+
+
+class Tracer:
+    """
+    Span tracing per workflow. A workflow is sampled (TRACE_SAMPLE_RATE) when its trace starts;
+    spans of unsampled workflows cost one context variable lookup. Each run records into its own
+    trace; the latest completed run of the last max_workflows workflows is kept in memory, each
+    capped at max_spans spans.
+    """
+
+    def __init__(self, sample_rate: Optional[float] = None, max_workflows: Optional[int] = None,
+                 max_spans: Optional[int] = None):
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+        self.max_workflows = max_workflows or int(os.getenv("TRACE_MAX_WORKFLOWS", "1000"))
+        self.max_spans = max_spans or int(os.getenv("TRACE_MAX_SPANS", "2000"))
+        self._traces: "OrderedDict[str, _Trace]" = OrderedDict()  # workflow_id: latest completed run
+        self._running: Dict[str, _Trace] = {}  # run_id: trace still being recorded
+        self.sampled = 0
+        self.not_sampled = 0
+
+    def workflow(self, workflow_id: str, name: str = "workflow", **attributes: Any):
+        """
+        Start (or, when already inside this workflow's trace, continue) the trace of a workflow.
+        When the run completes its trace replaces the workflow id's previous one; concurrent runs
+        of one id (or anonymous runs) never share a trace.
+        """
+        current = _current_trace.get()
+        if current is not None and current.workflow_id == workflow_id:
+            return _SpanScope(name, attributes)
+        trace = None
+        if self.sample_rate >= 1.0 or random.random() < self.sample_rate:
+            trace = _Trace(workflow_id, self.max_spans)
+            self._running[trace.run_id] = trace
+            self.sampled += 1
+        else:
+            self.not_sampled += 1
+        return _TraceScope(self, trace, _SpanScope(name, attributes))
+
+    def _finish(self, trace: _Trace):
+        self._running.pop(trace.run_id, None)
+        self._traces.pop(trace.workflow_id, None)
+        self._traces[trace.workflow_id] = trace
+        while len(self._traces) > self.max_workflows:
+            self._traces.popitem(last=False)
+
+    def span(self, name: str, **attributes: Any) -> _SpanScope:
+        return _SpanScope(name, attributes)
+
+    def record(self, name: str, start: float, end: float, **attributes: Any):
+        """Add an already finished interval (wall-clock seconds) as a child of the current span"""
+        trace = _current_trace.get()
+        if trace is None:
+            return
+        span = Span(name, _current_span.get(), attributes, start=start)
+        span.end = end
+        trace.add(span)
+
+    def active(self) -> bool:
+        return _current_trace.get() is not None
+
+    def remote_context(self) -> Optional[RemoteContext]:
+        trace = _current_trace.get()
+        return (trace.workflow_id, _current_span.get()) if trace is not None else None
+
+    def collect(self, remote: Optional[RemoteContext]) -> "_Collector":
+        """In a worker thread/process: record spans under the caller's span, to be handed back with the result"""
+        return _Collector(remote, self.max_spans)
+
+    def adopt(self, spans: List[Span]):
+        """Merge spans recorded by collect() into the current trace"""
+        trace = _current_trace.get()
+        if trace is None:
+            return
+        for span in spans:
+            trace.add(span)
+
+    def get(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """The latest completed run's trace, or the newest run still in progress if none completed yet"""
+        trace = self._traces.get(workflow_id)
+        in_progress = trace is None
+        if in_progress:
+            # dicts keep insertion order, so the last match is the newest run
+            trace = next((t for t in reversed(self._running.values()) if t.workflow_id == workflow_id), None)
+            if trace is None:
+                return None
+        spans = sorted(trace.spans, key=lambda s: s.start)
+        return {"workflow_id": workflow_id, "run_id": trace.run_id, "in_progress": in_progress,
+                "spans": [s.to_dict() for s in spans], "dropped_spans": trace.dropped}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "workflows": len(self._traces),
+            "running": len(self._running),
+            "max_workflows": self.max_workflows,
+            "sampled": self.sampled,
+            "not_sampled": self.not_sampled,
+        }
+
+
+class _Collector:
+    __slots__ = ("remote", "trace", "tokens")
+
+    def __init__(self, remote: Optional[RemoteContext], max_spans: int):
+        self.remote = remote
+        self.trace = _Trace(remote[0], max_spans) if remote else None
+        self.tokens = None
+
+    def __enter__(self) -> List[Span]:
+        parent = self.remote[1] if self.remote else None
+        self.tokens = (_current_trace.set(self.trace), _current_span.set(parent))
+        return self.trace.spans if self.trace else []
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self.tokens[1])
+        _current_trace.reset(self.tokens[0])
+        return False
+
+
+def traced(name: str):
+    """Decorator: run an async function inside a span"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# Process-wide tracer; worker processes get their own and ship spans back through collect()
+tracer = Tracer()
@@ -1,67 +1,237 @@
-from typing import List
+import logging
+import os
+import time
+import uuid
+from functools import partial
+from typing import Any, Dict, List, Optional
 from src.agent_orchestrator.core.task_router import TaskRouter
 from src.agent_orchestrator.core.agent_manager import AgentManager
-from src.agent_orchestrator.api.models import OrchestrationRequest, OrchestrationResponse, AgentResult
+from src.agent_orchestrator.core.dag_scheduler import DagScheduler
+from src.agent_orchestrator.core.admission import AdmissionController, AdmissionRejected
+from src.agent_orchestrator.api.models import OrchestrationRequest, OrchestrationResponse, AgentResult, AgentTask
 from src.agent_orchestrator.core.state_manager import StateManager
+from src.agent_orchestrator.core.metrics import metrics, result_confidence as _confidence
+from src.agent_orchestrator.core.tracing import tracer
+from src.agent_orchestrator.core.checkpoints import input_hash
+
+logger = logging.getLogger(__name__)
 
 class WorkflowEngine:
-    def __init__(self, task_router: TaskRouter, agent_manager: AgentManager, state_manager: StateManager):
+    def __init__(self, task_router: TaskRouter, agent_manager: AgentManager, state_manager: StateManager,
+                 scheduler: DagScheduler = None, admission: AdmissionController = None, task_queue=None,
+                 checkpoints=None):
+        """
+        task_queue: if given (MongoTaskQueue / InMemoryTaskQueue), tasks are enqueued for worker
+        nodes instead of being executed in this process.
+        checkpoints: if given (MongoCheckpointStore / InMemoryCheckpointStore), run_full_workflow
+        stores each successful step and a re-run of the workflow reuses them instead of re-executing.
+        """
         self.task_router = task_router
         self.agent_manager = agent_manager
         self.state_manager = state_manager
+        self.admission = admission
+        self.task_queue = task_queue
+        self.checkpoints = checkpoints
+        self.scheduler = scheduler or DagScheduler(
+            max_concurrency=int(os.getenv("WORKFLOW_MAX_CONCURRENCY", "8")),
+            default_agent_concurrency=int(os.getenv("WORKFLOW_AGENT_CONCURRENCY", "4")),
+            admission=admission,
+        )
 
-    async def run_workflow(self, req: OrchestrationRequest) -> OrchestrationResponse:
-        results: List[AgentResult] = []
-        for task in req.tasks:
-            agent_id = await self.task_router.route_task(task)
-            await self.agent_manager.increment_load(agent_id)
-            self.state_manager.set_status(task.agent_id, "started")
-            try:
-                # Assuming async agent execution (replace with real Hugging Face call/agent logic)
-                # Example: result = await agents[agent_id].run(task)
-                result_data = {"mock_output": "result"}  # Replace with real result!
-                result = AgentResult(agent_id=agent_id, success=True, result=result_data)
-                self.state_manager.set_status(task.agent_id, "finished")
-            except Exception as e:
-                result = AgentResult(agent_id=agent_id, success=False, result=None, error=str(e))
-                self.state_manager.set_status(task.agent_id, "error")
-            await self.agent_manager.decrement_load(agent_id)
-            results.append(result)
+    async def run(self, req: OrchestrationRequest, retries_admission: bool = False) -> OrchestrationResponse:
+        """run_full_workflow for mode="chained", otherwise run_workflow"""
+        if req.mode == "chained":
+            return await self.run_full_workflow(req)
+        return await self.run_workflow(req, retries_admission)
+
+    async def run_workflow(self, req: OrchestrationRequest, retries_admission: bool = False) -> OrchestrationResponse:
+        """
+        retries_admission: the caller runs the workflow again after AdmissionRejected, so a rejection
+        publishes workflow_rejected and leaves the workflow running instead of ending its streams
+        """
+        # Anonymous runs get their own id so concurrent ones do not share state, events or traces
+        workflow_id = req.workflow_id or f"workflow_{uuid.uuid4().hex}"
+        with tracer.workflow(workflow_id, "workflow.run", tasks=len(req.tasks)):
+            return await self._run_workflow(req, workflow_id, retries_admission)
+
+    async def _run_workflow(self, req: OrchestrationRequest, workflow_id: str,
+                            retries_admission: bool = False) -> OrchestrationResponse:
+        start = time.perf_counter()
+        with tracer.span("route", tasks=len(req.tasks)):
+            agent_ids = await self.task_router.route_many(req.tasks)
+        # Shed the whole workflow up front rather than queueing part of it
+        reservation = self.admission.reserve(agent_ids) if self.admission else None
+        metrics.add("workflows_in_progress", 1)
+        self.state_manager.workflow_event(workflow_id, "workflow_started", steps=[
+            {"step": task.task_id or str(i), "agent_id": agent_id} for i, (task, agent_id) in enumerate(zip(req.tasks, agent_ids))
+        ])
+        try:
+            results = await self.scheduler.run(
+                list(zip(req.tasks, agent_ids)), partial(self._run_task, workflow_id), reservation
+            )
+        except AdmissionRejected as e:
+            event = "workflow_rejected" if retries_admission else "workflow_finished"
+            self.state_manager.workflow_event(workflow_id, event, elapsed=time.perf_counter() - start,
+                                              error=str(e), retry_after=e.retry_after)
+            raise
+        except BaseException as e:
+            # Streams of this workflow end here too, not only on success
+            self.state_manager.workflow_event(workflow_id, "workflow_finished", elapsed=time.perf_counter() - start,
+                                              error=str(e) or type(e).__name__)
+            raise
+        finally:
+            metrics.add("workflows_in_progress", -1)
+            if reservation:
+                reservation.release()
+        elapsed = time.perf_counter() - start
+        for result in results:
+            # Filled in by the scheduler once a task got its slot; skipped tasks never wait
+            if result.queue_wait is not None:
+                metrics.record_queue_wait(result.agent_id, result.queue_wait)
+        self.state_manager.workflow_event(workflow_id, "workflow_finished", elapsed=elapsed, steps=[
+            {"step": r.task_id, "success": r.success, "error": r.error} for r in results
+        ])
         return OrchestrationResponse(
-            workflow_id=req.workflow_id or "default_workflow",
+            workflow_id=workflow_id,
             results=results,
-            elapsed=0.0  # Set accurate timing in real usage
+            elapsed=elapsed
         )
-    
+
+    async def _run_task(self, workflow_id: str, task: AgentTask, agent_id: str,
+                        dependencies: Dict[str, AgentResult]) -> AgentResult:
+        if dependencies:
+            params = dict(task.params or {})
+            params["dependencies"] = {dep: res.result for dep, res in dependencies.items()}
+            task = task.model_copy(update={"params": params})
+        step = task.task_id
+        self.state_manager.set_status(step, "started", workflow_id=workflow_id, agent_id=agent_id)
+        start = time.perf_counter()
+        with tracer.span("task", step=step, agent=agent_id) as span:
+            try:
+                if self.task_queue is not None:
+                    with tracer.span("queue.enqueue"):
+                        queued_id = await self.task_queue.enqueue(agent_id, task, workflow_id=workflow_id)
+                    with tracer.span("queue.wait_result", queued_id=queued_id):
+                        result = await self.task_queue.wait_result(queued_id)
+                else:
+                    result = await self._execute(agent_id, task)
+                self.state_manager.set_status(step, "finished" if result.success else "error", workflow_id=workflow_id,
+                                              agent_id=agent_id, elapsed=time.perf_counter() - start,
+                                              confidence=_confidence(result), error=result.error)
+            except Exception as e:
+                result = AgentResult(agent_id=agent_id, success=False, result=None, error=str(e))
+                self.state_manager.set_status(step, "error", workflow_id=workflow_id, agent_id=agent_id,
+                                              elapsed=time.perf_counter() - start, error=str(e))
+            span.set(success=result.success)
+        # In queue mode this is the round trip through the queue; the worker's own time is on the result
+        metrics.record_task(agent_id, time.perf_counter() - start, result.success)
+        return result
+
+    async def _execute(self, agent_type: str, task: AgentTask) -> AgentResult:
+        async with self.agent_manager.lease(agent_type) as agent:
+            metrics.add("agent_tasks_in_progress", 1, agent=agent_type)
+            try:
+                with tracer.span("agent.execute", agent=agent_type):
+                    return await self.agent_manager.execute(agent, task)
+            finally:
+                metrics.add("agent_tasks_in_progress", -1, agent=agent_type)
+
+    async def _run_step(self, agent_type: str, task: AgentTask) -> AgentResult:
+        """One step of run_full_workflow: execute, time and record it"""
+        start = time.perf_counter()
+        with tracer.span("task", step=agent_type, agent=agent_type) as span:
+            try:
+                result = await self._execute(agent_type, task)
+            except Exception:
+                metrics.record_task(agent_type, time.perf_counter() - start, False)
+                raise
+            span.set(success=result.success)
+        result.elapsed = time.perf_counter() - start
+        metrics.record_task(agent_type, result.elapsed, result.success)
+        return result
+
+    async def _run_checkpointed(self, workflow_id: Optional[str], agent_type: str, task: AgentTask) -> AgentResult:
+        """_run_step, or the stored result of this step when it already succeeded on the same inputs"""
+        if self.checkpoints is None or workflow_id is None:
+            return await self._run_step(agent_type, task)
+        key = input_hash(agent_type, task)
+        saved = None
+        with tracer.span("checkpoint.load", step=agent_type) as span:
+            try:
+                saved = await self.checkpoints.load(workflow_id, agent_type, key)
+            except Exception as e:
+                # A checkpoint store outage costs a re-run, not the workflow
+                logger.warning("Loading checkpoint %s/%s failed: %s", workflow_id, agent_type, e)
+            span.set(hit=saved is not None)
+        if saved is not None:
+            self.state_manager.workflow_event(workflow_id, "step_resumed", step=agent_type)
+            return saved
+        result = await self._run_step(agent_type, task)
+        if result.success:
+            with tracer.span("checkpoint.save", step=agent_type):
+                try:
+                    await self.checkpoints.save(workflow_id, agent_type, key, result)
+                except Exception as e:
+                    logger.warning("Saving checkpoint %s/%s failed: %s", workflow_id, agent_type, e)
+        return result
 
     async def run_full_workflow(self, req: OrchestrationRequest) -> OrchestrationResponse:
+        workflow_id = req.workflow_id or f"workflow_{uuid.uuid4().hex}"
+        with tracer.workflow(workflow_id, "workflow.run_full"):
+            return await self._run_full_workflow(req, workflow_id)
+
+    async def _run_chain(self, research_task: AgentTask, workflow_id: str, checkpoint_id: Optional[str]):
+        """research -> analysis -> decision, each step fed the results of the ones before it"""
         # 1. Run ResearchAgent
-        research_task = req.tasks[0]
-        research_result = await self.agent_manager.registry["research"].execute(research_task)
-        self.state_manager.set_status("research", "finished" if research_result.success else "error")
+        research_result = await self._run_checkpointed(checkpoint_id, "research", research_task)
+        self.state_manager.set_status("research", "finished" if research_result.success else "error",
+                                      workflow_id=workflow_id, confidence=_confidence(research_result))
 
         # 2. Run AnalysisAgent with research result as input
-        analysis_task = AgentTask(agent_id="analysis", query="", params=research_result.result)
-        analysis_result = await self.agent_manager.registry["analysis"].execute(analysis_task)
-        self.state_manager.set_status("analysis", "finished" if analysis_result.success else "error")
+        # Chained steps work on the previous results; the original query is carried along
+        analysis_task = AgentTask(agent_id="analysis", query=research_task.query, params=research_result.result)
+        analysis_result = await self._run_checkpointed(checkpoint_id, "analysis", analysis_task)
+        self.state_manager.set_status("analysis", "finished" if analysis_result.success else "error",
+                                      workflow_id=workflow_id, confidence=_confidence(analysis_result))
 
         # 3. Run DecisionAgent with both previous results
         decision_params = {
             "research": research_result.result,
             "analysis": analysis_result.result
         }
-        decision_task = AgentTask(agent_id="decision", query="", params=decision_params)
-        decision_result = await self.agent_manager.registry["decision"].execute(decision_task)
-        self.state_manager.set_status("decision", "finished" if decision_result.success else "error")
+        decision_task = AgentTask(agent_id="decision", query=research_task.query, params=decision_params)
+        decision_result = await self._run_checkpointed(checkpoint_id, "decision", decision_task)
+        self.state_manager.set_status("decision", "finished" if decision_result.success else "error",
+                                      workflow_id=workflow_id, confidence=_confidence(decision_result))
+        return research_result, analysis_result, decision_result
+
+    async def _run_full_workflow(self, req: OrchestrationRequest, workflow_id: str) -> OrchestrationResponse:
+        # Steps that already succeeded on the same inputs under this workflow_id are reused. Anonymous
+        # runs get a fresh id nobody can run again, so there is nothing to checkpoint for them
+        checkpoint_id = req.workflow_id
+        start = time.perf_counter()
+        self.state_manager.workflow_event(workflow_id, "workflow_started", steps=[
+            {"step": step, "agent_id": step} for step in ("research", "analysis", "decision")
+        ])
+        try:
+            research_result, analysis_result, decision_result = await self._run_chain(
+                req.tasks[0], workflow_id, checkpoint_id
+            )
+        except BaseException as e:
+            # As in _run_workflow: a step that raises still ends the workflow's streams and state
+            self.state_manager.workflow_event(workflow_id, "workflow_finished", elapsed=time.perf_counter() - start,
+                                              error=str(e) or type(e).__name__)
+            raise
 
         # 4. Human-in-loop logic (if needed)
         human_required = decision_result.result.get("human_review", False) if decision_result.result else False
         if human_required:
-            self.state_manager.set_status("human", "required")
+            self.state_manager.set_status("human", "required", workflow_id=workflow_id)
+        self.state_manager.workflow_event(workflow_id, "workflow_finished", human_review=human_required)
 
         return OrchestrationResponse(
-            workflow_id=req.workflow_id or "chained_workflow",
+            workflow_id=workflow_id,
             results=[research_result, analysis_result, decision_result],
-            elapsed=0.0  
+            elapsed=time.perf_counter() - start
         )
 
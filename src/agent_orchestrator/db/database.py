@@ -1,6 +1,6 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from beanie import init_beanie
-from typing import Optional
+from beanie import Document, init_beanie
+from typing import Optional, Type
 import os
 
 class Database:
@@ -11,6 +11,12 @@ database = Database()
 async def get_database_client() -> AsyncIOMotorClient:
     return database.client
 
+def get_collection(model: Type[Document]):
+    """Raw driver collection of a Beanie model, for pipeline updates and find-and-modify"""
+    # Beanie 1.x (motor) vs 2.x (pymongo async) naming
+    getter = getattr(model, "get_motor_collection", None) or model.get_pymongo_collection
+    return getter()
+
 async def connect_to_mongo():
     """Create database connection"""
     database.client = AsyncIOMotorClient(
@@ -19,6 +25,9 @@ async def connect_to_mongo():
     
 async def close_mongo_connection():
     """Close database connection"""
+    from src.agent_orchestrator.db.operations import db_ops
+    # Flush write-behind buffers while the client is still open
+    await db_ops.close()
     if database.client:
         database.client.close()
 
@@ -28,7 +37,9 @@ async def init_database():
         AgentTaskDocument, 
         AgentResultDocument, 
         WorkflowExecutionDocument,
-        AgentStatusDocument
+        AgentStatusDocument,
+        RateLimitDocument,
+        WorkflowCheckpointDocument
     )
     
     await init_beanie(
@@ -37,6 +48,8 @@ async def init_database():
             AgentTaskDocument,
             AgentResultDocument, 
             WorkflowExecutionDocument,
-            AgentStatusDocument
+            AgentStatusDocument,
+            RateLimitDocument,
+            WorkflowCheckpointDocument
         ]
     )
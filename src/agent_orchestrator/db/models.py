@@ -1,4 +1,6 @@
+import os
 from beanie import Document, Indexed
+from pymongo import IndexModel
 from pydantic import Field
 from typing import Dict, Any, Optional, List
 from datetime import datetime
@@ -15,6 +17,11 @@ class AgentTaskDocument(Document):
     query: str
     params: Optional[Dict[str, Any]] = None
     status: TaskStatus = TaskStatus.PENDING
+    workflow_id: Optional[str] = None
+    task_key: Optional[str] = None  # step id within the workflow
+    lease_owner: Optional[str] = None  # worker currently running the task
+    lease_expires_at: Optional[datetime] = None
+    attempts: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
@@ -22,6 +29,8 @@ class AgentTaskDocument(Document):
         name = "agent_tasks"
         indexes = [
             [("agent_id", 1), ("status", 1)],
+            [("status", 1), ("agent_id", 1), ("created_at", 1)],
+            [("status", 1), ("lease_expires_at", 1)],
             [("created_at", -1)]
         ]
 
@@ -33,13 +42,17 @@ class AgentResultDocument(Document):
     error: Optional[str] = None
     confidence_score: Optional[float] = None
     execution_time: Optional[float] = None
+    queue_wait: Optional[float] = None
+    upstream_latency: Optional[float] = None
+    retries: Optional[int] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     class Settings:
         name = "agent_results"
         indexes = [
             [("task_id", 1)],
-            [("agent_id", 1), ("created_at", -1)]
+            [("agent_id", 1), ("created_at", -1)],
+            [("created_at", -1), ("agent_id", 1)]  # time-window stats across all agents
         ]
 
 class WorkflowExecutionDocument(Document):
@@ -48,6 +61,10 @@ class WorkflowExecutionDocument(Document):
     agent_results: List[str] = []  # AgentResult IDs
     human_review_required: bool = False
     confidence_score: Optional[float] = None
+    error: Optional[str] = None
+    elapsed: Optional[float] = None
+    step_states: Dict[str, str] = {}  # {step: status}, spilled from StateManager on eviction
+    request: Optional[Dict[str, Any]] = None  # submitted OrchestrationRequest, re-queued by a retry
     started_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
     
@@ -55,7 +72,8 @@ class WorkflowExecutionDocument(Document):
         name = "workflow_executions"
         indexes = [
             [("workflow_id", 1)],
-            [("status", 1), ("started_at", -1)]
+            [("status", 1), ("started_at", -1)],
+            [("started_at", -1), ("status", 1)]  # time-window stats and recent history
         ]
 
 class AgentStatusDocument(Document):
@@ -70,3 +88,30 @@ class AgentStatusDocument(Document):
         indexes = [
             [("agent_id", 1)]
         ]
+
+class RateLimitDocument(Document):
+    """Shared token bucket for one (HF endpoint, api key fingerprint); see services/rate_limiter.py"""
+    key: Indexed(str, unique=True)
+    rate: float
+    tokens: float
+    updated: float  # epoch seconds
+    blocked_until: float = 0.0  # epoch seconds; set from Retry-After
+
+    class Settings:
+        name = "rate_limits"
+
+class WorkflowCheckpointDocument(Document):
+    """Output of a completed run_full_workflow step, reused when the workflow is re-run with the same inputs"""
+    workflow_id: str
+    step: str  # agent type: research / analysis / decision
+    input_hash: str  # core.checkpoints.input_hash of the step's task
+    result: Dict[str, Any]  # AgentResult.model_dump()
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "workflow_checkpoints"
+        indexes = [
+            IndexModel([("workflow_id", 1), ("step", 1), ("input_hash", 1)], unique=True),
+            IndexModel([("created_at", 1)],
+                       expireAfterSeconds=int(os.getenv("WORKFLOW_CHECKPOINT_TTL", str(7 * 86400))))
+        ]
@@ -1,6 +1,8 @@
-from typing import List, Optional
+import os
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from beanie import PydanticObjectId
+from beanie.operators import In
 from src.agent_orchestrator.db.models import (
     AgentTaskDocument, 
     AgentResultDocument, 
@@ -8,42 +10,126 @@ from src.agent_orchestrator.db.models import (
     AgentStatusDocument,
     TaskStatus
 )
+from src.agent_orchestrator.db.write_behind import WriteBehindBuffer
 from src.agent_orchestrator.api.models import AgentTask, AgentResult
+from src.agent_orchestrator.core.metrics import result_confidence
+from src.agent_orchestrator.core.tracing import traced
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _time_bucket(field: str, bucket_seconds: Optional[int]) -> Any:
+    """Start of the bucket_seconds-wide window (aligned to the epoch) holding $field; one bucket if None"""
+    if not bucket_seconds:
+        return None
+    # date - date gives milliseconds and date - number gives a date, so this needs no $toLong/$toDate
+    since_epoch = {"$subtract": [f"${field}", EPOCH]}
+    return {"$subtract": [f"${field}", {"$mod": [since_epoch, bucket_seconds * 1000]}]}
+
+
+def _rate(numerator: str, denominator: Any = "$runs") -> Dict[str, Any]:
+    return {"$cond": [{"$gt": [denominator, 0]}, {"$divide": [numerator, denominator]}, None]}
+
 
 class DatabaseOperations:
+    def __init__(self, write_behind: Optional[bool] = None):
+        """
+        write_behind: buffer task/result/load writes and flush them in batches
+        (defaults to DB_WRITE_BEHIND). Pass durable=True to a write to wait until it is persisted.
+        """
+        if write_behind is None:
+            write_behind = os.getenv("DB_WRITE_BEHIND", "false").lower() == "true"
+        self.buffer = WriteBehindBuffer() if write_behind else None
+
+    async def close(self):
+        """Flush buffered writes"""
+        if self.buffer:
+            await self.buffer.close()
     
-    async def create_task(self, task: AgentTask) -> AgentTaskDocument:
+    @traced("db.create_task")
+    async def create_task(self, task: AgentTask, durable: bool = False) -> AgentTaskDocument:
         """Create and store agent task"""
         task_doc = AgentTaskDocument(
             agent_id=task.agent_id,
             query=task.query,
             params=task.params
         )
+        if self.buffer:
+            task_doc.id = PydanticObjectId()  # assigned up front so callers can reference it before the flush
+            await self.buffer.insert(task_doc, wait=durable)
+            return task_doc
         return await task_doc.insert()
     
-    async def update_task_status(self, task_id: str, status: TaskStatus) -> bool:
+    @traced("db.update_task_status")
+    async def update_task_status(self, task_id: str, status: TaskStatus, durable: bool = False) -> bool:
         """Update task status"""
+        update = {"$set": {"status": status, "updated_at": datetime.utcnow()}}
+        if self.buffer:
+            await self.buffer.update(AgentTaskDocument, {"_id": PydanticObjectId(task_id)}, update, wait=durable)
+            return True
         result = await AgentTaskDocument.find_one(
             AgentTaskDocument.id == PydanticObjectId(task_id)
-        ).update({"$set": {"status": status, "updated_at": datetime.utcnow()}})
+        ).update(update)
         return result.modified_count > 0
     
-    async def store_agent_result(self, result: AgentResult, task_id: str) -> AgentResultDocument:
+    @traced("db.store_agent_result")
+    async def store_agent_result(self, result: AgentResult, task_id: str, durable: bool = False) -> AgentResultDocument:
         """Store agent execution result"""
         result_doc = AgentResultDocument(
             task_id=task_id,
             agent_id=result.agent_id,
             success=result.success,
             result=result.result,
-            error=result.error
+            error=result.error,
+            confidence_score=result_confidence(result),
+            execution_time=result.elapsed,
+            queue_wait=result.queue_wait,
+            upstream_latency=result.upstream_latency,
+            retries=result.retries
         )
+        if self.buffer:
+            result_doc.id = PydanticObjectId()
+            await self.buffer.insert(result_doc, wait=durable)
+            return result_doc
         return await result_doc.insert()
     
-    async def create_workflow_execution(self, workflow_id: str) -> WorkflowExecutionDocument:
+    @traced("db.label_agent_result")
+    async def label_agent_result(self, result_id: str, task_id: str, queue_wait: Optional[float] = None) -> bool:
+        """
+        Give a result stored by the task queue its workflow step id, and the full queue wait the
+        engine measured (agent slot plus worker), instead of storing the result a second time
+        """
+        update: Dict[str, Any] = {"task_id": task_id}
+        if queue_wait is not None:
+            update["queue_wait"] = queue_wait
+        result = await AgentResultDocument.find_one(
+            AgentResultDocument.id == PydanticObjectId(result_id)
+        ).update({"$set": update})
+        return result.modified_count > 0
+
+    @traced("db.create_workflow_execution")
+    async def create_workflow_execution(self, workflow_id: str,
+                                        request: Optional[Dict[str, Any]] = None) -> WorkflowExecutionDocument:
         """Create workflow execution record"""
-        workflow_doc = WorkflowExecutionDocument(workflow_id=workflow_id)
+        workflow_doc = WorkflowExecutionDocument(workflow_id=workflow_id, request=request)
         return await workflow_doc.insert()
+
+    @traced("db.restart_workflow_execution")
+    async def restart_workflow_execution(self, workflow_id: str) -> bool:
+        """Put a failed workflow execution back to pending; False if it is not (or no longer) failed"""
+        result = await WorkflowExecutionDocument.find_one(
+            WorkflowExecutionDocument.workflow_id == workflow_id,
+            WorkflowExecutionDocument.status == TaskStatus.FAILED,
+        ).update({"$set": {
+            "status": TaskStatus.PENDING,
+            "agent_results": [],
+            "error": None,
+            "elapsed": None,
+            "completed_at": None,
+        }})
+        return result.modified_count > 0
     
+    @traced("db.update_workflow_status")
     async def update_workflow_status(self, workflow_id: str, status: TaskStatus, 
                                    confidence_score: Optional[float] = None) -> bool:
         """Update workflow execution status"""
@@ -58,27 +144,167 @@ class DatabaseOperations:
         ).update({"$set": update_data})
         return result.modified_count > 0
     
+    @traced("db.complete_workflow_execution")
+    async def complete_workflow_execution(self, workflow_id: str, status: TaskStatus,
+                                          result_ids: Optional[List[str]] = None, elapsed: Optional[float] = None,
+                                          human_review_required: bool = False,
+                                          confidence_score: Optional[float] = None,
+                                          error: Optional[str] = None) -> bool:
+        """Record the outcome of a finished workflow execution"""
+        update_data = {
+            "status": status,
+            "completed_at": datetime.utcnow(),
+            "agent_results": result_ids or [],
+            "elapsed": elapsed,
+            "human_review_required": human_review_required,
+            "confidence_score": confidence_score,
+            "error": error,
+        }
+        result = await WorkflowExecutionDocument.find_one(
+            WorkflowExecutionDocument.workflow_id == workflow_id
+        ).update({"$set": update_data})
+        return result.modified_count > 0
+    
+    @traced("db.store_workflow_state")
+    async def store_workflow_state(self, workflow_id: str, step_states: Dict[str, str]) -> None:
+        """Persist per-step workflow state evicted from memory"""
+        await WorkflowExecutionDocument.find_one(
+            WorkflowExecutionDocument.workflow_id == workflow_id
+        ).upsert(
+            {"$set": {"step_states": step_states}},
+            on_insert=WorkflowExecutionDocument(workflow_id=workflow_id, step_states=step_states)
+        )
+    
+    @traced("db.get_workflow_execution")
+    async def get_workflow_execution(self, workflow_id: str) -> Optional[WorkflowExecutionDocument]:
+        """Get a workflow execution by workflow id"""
+        return await WorkflowExecutionDocument.find_one(WorkflowExecutionDocument.workflow_id == workflow_id)
+    
+    @traced("db.get_agent_results")
+    async def get_agent_results(self, result_ids: List[str]) -> List[AgentResultDocument]:
+        """Get agent results by id, in the given order"""
+        docs = await AgentResultDocument.find(
+            In(AgentResultDocument.id, [PydanticObjectId(rid) for rid in result_ids])
+        ).to_list()
+        by_id = {str(doc.id): doc for doc in docs}
+        return [by_id[rid] for rid in result_ids if rid in by_id]
+    
+    @traced("db.get_workflow_history")
     async def get_workflow_history(self, limit: int = 50) -> List[WorkflowExecutionDocument]:
         """Get recent workflow executions"""
         return await WorkflowExecutionDocument.find().sort(-WorkflowExecutionDocument.started_at).limit(limit).to_list()
     
+    @traced("db.aggregate_agent_stats")
+    async def aggregate_agent_stats(self, since: datetime, until: Optional[datetime] = None,
+                                    bucket_seconds: Optional[int] = None,
+                                    agent_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Success rate, latencies, retries and throughput (tasks/s) of agent results per agent and
+        time bucket, computed in Mongo. Rows are ordered by bucket, then agent.
+        """
+        until = until or datetime.utcnow()
+        match: Dict[str, Any] = {"created_at": {"$gte": since, "$lt": until}}
+        if agent_id:
+            match["agent_id"] = agent_id
+        window = bucket_seconds or max((until - since).total_seconds(), 1.0)
+        pipeline = [
+            {"$match": match},
+            {"$group": {
+                "_id": {"agent_id": "$agent_id", "bucket": _time_bucket("created_at", bucket_seconds)},
+                "runs": {"$sum": 1},
+                "successes": {"$sum": {"$cond": ["$success", 1, 0]}},
+                "avg_latency": {"$avg": "$execution_time"},
+                "max_latency": {"$max": "$execution_time"},
+                "avg_queue_wait": {"$avg": "$queue_wait"},
+                "avg_upstream_latency": {"$avg": "$upstream_latency"},
+                "retries": {"$sum": {"$ifNull": ["$retries", 0]}},
+                "avg_confidence": {"$avg": "$confidence_score"},
+            }},
+            {"$project": {
+                "_id": 0,
+                "agent_id": "$_id.agent_id",
+                "bucket": "$_id.bucket",
+                "tasks": "$runs",
+                "successes": 1,
+                "success_rate": _rate("$successes"),
+                "avg_latency": 1,
+                "max_latency": 1,
+                "avg_queue_wait": 1,
+                "avg_upstream_latency": 1,
+                "retries": 1,
+                "avg_confidence": 1,
+                "throughput": {"$divide": ["$runs", window]},
+            }},
+            {"$sort": {"bucket": 1, "agent_id": 1}},
+        ]
+        return await AgentResultDocument.aggregate(pipeline).to_list()
+
+    @traced("db.aggregate_workflow_stats")
+    async def aggregate_workflow_stats(self, since: datetime, until: Optional[datetime] = None,
+                                       bucket_seconds: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Workflow count, success and human-review rates, latency and throughput per time bucket"""
+        until = until or datetime.utcnow()
+        window = bucket_seconds or max((until - since).total_seconds(), 1.0)
+        pipeline = [
+            {"$match": {"started_at": {"$gte": since, "$lt": until}}},
+            {"$group": {
+                "_id": _time_bucket("started_at", bucket_seconds),
+                "runs": {"$sum": 1},
+                "completed": {"$sum": {"$cond": [{"$eq": ["$status", TaskStatus.COMPLETED.value]}, 1, 0]}},
+                "failed": {"$sum": {"$cond": [{"$eq": ["$status", TaskStatus.FAILED.value]}, 1, 0]}},
+                "human_reviews": {"$sum": {"$cond": ["$human_review_required", 1, 0]}},
+                "avg_latency": {"$avg": "$elapsed"},
+                "max_latency": {"$max": "$elapsed"},
+                "avg_confidence": {"$avg": "$confidence_score"},
+            }},
+            {"$project": {
+                "_id": 0,
+                "bucket": "$_id",
+                "workflows": "$runs",
+                "completed": 1,
+                "failed": 1,
+                # Of finished workflows; pending/running ones have no outcome yet
+                "success_rate": _rate("$completed", {"$add": ["$completed", "$failed"]}),
+                "human_review_rate": _rate("$human_reviews"),
+                "avg_latency": 1,
+                "max_latency": 1,
+                "avg_confidence": 1,
+                "throughput": {"$divide": ["$runs", window]},
+            }},
+            {"$sort": {"bucket": 1}},
+        ]
+        return await WorkflowExecutionDocument.aggregate(pipeline).to_list()
+
+    @traced("db.get_agent_load")
     async def get_agent_load(self, agent_id: str) -> int:
         """Get current agent load"""
         status = await AgentStatusDocument.find_one(AgentStatusDocument.agent_id == agent_id)
         return status.current_load if status else 0
     
-    async def increment_agent_load(self, agent_id: str) -> bool:
+    @traced("db.get_agent_limits")
+    async def get_agent_limits(self) -> Dict[str, int]:
+        """Get max_load for every agent with a status document"""
+        statuses = await AgentStatusDocument.find_all().to_list()
+        return {status.agent_id: status.max_load for status in statuses}
+    
+    @traced("db.increment_agent_load")
+    async def increment_agent_load(self, agent_id: str, durable: bool = False) -> bool:
         """Increment agent load"""
-        result = await AgentStatusDocument.find_one(
-            AgentStatusDocument.agent_id == agent_id
-        ).update({"$inc": {"current_load": 1}, "$set": {"last_updated": datetime.utcnow()}})
-        return result.modified_count > 0
+        return await self._update_agent_load(agent_id, 1, durable)
     
-    async def decrement_agent_load(self, agent_id: str) -> bool:
+    @traced("db.decrement_agent_load")
+    async def decrement_agent_load(self, agent_id: str, durable: bool = False) -> bool:
         """Decrement agent load"""
+        return await self._update_agent_load(agent_id, -1, durable)
+
+    async def _update_agent_load(self, agent_id: str, delta: int, durable: bool) -> bool:
+        update = {"$inc": {"current_load": delta}, "$set": {"last_updated": datetime.utcnow()}}
+        if self.buffer:
+            await self.buffer.update(AgentStatusDocument, {"agent_id": agent_id}, update, wait=durable)
+            return True
         result = await AgentStatusDocument.find_one(
             AgentStatusDocument.agent_id == agent_id
-        ).update({"$inc": {"current_load": -1}, "$set": {"last_updated": datetime.utcnow()}})
+        ).update(update)
         return result.modified_count > 0
 
 # Global database operations instance
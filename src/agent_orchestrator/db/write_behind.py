@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple, Type
+from beanie import Document
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from src.agent_orchestrator.db.database import get_collection
+
+logger = logging.getLogger(__name__)
+
+# (kind, document model, payload, future, failed attempts) where payload is a Document for inserts
+# and an UpdateOne for updates
+PendingOp = Tuple[str, Type[Document], Any, Optional[asyncio.Future], int]
+
+
+class WriteBehindBuffer:
+    """
+    Queues inserts and updates in memory and writes them in batches
+    (insert_many / bulk_write) when max_batch ops are pending or every flush_interval seconds.
+    Updates to a collection are applied in the order they were enqueued.
+    Non-durable ops from a failed flush are requeued for up to max_retries more flushes, then dropped
+    (and counted); durable callers get the error instead.
+    """
+
+    def __init__(self, max_batch: Optional[int] = None, flush_interval: Optional[float] = None,
+                 max_retries: Optional[int] = None):
+        self.max_batch = max_batch or int(os.getenv("DB_WRITE_BEHIND_BATCH", "500"))
+        self.flush_interval = (flush_interval if flush_interval is not None
+                               else float(os.getenv("DB_WRITE_BEHIND_INTERVAL_MS", "100")) / 1000)
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("DB_WRITE_BEHIND_RETRIES", "3"))
+        self._pending: List[PendingOp] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._closing = False
+        self.flushes = 0
+        self.ops_written = 0
+        self.errors = 0
+        self.retried = 0
+        self.dropped = 0
+
+    def _ensure_started(self):
+        if self._runner is None or self._runner.done():
+            self._closing = False
+            self._wake = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._runner = asyncio.ensure_future(self._run())
+
+    async def insert(self, doc: Document, wait: bool = False):
+        await self._enqueue("insert", type(doc), doc, wait)
+
+    async def update(self, model: Type[Document], filter: Dict[str, Any], update: Dict[str, Any], wait: bool = False):
+        await self._enqueue("update", model, UpdateOne(filter, update), wait)
+
+    async def _enqueue(self, kind: str, model: Type[Document], payload: Any, wait: bool):
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future() if wait else None
+        self._pending.append((kind, model, payload, future, 0))
+        if len(self._pending) >= self.max_batch:
+            self._wake.set()
+        if future is not None:
+            # Durable callers do not wait for the interval
+            self._wake.set()
+            await future
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        if self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            batch, self._pending = self._pending, []
+            # Per collection: one insert_many, then one ordered bulk_write of the updates.
+            # Running inserts first only lets updates see documents enqueued before them.
+            groups: Dict[Tuple[str, Type[Document]], List[PendingOp]] = {}
+            for op in batch:
+                groups.setdefault((op[0], op[1]), []).append(op)
+            retry: List[PendingOp] = []
+            for (kind, model), ops in sorted(groups.items(), key=lambda item: item[0][0] != "insert"):
+                retry.extend(await self._write(kind, model, ops))
+            if retry:
+                # Ahead of anything enqueued during this flush, so per-collection order still holds
+                self._pending[:0] = retry
+            if batch:
+                self.flushes += 1
+
+    async def _write(self, kind: str, model: Type[Document], ops: List[PendingOp]) -> List[PendingOp]:
+        """Write one group; returns the non-durable ops to try again on the next flush"""
+        try:
+            payloads = [payload for _, _, payload, _, _ in ops]
+            if kind == "insert":
+                await model.insert_many(payloads)
+            else:
+                await get_collection(model).bulk_write(payloads, ordered=True)
+            self._succeeded(ops)
+            return []
+        except Exception as e:
+            self.errors += 1
+            logger.exception("Write-behind flush of %d %s ops on %s failed", len(ops), kind, model.__name__)
+            failed = ops
+            if isinstance(e, BulkWriteError) and e.details.get("writeErrors"):
+                # Ordered writes stop at the first error: ops before it are stored, the op itself
+                # was rejected by the server (e.g. a duplicate key) and would only fail again
+                index = e.details["writeErrors"][0]["index"]
+                self._succeeded(ops[:index])
+                self._give_up(ops[index:index + 1], e)
+                failed = ops[index + 1:]
+            retry = []
+            for op in failed:
+                if op[3] is None and op[4] < self.max_retries:
+                    retry.append(op[:4] + (op[4] + 1,))
+                else:
+                    self._give_up([op], e)
+            self.retried += len(retry)
+            return retry
+
+    def _succeeded(self, ops: List[PendingOp]):
+        self.ops_written += len(ops)
+        for _, _, _, future, _ in ops:
+            if future is not None and not future.done():
+                future.set_result(True)
+
+    def _give_up(self, ops: List[PendingOp], error: Exception):
+        for _, _, _, future, _ in ops:
+            if future is None:
+                self.dropped += 1
+            elif not future.done():
+                future.set_exception(error)
+
+    async def close(self):
+        """Flush everything still buffered and stop the background flusher."""
+        if self._runner is not None:
+            # Let an in-progress flush finish instead of cancelling it mid-write
+            self._closing = True
+            self._wake.set()
+            await self._runner
+            self._runner = None
+        await self.flush()
+        # Requeued ops have a bounded number of retries, so this ends
+        while self._pending and self._flush_lock is not None:
+            await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "ops_written": self.ops_written,
+            "errors": self.errors,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "max_batch": self.max_batch,
+            "flush_interval": self.flush_interval,
+        }
@@ -0,0 +1,135 @@
+import asyncio
+import os
+import re
+import tempfile
+import time
+import uuid
+from typing import AsyncIterator, Dict, Optional
+
+FORMATS = {
+    "arrow": (".arrow", ".feather", ".ipc"),
+    "parquet": (".parquet", ".pq"),
+    "csv": (".csv",),
+    "ndjson": (".ndjson", ".jsonl"),
+}
+_DATASET_ID = re.compile(r"[0-9a-f]{32}")
+_WRITE_SIZE = 1024 * 1024  # request chunks are collected up to this before a write on a thread
+
+
+class DatasetTooLarge(Exception):
+    pass
+
+
+def detect_format(filename: Optional[str], head: bytes) -> Optional[str]:
+    """Format from magic bytes, else from the file extension"""
+    if head.startswith(b"PAR1"):
+        return "parquet"
+    if head.startswith(b"ARROW1") or head.startswith(b"\xff\xff\xff\xff"):
+        return "arrow"  # IPC file, or IPC stream starting with a continuation marker
+    name = (filename or "").lower()
+    for fmt, extensions in FORMATS.items():
+        if name.endswith(extensions):
+            return fmt
+    return None
+
+
+class DatasetSpool:
+    """
+    Local directory of uploaded datasets. Uploads are streamed to disk as-is (no decoding);
+    agents reference them by dataset_id and memory-map Arrow/Parquet files from here.
+    Datasets (and abandoned partial uploads) older than ttl seconds are deleted by a sweep that
+    runs with uploads at most every sweep_interval seconds. With worker nodes the directory must be shared storage.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None, sweep_interval: float = 300.0):
+        self.directory = directory or os.getenv(
+            "DATASET_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "agent_orchestrator_datasets")
+        )
+        self.max_bytes = max_bytes or int(os.getenv("DATASET_MAX_BYTES", str(10 * 1024 ** 3)))
+        self.ttl = ttl or float(os.getenv("DATASET_TTL", str(24 * 3600)))
+        self.sweep_interval = sweep_interval
+        self._last_sweep = 0.0
+        self.expired = 0
+
+    async def save(self, chunks: AsyncIterator[bytes], filename: Optional[str] = None,
+                   fmt: Optional[str] = None) -> Dict[str, object]:
+        if time.monotonic() - self._last_sweep > self.sweep_interval:
+            self._last_sweep = time.monotonic()
+            await asyncio.to_thread(self.sweep)
+        os.makedirs(self.directory, exist_ok=True)
+        dataset_id = uuid.uuid4().hex
+        partial = os.path.join(self.directory, f"{dataset_id}.part")
+        size = 0
+        head = b""
+        # Disk writes go to a thread: a multi-GB upload must not block the event loop
+        f = await asyncio.to_thread(open, partial, "wb")
+        try:
+            try:
+                buffered, buffered_bytes = [], 0
+                async for chunk in chunks:
+                    if len(head) < 8:
+                        head += chunk[:8]
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise DatasetTooLarge(f"Dataset exceeds {self.max_bytes} bytes")
+                    buffered.append(chunk)
+                    buffered_bytes += len(chunk)
+                    if buffered_bytes >= _WRITE_SIZE:
+                        await asyncio.to_thread(f.writelines, buffered)
+                        buffered, buffered_bytes = [], 0
+                if buffered:
+                    await asyncio.to_thread(f.writelines, buffered)
+            finally:
+                await asyncio.to_thread(f.close)
+            fmt = fmt or detect_format(filename, head)
+            if fmt not in FORMATS:
+                raise ValueError("Unknown dataset format; expected Arrow IPC, Parquet, CSV or NDJSON")
+            os.replace(partial, self._path(dataset_id, fmt))
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        return {"dataset_id": dataset_id, "format": fmt, "bytes": size}
+
+    def sweep(self) -> int:
+        """Delete datasets and partial uploads last modified more than ttl seconds ago; returns how many"""
+        cutoff = time.time() - self.ttl
+        removed = 0
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            stem, _, ext = entry.name.partition(".")
+            if not _DATASET_ID.fullmatch(stem) or (ext not in FORMATS and ext != "part"):
+                continue  # not ours
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass  # deleted concurrently
+        self.expired += removed
+        return removed
+
+    def _path(self, dataset_id: str, fmt: str) -> str:
+        return os.path.join(self.directory, f"{dataset_id}.{fmt}")
+
+    def locate(self, dataset_id: str) -> Optional[Dict[str, str]]:
+        """{"path", "format"} of a stored dataset, or None"""
+        if not _DATASET_ID.fullmatch(dataset_id or ""):
+            return None
+        for fmt in FORMATS:
+            path = self._path(dataset_id, fmt)
+            if os.path.exists(path):
+                return {"path": path, "format": fmt}
+        return None
+
+    def delete(self, dataset_id: str) -> bool:
+        found = self.locate(dataset_id)
+        if found:
+            os.remove(found["path"])
+        return found is not None
+
+
+dataset_spool = DatasetSpool()
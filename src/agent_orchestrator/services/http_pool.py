@@ -0,0 +1,102 @@
+import os
+import httpx
+from typing import Any, Dict, Optional
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    """Counts requests in flight around the real transport, so failed and cancelled requests are counted down too"""
+
+    def __init__(self, pool: "HttpClientPool", inner: httpx.AsyncHTTPTransport):
+        self.pool = pool
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        pool = self.pool
+        pool.requests_total += 1
+        pool.in_flight += 1
+        pool.peak_in_flight = max(pool.peak_in_flight, pool.in_flight)
+        try:
+            return await self.inner.handle_async_request(request)
+        finally:
+            pool.in_flight -= 1
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class HttpClientPool:
+    """
+    One keep-alive httpx.AsyncClient shared by every outbound caller.
+    Opened/closed by the FastAPI lifecycle hooks; lazily opened when used outside of it.
+    """
+
+    def __init__(self, max_connections: Optional[int] = None, max_keepalive: Optional[int] = None,
+                 keepalive_expiry: Optional[float] = None, http2: Optional[bool] = None,
+                 timeout: Optional[float] = None):
+        self.max_connections = max_connections or int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "100"))
+        self.max_keepalive = max_keepalive or int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "20"))
+        self.keepalive_expiry = keepalive_expiry or float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", "30"))
+        self.http2 = http2 if http2 is not None else os.getenv("HTTP_POOL_HTTP2", "false").lower() == "true"
+        self.timeout = timeout or float(os.getenv("HTTP_POOL_TIMEOUT", "20"))
+        self._client: Optional[httpx.AsyncClient] = None
+        self._http2_active: Optional[bool] = None  # what the open client actually negotiates
+        self.requests_total = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def open(self):
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    def _build_client(self) -> httpx.AsyncClient:
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401  (httpx needs the h2 package for HTTP/2)
+            except ImportError:
+                http2 = False
+        self._http2_active = http2
+        transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+        return httpx.AsyncClient(timeout=self.timeout, transport=_CountingTransport(self, transport))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "open": self._client is not None and not self._client.is_closed,
+            "http2": self._http2_active if self._http2_active is not None else self.http2,
+            "http2_requested": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive": self.max_keepalive,
+            "requests_total": self.requests_total,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+        }
+        # httpx does not expose pool internals publicly; read them from httpcore when available
+        transport = getattr(getattr(self._client, "_transport", None), "inner", None)
+        pool = getattr(transport, "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            stats["connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+        return stats
+
+
+# Global pool shared by HuggingFaceService and the agents
+http_pool = HttpClientPool()
@@ -1,18 +1,54 @@
-import httpx
 import os
+import time
+from typing import Any, Dict, Optional
+from src.agent_orchestrator.services.http_pool import HttpClientPool, http_pool as default_http_pool
+from src.agent_orchestrator.services.inference_cache import InferenceCache, inference_cache as default_cache
+from src.agent_orchestrator.services.inference_batcher import InferenceBatcher, inference_batcher as default_batcher
+from src.agent_orchestrator.services.rate_limiter import RateLimiter, rate_limiter as default_rate_limiter
+from src.agent_orchestrator.core.metrics import metrics
+from src.agent_orchestrator.core.tracing import tracer
 
 class HuggingFaceService:
-    def __init__(self):
+    def __init__(self, http_pool: HttpClientPool = None, cache: InferenceCache = None,
+                 batcher: InferenceBatcher = None, rate_limiter: RateLimiter = None):
         self.api_key = os.getenv("HUGGINGFACE_API_KEY")
         self.base_url = os.getenv("HUGGINGFACE_API_URL", "https://api-inference.huggingface.co/models/")
+        self.http_pool = http_pool or default_http_pool
+        self.cache = cache or default_cache
+        self.batcher = batcher or default_batcher
+        self.rate_limiter = rate_limiter or default_rate_limiter
 
-    async def query_model(self, model: str, inputs: str):
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}{model}",
-                headers=headers,
-                json={"inputs": inputs}
-            )
-            response.raise_for_status()
-            return response.json()
+    async def query_model(self, model: str, inputs: str, params: Optional[Dict[str, Any]] = None,
+                          use_cache: bool = True):
+        key = self.cache.make_key(f"{self.base_url}{model}", inputs, params)
+        return await self.cache.get_or_fetch(key, lambda: self._post(model, inputs, params), bypass=not use_cache)
+
+    async def _post(self, model: str, inputs: str, params: Optional[Dict[str, Any]] = None):
+        url = f"{self.base_url}{model}"
+        batched = self.batcher.enabled and isinstance(inputs, str)
+        if not batched:
+            await self.rate_limiter.acquire(url, self.api_key)
+        start = time.perf_counter()
+        status: Any = "error"
+        with tracer.span("hf.request", model=model, batched=batched) as span:
+            try:
+                if batched:
+                    output = await self.batcher.submit(url, self.api_key, inputs, params)
+                    status = 200
+                    return output
+                headers = {"Authorization": f"Bearer {self.api_key}"}
+                payload = {"inputs": inputs}
+                if params:
+                    payload["parameters"] = params
+                response = await self.http_pool.client.post(
+                    url,
+                    headers=headers,
+                    json=payload
+                )
+                status = response.status_code
+                await self.rate_limiter.observe(url, self.api_key, response)
+                response.raise_for_status()
+                return response.json()
+            finally:
+                metrics.record_upstream(model, time.perf_counter() - start, status)
+                span.set(status=status)
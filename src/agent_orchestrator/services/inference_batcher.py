@@ -0,0 +1,106 @@
+import asyncio
+import json
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple
+from src.agent_orchestrator.services.http_pool import HttpClientPool, http_pool as default_http_pool
+from src.agent_orchestrator.services.rate_limiter import RateLimiter, rate_limiter as default_rate_limiter
+
+BatchKey = Tuple[str, Optional[str], str]
+BatchItem = Tuple[str, asyncio.Future, Optional[float]]  # (inputs, caller's future, caller's timeout)
+
+
+class InferenceBatcher:
+    """
+    Collects concurrent single-input calls to the same endpoint for up to max_wait
+    seconds (or until max_batch_size is reached) and sends them as one request
+    with a list of inputs. Caller i receives element i of the response list.
+    A batch is sent with the longest timeout any of its callers asked for.
+    """
+
+    def __init__(self, http_pool: HttpClientPool = None, enabled: Optional[bool] = None,
+                 max_batch_size: Optional[int] = None, max_wait: Optional[float] = None,
+                 rate_limiter: RateLimiter = None):
+        self.http_pool = http_pool or default_http_pool
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.enabled = enabled if enabled is not None else os.getenv("HF_BATCHING_ENABLED", "false").lower() == "true"
+        self.max_batch_size = max_batch_size or int(os.getenv("HF_BATCH_MAX_SIZE", "16"))
+        self.max_wait = max_wait if max_wait is not None else float(os.getenv("HF_BATCH_MAX_WAIT_MS", "10")) / 1000
+        self._pending: Dict[BatchKey, List[BatchItem]] = {}
+        self._timers: Dict[BatchKey, asyncio.TimerHandle] = {}
+        # The event loop only keeps weak references to tasks; in-flight sends are held here until done
+        self._sending: Set[asyncio.Task] = set()
+        self.batches_sent = 0
+        self.inputs_sent = 0
+
+    async def submit(self, url: str, api_key: Optional[str], inputs: str,
+                     params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+        key = (url, api_key, json.dumps(params or {}, sort_keys=True))
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((inputs, future, timeout))
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+        return await future
+
+    def _flush(self, key: BatchKey):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if batch:
+            task = asyncio.ensure_future(self._send(key, batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, key: BatchKey, batch: List[BatchItem]):
+        url, api_key, params = key
+        # A batch of one is sent exactly like an unbatched call so its response shape is unchanged
+        payload: Dict[str, Any] = {"inputs": batch[0][0] if len(batch) == 1 else [inputs for inputs, _, _ in batch]}
+        if params != "{}":
+            payload["parameters"] = json.loads(params)
+        timeouts = [timeout for _, _, timeout in batch if timeout is not None]
+        self.batches_sent += 1
+        self.inputs_sent += len(batch)
+        try:
+            # One token per batch: the quota counts requests, not inputs
+            await self.rate_limiter.acquire(url, api_key)
+            response = await self.http_pool.client.post(
+                url, headers={"Authorization": f"Bearer {api_key}"}, json=payload,
+                # Callers that gave no timeout get the pool's default
+                timeout=max(timeouts) if timeouts else self.http_pool.timeout,
+            )
+            await self.rate_limiter.observe(url, api_key, response)
+            response.raise_for_status()
+            data = response.json()
+            if len(batch) == 1:
+                outputs = [data]
+            elif isinstance(data, list) and len(data) == len(batch):
+                outputs = data
+            else:
+                raise ValueError(f"Batched response has unexpected shape for {len(batch)} inputs")
+            for (_, future, _), output in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(output)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "max_batch_size": self.max_batch_size,
+            "max_wait": self.max_wait,
+            "batches_sent": self.batches_sent,
+            "inputs_sent": self.inputs_sent,
+            "avg_batch_size": self.inputs_sent / self.batches_sent if self.batches_sent else 0.0,
+            "pending": sum(len(b) for b in self._pending.values()),
+            "sending": len(self._sending),
+        }
+
+
+# Global batcher shared by HuggingFaceService and ResearchAgent (off unless HF_BATCHING_ENABLED=true)
+inference_batcher = InferenceBatcher()
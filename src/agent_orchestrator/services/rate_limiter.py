@@ -0,0 +1,301 @@
+import asyncio
+import hashlib
+import os
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+import httpx
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from src.agent_orchestrator.core.tracing import tracer
+from src.agent_orchestrator.db.models import RateLimitDocument
+from src.agent_orchestrator.db.database import get_collection
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a caller would have to queue longer than max_wait for a token."""
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Retry-After in either delta-seconds or HTTP-date form, as seconds from now"""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _header_float(headers: Mapping[str, str], *names: str) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+def parse_rate_limit(headers: Mapping[str, str]) -> Dict[str, Optional[float]]:
+    """
+    Remaining quota and seconds until it resets, from X-RateLimit-* or the IETF RateLimit-* headers.
+    A reset that looks like an epoch timestamp is converted to seconds from now.
+    """
+    remaining = _header_float(headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+    reset = _header_float(headers, "X-RateLimit-Reset", "RateLimit-Reset")
+    if reset is not None and reset > 1e9:
+        reset = max(0.0, reset - time.time())
+    return {"remaining": remaining, "reset": reset}
+
+
+class TokenBucket:
+    """
+    Token bucket for one (endpoint, api key). The rate adapts AIMD-style: a 429 multiplies it by
+    decrease (once per throttled period) and blocks the bucket for Retry-After; every granted token
+    adds increase/rate back, so it climbs towards max_rate again at roughly increase tokens/s per second.
+    """
+    __slots__ = ("key", "rate", "capacity", "tokens", "updated", "blocked_until", "lock",
+                 "waiting", "acquired", "queued", "waited", "throttled")
+
+    def __init__(self, key: str, rate: float, capacity: float):
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.time()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()  # FIFO, so queued callers are served in arrival order
+        self.waiting = 0
+        self.acquired = 0
+        self.queued = 0  # acquisitions that had to wait
+        self.waited = 0.0
+        self.throttled = 0
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: float, max_rate: float, increase: float) -> float:
+        """Take a token and return 0, or return how long to wait before trying again"""
+        self.refill(now)
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        self.tokens -= 1
+        self.rate = min(max_rate, self.rate + increase / self.rate)
+        return 0.0
+
+    def throttle(self, now: float, until: float, min_rate: float, decrease: float):
+        if self.blocked_until <= now:
+            # In-flight requests rejected in the same throttled period only count once
+            self.rate = max(min_rate, self.rate * decrease)
+        self.blocked_until = max(self.blocked_until, until)
+        self.tokens = 0.0
+        self.updated = now
+
+    def cap(self, remaining: float):
+        self.tokens = min(self.tokens, remaining)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": round(self.rate, 3),
+            "tokens": round(self.tokens, 3),
+            "blocked_for": round(max(0.0, self.blocked_until - time.time()), 3),
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "queued": self.queued,
+            "waited_seconds": round(self.waited, 3),
+            "throttled": self.throttled,
+        }
+
+
+class RateLimiter:
+    """
+    Process-wide token buckets per (endpoint URL, api key) shared by every Hugging Face caller.
+    Callers queue for a token instead of being sent into a 429; the rate is learned from
+    Retry-After and rate-limit headers. HF_RATE_LIMIT_RPS is the known quota and the ceiling.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, rate: Optional[float] = None, burst: Optional[float] = None,
+                 max_rate: Optional[float] = None, min_rate: Optional[float] = None, max_wait: Optional[float] = None,
+                 decrease: float = 0.5, increase: float = 1.0):
+        self.enabled = enabled if enabled is not None else os.getenv("HF_RATE_LIMIT_ENABLED", "false").lower() == "true"
+        self.rate = rate or float(os.getenv("HF_RATE_LIMIT_RPS", "10"))
+        self.burst = burst or float(os.getenv("HF_RATE_LIMIT_BURST", str(self.rate)))
+        self.max_rate = max_rate or float(os.getenv("HF_RATE_LIMIT_MAX_RPS", str(self.rate)))
+        self.min_rate = min_rate or float(os.getenv("HF_RATE_LIMIT_MIN_RPS", "0.1"))
+        self.max_wait = max_wait or float(os.getenv("HF_RATE_LIMIT_MAX_WAIT", "60"))
+        self.decrease = decrease
+        self.increase = increase
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.timeouts = 0
+
+    @staticmethod
+    def make_key(url: str, api_key: Optional[str]) -> str:
+        # The key itself never ends up in stats or in Mongo
+        fingerprint = hashlib.sha256((api_key or "").encode()).hexdigest()[:12]
+        return f"{url}#{fingerprint}"
+
+    def bucket(self, url: str, api_key: Optional[str]) -> TokenBucket:
+        key = self.make_key(url, api_key)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(key, self.rate, self.burst)
+        return bucket
+
+    async def acquire(self, url: str, api_key: Optional[str]) -> float:
+        """Wait for a token; returns the seconds spent queueing"""
+        if not self.enabled:
+            return 0.0
+        bucket = self.bucket(url, api_key)
+        start, started_at = time.perf_counter(), time.time()
+        bucket.waiting += 1
+        try:
+            await asyncio.wait_for(self._acquire(bucket), self.max_wait)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise RateLimitTimeout(f"No rate limit token for {url} within {self.max_wait:.0f}s") from None
+        finally:
+            bucket.waiting -= 1
+        waited = time.perf_counter() - start
+        bucket.acquired += 1
+        if waited > 0.001:
+            bucket.queued += 1
+            bucket.waited += waited
+            tracer.record("rate_limit.wait", started_at, time.time(), endpoint=url)
+        return waited
+
+    async def _acquire(self, bucket: TokenBucket):
+        async with bucket.lock:
+            while True:
+                delay = await self._reserve(bucket)
+                if delay <= 0:
+                    return
+                await asyncio.sleep(delay)
+
+    async def _reserve(self, bucket: TokenBucket) -> float:
+        return bucket.reserve(time.time(), self.max_rate, self.increase)
+
+    async def observe(self, url: str, api_key: Optional[str], response: httpx.Response):
+        """Learn from an upstream response: 429 / Retry-After throttles, rate-limit headers cap the tokens"""
+        if not self.enabled:
+            return
+        bucket = self.bucket(url, api_key)
+        now = time.time()
+        limits = parse_rate_limit(response.headers)
+        if response.status_code == 429:
+            bucket.throttled += 1
+            retry_after = parse_retry_after(response.headers)
+            if retry_after is None:
+                retry_after = limits["reset"] if limits["reset"] is not None else 1 / bucket.rate
+            await self._throttle(bucket, now, now + retry_after)
+        elif limits["remaining"] is not None:
+            until = now + limits["reset"] if limits["remaining"] < 1 and limits["reset"] else None
+            await self._cap(bucket, now, limits["remaining"], until)
+
+    async def _throttle(self, bucket: TokenBucket, now: float, until: float):
+        bucket.throttle(now, until, self.min_rate, self.decrease)
+
+    async def _cap(self, bucket: TokenBucket, now: float, remaining: float, until: Optional[float]):
+        bucket.refill(now)
+        bucket.cap(remaining)
+        if until is not None:
+            bucket.blocked_until = max(bucket.blocked_until, until)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "backend": "local",
+            "rate": self.rate,
+            "max_rate": self.max_rate,
+            "burst": self.burst,
+            "timeouts": self.timeouts,
+            "buckets": {key: b.stats() for key, b in self.buckets.items()},
+        }
+
+
+class MongoRateLimiter(RateLimiter):
+    """
+    Same buckets, kept in the rate_limits collection so every node shares the quota. Each reservation
+    is one atomic pipeline update that refills, takes a token if allowed and adapts the rate; the local
+    TokenBucket only mirrors the last document seen (for stats and the FIFO queue).
+    """
+
+    async def _reserve(self, bucket: TokenBucket) -> float:
+        try:
+            return await self._reserve_once(bucket)
+        except DuplicateKeyError:
+            # Another node inserted the bucket between our match and upsert; it exists now, so this matches
+            return await self._reserve_once(bucket)
+
+    async def _reserve_once(self, bucket: TokenBucket) -> float:
+        now = time.time()
+        rate = {"$ifNull": ["$rate", self.rate]}
+        doc = await get_collection(RateLimitDocument).find_one_and_update(
+            {"key": bucket.key},
+            [
+                {"$set": {
+                    "rate": rate,
+                    "tokens": {"$min": [self.burst, {"$add": [
+                        {"$ifNull": ["$tokens", self.burst]},
+                        {"$multiply": [{"$max": [0, {"$subtract": [now, {"$ifNull": ["$updated", now]}]}]}, rate]},
+                    ]}]},
+                    "blocked_until": {"$ifNull": ["$blocked_until", 0]},
+                    "updated": now,
+                }},
+                {"$set": {"granted": {"$and": [{"$gte": ["$tokens", 1]}, {"$lte": ["$blocked_until", now]}]}}},
+                {"$set": {
+                    "tokens": {"$cond": ["$granted", {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                    "rate": {"$cond": ["$granted", {"$min": [self.max_rate, {"$add": [
+                        "$rate", {"$divide": [self.increase, "$rate"]}]}]}, "$rate"]},
+                }},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        bucket.rate, bucket.tokens, bucket.blocked_until, bucket.updated = (
+            doc["rate"], doc["tokens"], doc["blocked_until"], now
+        )
+        if doc["granted"]:
+            return 0.0
+        if doc["blocked_until"] > now:
+            return doc["blocked_until"] - now
+        return (1 - doc["tokens"]) / doc["rate"]
+
+    async def _throttle(self, bucket: TokenBucket, now: float, until: float):
+        bucket.throttle(now, until, self.min_rate, self.decrease)
+        blocked = {"$ifNull": ["$blocked_until", 0]}
+        update = [{"$set": {
+            "rate": {"$cond": [{"$gt": [blocked, now]}, {"$ifNull": ["$rate", self.rate]},
+                               {"$max": [self.min_rate, {"$multiply": [{"$ifNull": ["$rate", self.rate]}, self.decrease]}]}]},
+            "blocked_until": {"$max": [blocked, until]},
+            "tokens": 0,
+            "updated": now,
+        }}]
+        try:
+            await get_collection(RateLimitDocument).update_one({"key": bucket.key}, update, upsert=True)
+        except DuplicateKeyError:
+            await get_collection(RateLimitDocument).update_one({"key": bucket.key}, update, upsert=True)
+
+    async def _cap(self, bucket: TokenBucket, now: float, remaining: float, until: Optional[float]):
+        await super()._cap(bucket, now, remaining, until)
+        update: Dict[str, Any] = {"$min": {"tokens": remaining}}
+        if until is not None:
+            update["$max"] = {"blocked_until": until}
+        await get_collection(RateLimitDocument).update_one({"key": bucket.key}, update)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "backend": "mongo"}
+
+
+# Shared by ResearchAgent, HuggingFaceService and the inference batcher; HF_RATE_LIMIT_BACKEND=mongo
+# coordinates the quota across nodes (needs init_database)
+rate_limiter = MongoRateLimiter() if os.getenv("HF_RATE_LIMIT_BACKEND", "local") == "mongo" else RateLimiter()
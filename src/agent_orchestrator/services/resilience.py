@@ -0,0 +1,309 @@
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+import httpx
+from src.agent_orchestrator.core.metrics import metrics
+from src.agent_orchestrator.core.tracing import tracer
+from src.agent_orchestrator.services.rate_limiter import parse_retry_after
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# attempt_fn(attempt) -> awaitable result; attempt counts from 1
+AttemptFn = Callable[[int], Awaitable[Any]]
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"Circuit open for {endpoint}; retry after {retry_after:.1f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Rate limits, 5xx, timeouts and connection errors; other 4xx and local bugs are not retried"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError))
+
+
+def is_endpoint_failure(exc: BaseException) -> bool:
+    # A 429 means the endpoint is up but throttling us; it does not count towards opening the circuit
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError))
+
+
+def server_retry_after(exc: BaseException) -> Optional[float]:
+    """Retry-After header (seconds form) or the inference API's 503 estimated_time"""
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    retry_after = parse_retry_after(exc.response.headers)
+    if retry_after is not None:
+        return retry_after
+    if exc.response.status_code == 503:
+        try:
+            body = exc.response.json()
+        except ValueError:
+            return None
+        if isinstance(body, dict) and isinstance(body.get("estimated_time"), (int, float)):
+            return float(body["estimated_time"])
+    return None
+
+
+def _discard_result(task: asyncio.Future):
+    if not task.cancelled():
+        task.exception()
+
+
+class BackoffPolicy:
+    """
+    Exponential backoff with full jitter: attempt n sleeps uniform(0, min(max_delay, base * 2**(n-1))),
+    which spreads synchronized retries out. A server-provided Retry-After is honoured (up to max_delay).
+    """
+
+    def __init__(self, base_delay: Optional[float] = None, max_delay: Optional[float] = None,
+                 rng: Optional[random.Random] = None):
+        self.base_delay = base_delay if base_delay is not None else float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+        self.max_delay = max_delay if max_delay is not None else float(os.getenv("RETRY_MAX_DELAY", "10"))
+        self.rng = rng or random.Random()
+        self.retries = 0
+        self.total_delay = 0.0
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = self.rng.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        self.retries += 1
+        self.total_delay += delay
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        return {"base_delay": self.base_delay, "max_delay": self.max_delay,
+                "retries": self.retries, "total_delay": self.total_delay}
+
+
+class CircuitBreaker:
+    """
+    closed -> open after failure_threshold consecutive endpoint failures; open rejects calls for
+    reset_timeout seconds, then half_open lets a single probe through: success closes, failure reopens.
+    """
+    __slots__ = ("failure_threshold", "reset_timeout", "state", "failures", "opened_at", "probing",
+                 "opened", "rejected")
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.opened = 0
+        self.rejected = 0
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if self.retry_after() > 0:
+                self.rejected += 1
+                return False
+            self.state = "half_open"
+            self.probing = False
+        if self.state == "half_open":
+            if self.probing:
+                self.rejected += 1
+                return False
+            self.probing = True
+        return True
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.opened += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self.probing = False
+
+    def release(self):
+        # The call neither succeeded nor failed the endpoint (e.g. a 429 or a cancelled hedge)
+        self.probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, "opened": self.opened, "rejected": self.rejected}
+
+
+class HedgePolicy:
+    """
+    Sends a second copy of a call if the first has not answered after the endpoint's observed
+    latency quantile (p95 by default) and takes whichever succeeds first; the loser is cancelled.
+    Until min_samples latencies are known the delay is initial_delay.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, quantile: Optional[float] = None,
+                 initial_delay: Optional[float] = None, min_delay: Optional[float] = None,
+                 min_samples: int = 20, window: int = 200):
+        self.enabled = enabled if enabled is not None else os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+        self.quantile = quantile or float(os.getenv("HEDGE_QUANTILE", "0.95"))
+        self.initial_delay = initial_delay if initial_delay is not None else float(os.getenv("HEDGE_INITIAL_DELAY_MS", "1000")) / 1000
+        self.min_delay = min_delay if min_delay is not None else float(os.getenv("HEDGE_MIN_DELAY_MS", "20")) / 1000
+        self.min_samples = min_samples
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def delay(self, endpoint: str) -> float:
+        samples = self._latencies.get(endpoint)
+        if not samples or len(samples) < self.min_samples:
+            return self.initial_delay
+        ordered = sorted(samples)
+        return max(self.min_delay, ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))])
+
+    def observe(self, endpoint: str, seconds: float):
+        samples = self._latencies.get(endpoint)
+        if samples is None:
+            samples = self._latencies[endpoint] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    async def run(self, endpoint: str, call: Callable[[], Awaitable[Any]], hedge: bool = True,
+                  prepare: Optional[Callable[[], Awaitable[Any]]] = None) -> Any:
+        """
+        hedge=False sends a single copy (still timed), e.g. for a circuit breaker's one probe.
+        prepare (e.g. taking a rate-limit token) runs before each copy, outside its timing and before
+        the hedge delay starts, so queueing never shows up as endpoint latency.
+        """
+        if prepare is not None:
+            await prepare()
+        if not self.enabled or not hedge:
+            return await self._timed(endpoint, call)
+        primary = asyncio.ensure_future(self._timed(endpoint, call))
+        pending = {primary}
+        error: Optional[BaseException] = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.delay(endpoint))
+            if done:
+                return primary.result()
+            self.hedged += 1
+            pending.add(asyncio.ensure_future(self._timed(endpoint, call, prepare)))
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Retrieve every exception first so a failed copy finishing alongside the winner is not left unobserved
+                winners = [task for task in done if task.exception() is None]
+                if winners:
+                    if primary not in winners:
+                        self.hedge_wins += 1
+                    return winners[0].result()
+                error = next(iter(done)).exception()
+            raise error
+        finally:
+            # Losers (and both copies if the caller is cancelled); one may already have failed by now
+            for task in pending:
+                task.add_done_callback(_discard_result)
+                task.cancel()
+
+    async def _timed(self, endpoint: str, call: Callable[[], Awaitable[Any]],
+                     prepare: Optional[Callable[[], Awaitable[Any]]] = None) -> Any:
+        if prepare is not None:
+            await prepare()
+        start = time.perf_counter()
+        result = await call()
+        self.observe(endpoint, time.perf_counter() - start)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "quantile": self.quantile,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "delays": {endpoint: self.delay(endpoint) for endpoint in self._latencies},
+        }
+
+
+class ResiliencePolicy:
+    """
+    Retry (only retryable errors, jittered exponential backoff), per-endpoint circuit breaking and
+    optional hedging around an upstream call. Shared by every replica that talks to the same endpoint.
+    """
+
+    def __init__(self, max_attempts: Optional[int] = None, backoff: Optional[BackoffPolicy] = None,
+                 hedge: Optional[HedgePolicy] = None, failure_threshold: Optional[int] = None,
+                 reset_timeout: Optional[float] = None):
+        self.max_attempts = max_attempts or int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+        self.backoff = backoff or BackoffPolicy()
+        self.hedge = hedge or HedgePolicy()
+        self.failure_threshold = failure_threshold or int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+        self.reset_timeout = reset_timeout or float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.non_retryable = 0
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    async def call(self, endpoint: str, attempt_fn: AttemptFn, label: str = "upstream",
+                   prepare: Optional[Callable[[], Awaitable[Any]]] = None) -> Any:
+        """
+        Run attempt_fn until it succeeds, fails with a non-retryable error, or max_attempts is used up.
+        Raises CircuitOpenError without calling attempt_fn while the endpoint's circuit is open.
+        prepare runs before every request sent (each attempt and each hedge), outside the latency timing.
+        """
+        breaker = self.breaker(endpoint)
+        for attempt in range(1, self.max_attempts + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(endpoint, breaker.retry_after())
+            try:
+                # A half-open breaker allows exactly one request; a hedge would make it two
+                result = await self.hedge.run(endpoint, lambda: attempt_fn(attempt), hedge=breaker.state == "closed",
+                                              prepare=prepare)
+            except Exception as e:
+                if is_endpoint_failure(e):
+                    breaker.record_failure()
+                else:
+                    breaker.release()
+                if not is_retryable(e):
+                    self.non_retryable += 1
+                    raise
+                if attempt == self.max_attempts:
+                    raise
+                reason = str(e.response.status_code) if isinstance(e, httpx.HTTPStatusError) else type(e).__name__
+                metrics.record_retry(label, reason)
+                delay = self.backoff.delay(attempt, server_retry_after(e))
+                with tracer.span("retry.backoff", seconds=round(delay, 3), reason=reason, attempt=attempt):
+                    await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                breaker.release()
+                raise
+            breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_attempts": self.max_attempts,
+            "non_retryable": self.non_retryable,
+            "backoff": self.backoff.stats(),
+            "hedge": self.hedge.stats(),
+            "circuit_breakers": {endpoint: b.stats() for endpoint, b in self.breakers.items()},
+            "circuits_opened": sum(b.opened for b in self.breakers.values()),
+            "circuit_rejections": sum(b.rejected for b in self.breakers.values()),
+        }
+
+
+# Shared by ResearchAgent replicas so breaker state and latency history are per endpoint, not per replica
+resilience = ResiliencePolicy()
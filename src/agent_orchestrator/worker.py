@@ -0,0 +1,138 @@
+"""
+Worker node: leases agent tasks from the shared Mongo queue, runs them and writes results back.
+Run as many as needed alongside API nodes started with ORCHESTRATOR_EXECUTION=queue:
+
+    python -m src.agent_orchestrator.worker --concurrency 8
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+import uuid
+from typing import List, Optional
+from src.agent_orchestrator.api.models import AgentResult
+from src.agent_orchestrator.core.agent_manager import AgentManager
+from src.agent_orchestrator.core.task_queue import QueuedTask
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    def __init__(self, queue, agent_manager: AgentManager, agent_ids: Optional[List[str]] = None,
+                 worker_id: Optional[str] = None, concurrency: Optional[int] = None,
+                 lease_seconds: Optional[float] = None, poll_interval: Optional[float] = None):
+        """
+        Each of the concurrency loops leases one task at a time. A task whose lease expires
+        (worker died) is handed to another worker; the lease is renewed while the task runs.
+        """
+        self.queue = queue
+        self.agent_manager = agent_manager
+        self.agent_ids = agent_ids or list(agent_manager.pools)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.concurrency = concurrency or int(os.getenv("WORKER_CONCURRENCY", "4"))
+        self.lease_seconds = lease_seconds or float(os.getenv("WORKER_LEASE_SECONDS", "60"))
+        self.poll_interval = poll_interval or float(os.getenv("WORKER_POLL_INTERVAL", "0.5"))
+        self.completed = 0
+        self.failed = 0
+        self.lost_leases = 0
+
+    async def run(self, stop: Optional[asyncio.Event] = None):
+        stop = stop or asyncio.Event()
+        loops = [asyncio.ensure_future(self._loop(stop)) for _ in range(self.concurrency)]
+        await asyncio.gather(*loops)
+
+    async def _loop(self, stop: asyncio.Event):
+        while not stop.is_set():
+            try:
+                queued = await self.queue.lease(self.worker_id, self.agent_ids, self.lease_seconds)
+            except Exception as e:
+                logger.warning("Leasing a task failed: %s", e)
+                queued = None
+            if queued is None:
+                # Idle: wait for the next poll, or exit early on shutdown
+                try:
+                    await asyncio.wait_for(stop.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._process(queued)
+
+    async def _process(self, queued: QueuedTask):
+        heartbeat = asyncio.ensure_future(self._renew(queued))
+        start = time.perf_counter()
+        try:
+            async with self.agent_manager.lease(queued.agent_id) as agent:
+                result = await self.agent_manager.execute(agent, queued.task)
+        except Exception as e:
+            result = AgentResult(agent_id=queued.agent_id, success=False, result=None, error=str(e))
+        finally:
+            heartbeat.cancel()
+        if await self.queue.complete(queued, self.worker_id, result, time.perf_counter() - start):
+            if result.success:
+                self.completed += 1
+            else:
+                self.failed += 1
+        else:
+            # Lease expired and another worker took the task over; its result wins
+            self.lost_leases += 1
+            logger.warning("Lost lease on task %s", queued.task_id)
+
+    async def _renew(self, queued: QueuedTask):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.queue.renew(queued.task_id, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.warning("Renewing lease on %s failed: %s", queued.task_id, e)
+
+    def stats(self):
+        return {
+            "worker_id": self.worker_id,
+            "agents": self.agent_ids,
+            "concurrency": self.concurrency,
+            "completed": self.completed,
+            "failed": self.failed,
+            "lost_leases": self.lost_leases,
+        }
+
+
+async def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Agent orchestration worker node")
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--agents", default=None, help="comma-separated agent ids to serve (default: all)")
+    args = parser.parse_args(argv)
+
+    from src.agent_orchestrator.core.agent_factory import build_agent_manager
+    from src.agent_orchestrator.core.task_queue import MongoTaskQueue
+    from src.agent_orchestrator.db.database import connect_to_mongo, init_database, close_mongo_connection
+    from src.agent_orchestrator.db.operations import db_ops
+    from src.agent_orchestrator.services.http_pool import http_pool
+    from src.agent_orchestrator.core.executor import agent_executor
+
+    await connect_to_mongo()
+    await init_database()
+    await http_pool.open()
+    agent_executor.start()
+    agent_ids = [a.strip() for a in args.agents.split(",")] if args.agents else None
+    worker = Worker(MongoTaskQueue(), build_agent_manager(db_ops), agent_ids=agent_ids, concurrency=args.concurrency)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    logger.info("Worker %s serving %s", worker.worker_id, worker.agent_ids)
+    try:
+        await worker.run(stop)
+    finally:
+        await http_pool.close()
+        agent_executor.close()
+        await close_mongo_connection()
+        logger.info("Worker stopped: %s", worker.stats())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
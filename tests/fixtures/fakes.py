@@ -0,0 +1,61 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from src.agent_orchestrator.api.models import AgentResult
+from src.agent_orchestrator.db.models import TaskStatus
+
+
+class FakeAgents:
+    """Agent manager stand-in: records every step it runs; decision fails while fail_decision is set"""
+
+    def __init__(self):
+        self.calls = []
+        self.fail_decision = True
+
+    @asynccontextmanager
+    async def lease(self, agent_type):
+        yield agent_type
+
+    async def execute(self, agent, task):
+        self.calls.append(agent)
+        if agent == "decision":
+            if self.fail_decision:
+                return AgentResult(agent_id=agent, success=False, result=None, error="upstream down")
+            return AgentResult(agent_id=agent, success=True, result={"decision": "proceed", "human_review": False})
+        return AgentResult(agent_id=agent, success=True, result={"step": agent, "query": task.query})
+
+
+class FakeDbOps:
+    """The WorkflowExecutionDocument operations the job runner uses, kept in a dict"""
+
+    def __init__(self):
+        self.executions = {}
+        self.results = {}  # task_id -> AgentResult stored by the runner
+        self.labels = {}  # result_id -> (task_id, queue_wait) of results stored by the task queue
+
+    async def get_workflow_execution(self, workflow_id):
+        return self.executions.get(workflow_id)
+
+    async def create_workflow_execution(self, workflow_id, request=None):
+        self.executions[workflow_id] = SimpleNamespace(status=TaskStatus.PENDING, request=request, error=None)
+
+    async def update_workflow_status(self, workflow_id, status):
+        self.executions[workflow_id].status = status
+
+    async def complete_workflow_execution(self, workflow_id, status, error=None, **kwargs):
+        self.executions[workflow_id].status = status
+        self.executions[workflow_id].error = error
+
+    async def restart_workflow_execution(self, workflow_id):
+        execution = self.executions.get(workflow_id)
+        if execution is None or execution.status != TaskStatus.FAILED:
+            return False
+        execution.status, execution.error = TaskStatus.PENDING, None
+        return True
+
+    async def store_agent_result(self, result, task_id=None):
+        self.results[task_id] = result
+        return SimpleNamespace(id=task_id)
+
+    async def label_agent_result(self, result_id, task_id, queue_wait=None):
+        self.labels[result_id] = (task_id, queue_wait)
+        return True
@@ -0,0 +1,71 @@
+"""
+Needs a MongoDB at MONGODB_URL (default mongodb://localhost:27017); skipped when none answers.
+Writes to the agent_orchestrator database under a unique agent id and removes what it wrote.
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from src.agent_orchestrator.api.models import AgentResult, AgentTask, OrchestrationResponse
+from src.agent_orchestrator.core.job_runner import WorkflowJobRunner
+from src.agent_orchestrator.core.task_queue import MongoTaskQueue
+from src.agent_orchestrator.db.database import connect_to_mongo, database, init_database
+from src.agent_orchestrator.db.models import AgentResultDocument, AgentTaskDocument, WorkflowExecutionDocument
+from src.agent_orchestrator.db.operations import DatabaseOperations
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+
+
+def _mongo_available() -> bool:
+    try:
+        MongoClient(MONGODB_URL, serverSelectionTimeoutMS=500).admin.command("ping")
+        return True
+    except PyMongoError:
+        return False
+
+
+pytestmark = pytest.mark.skipif(not _mongo_available(), reason=f"no MongoDB at {MONGODB_URL}")
+
+
+def test_queued_results_are_counted_once_in_agent_stats():
+    agent_id = f"stats_{uuid.uuid4().hex[:8]}"
+    workflow_id = f"workflow_{uuid.uuid4().hex}"
+
+    async def scenario():
+        await connect_to_mongo()
+        await init_database()
+        db_ops = DatabaseOperations(write_behind=False)
+        queue = MongoTaskQueue(poll_interval=0.01)
+        try:
+            since = datetime.utcnow() - timedelta(seconds=1)
+            results = []
+            for i in range(3):
+                queued_id = await queue.enqueue(agent_id, AgentTask(agent_id=agent_id, query="q", task_id=str(i)),
+                                                workflow_id=workflow_id)
+                leased = await queue.lease("worker", [agent_id], 30)
+                await queue.complete(leased, "worker", AgentResult(agent_id=agent_id, success=i != 2, result={}),
+                                     execution_time=0.1)
+                result = await queue.wait_result(queued_id, timeout=5)
+                result.task_id = str(i)
+                results.append(result)
+            await db_ops.create_workflow_execution(workflow_id)
+            runner = WorkflowJobRunner(engine=None, db_ops=db_ops)
+            await runner._record(OrchestrationResponse(workflow_id=workflow_id, elapsed=0.3, results=results))
+            rows = await db_ops.aggregate_agent_stats(since, datetime.utcnow() + timedelta(seconds=1), None, agent_id)
+            labels = sorted(doc.task_id for doc in await AgentResultDocument.find(
+                AgentResultDocument.agent_id == agent_id).to_list())
+            return rows, labels
+        finally:
+            await AgentResultDocument.find(AgentResultDocument.agent_id == agent_id).delete()
+            await AgentTaskDocument.find(AgentTaskDocument.agent_id == agent_id).delete()
+            await WorkflowExecutionDocument.find(WorkflowExecutionDocument.workflow_id == workflow_id).delete()
+            database.client.close()
+
+    rows, labels = asyncio.run(scenario())
+    assert len(rows) == 1
+    assert rows[0]["tasks"] == 3
+    assert rows[0]["successes"] == 2
+    assert labels == [f"{workflow_id}:{i}" for i in range(3)]
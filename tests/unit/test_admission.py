@@ -0,0 +1,46 @@
+import asyncio
+import pytest
+from src.agent_orchestrator.core.admission import (
+    AdmissionController, AdmissionRejected, AgentGate, WorkflowExceedsCapacity
+)
+from src.agent_orchestrator.core.dag_scheduler import DagScheduler
+
+
+def test_reserve_rejects_workflow_larger_than_agent_capacity():
+    admission = AdmissionController(default_max_load=2, max_queue=1)
+    with pytest.raises(WorkflowExceedsCapacity):
+        admission.reserve(["research"] * 4)
+    assert admission.gate("research").reserved == 0
+    assert admission.gate("research").rejected == 0
+
+
+def test_reserve_at_capacity_is_admitted_then_overload_is_retryable():
+    admission = AdmissionController(default_max_load=2, max_queue=1)
+    reservation = admission.reserve(["research"] * 3)
+    assert admission.gate("research").reserved == 3
+    with pytest.raises(AdmissionRejected):
+        admission.reserve(["research"])
+    reservation.release()
+    assert admission.gate("research").reserved == 0
+    admission.reserve(["research"])
+
+
+@pytest.mark.parametrize("max_load", [0, -1])
+def test_limits_below_one_are_rejected(max_load):
+    with pytest.raises(ValueError):
+        AgentGate("research", max_load, 0, 1.0)
+    with pytest.raises(ValueError):
+        AdmissionController(default_max_load=max_load)
+    with pytest.raises(ValueError):
+        DagScheduler(default_agent_concurrency=max_load)
+
+
+def test_load_limits_skips_zero_max_load():
+    class DbOps:
+        async def get_agent_limits(self):
+            return {"research": 0, "analysis": 3}
+
+    admission = AdmissionController(default_max_load=5)
+    asyncio.run(admission.load_limits(DbOps()))
+    assert admission.gate("research").max_concurrency == 5
+    assert admission.gate("analysis").max_concurrency == 3
@@ -0,0 +1,92 @@
+import math
+import warnings
+import numpy as np
+import pandas as pd
+import pytest
+from src.agent_orchestrator.agents.analysis_agent import AnalysisAgent
+
+
+def loop_statistics(df: pd.DataFrame):
+    # The per-column implementation the vectorized one replaced
+    return {
+        col: {"mean": float(df[col].mean()), "std": float(df[col].std()),
+              "min": float(df[col].min()), "max": float(df[col].max())}
+        for col in df.select_dtypes(include=np.number).columns
+    }
+
+
+def loop_trends(df: pd.DataFrame):
+    trends = {}
+    for col in df.select_dtypes(include=np.number).columns:
+        arr = df[col].values
+        if len(arr) >= 2:
+            corr = float(np.corrcoef(np.arange(len(arr)), arr)[0, 1])
+            trends[col] = {"trend": "upward" if corr > 0.35 else "downward" if corr < -0.35 else "neutral",
+                           "corr": corr}
+    return trends
+
+
+def random_frame(seed: int, rows: int = 120, cols: int = 12) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = rng.normal(0, 1, (rows, cols)) + np.arange(rows)[:, None] * rng.normal(0, 0.02, cols)
+    # Gaps in half the columns: their stats skip NaN, their correlation is NaN on both paths
+    half = data[:, : cols // 2]
+    half[rng.random(half.shape) < 0.05] = np.nan
+    df = pd.DataFrame(data, columns=[f"c{i}" for i in range(cols)])
+    df["label"] = "x"
+    return df
+
+
+def edge_frames():
+    yield "nans", pd.DataFrame({"a": [1.0, np.nan, 3.0, 4.0], "b": [np.nan, 2.0, 2.5, 9.0]})
+    yield "constant", pd.DataFrame({"a": [5.0] * 6, "b": range(6)})
+    yield "all_nan", pd.DataFrame({"a": [np.nan] * 4, "b": [1.0, 2.0, 3.0, 5.0]})
+    yield "nullable_int", pd.DataFrame({"a": pd.array([1, None, 3, 7], dtype="Int64"), "b": [1, 2, 3, 4]})
+    yield "empty", pd.DataFrame({"a": pd.Series([], dtype=float)})
+    yield "one_row", pd.DataFrame({"a": [1.5], "b": [2]})
+    yield "two_rows", pd.DataFrame({"a": [1.5, 0.5], "b": [2, 2]})
+
+
+def baseline(df):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return loop_statistics(df), loop_trends(df)
+
+
+def vectorized(df):
+    agent = AnalysisAgent()
+    block = agent.numeric_block(df)
+    return agent.compute_statistics(df, block), agent.detect_trends(df, block)
+
+
+def assert_stats_identical(new, old):
+    assert new.keys() == old.keys()
+    for col, metrics in old.items():
+        for key, value in metrics.items():
+            got = new[col][key]
+            assert got == value or (math.isnan(got) and math.isnan(value)), (col, key, got, value)
+
+
+def assert_trends_close(new, old):
+    assert new.keys() == old.keys()
+    for col, expected in old.items():
+        assert new[col]["trend"] == expected["trend"], col
+        # Same correlation up to summation order (BLAS vs np.corrcoef), not bit for bit
+        assert new[col]["corr"] == pytest.approx(expected["corr"], rel=1e-12, abs=1e-12, nan_ok=True), col
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_vectorized_matches_loops_on_random_frames(seed):
+    df = random_frame(seed)
+    new_stats, new_trends = vectorized(df)
+    old_stats, old_trends = baseline(df)
+    assert_stats_identical(new_stats, old_stats)
+    assert_trends_close(new_trends, old_trends)
+
+
+@pytest.mark.parametrize("name, df", list(edge_frames()))
+def test_vectorized_matches_loops_on_edge_cases(name, df):
+    new_stats, new_trends = vectorized(df)
+    old_stats, old_trends = baseline(df)
+    assert_stats_identical(new_stats, old_stats)
+    assert_trends_close(new_trends, old_trends)
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from src.agent_orchestrator.api.models import AgentTask, OrchestrationRequest
+from src.agent_orchestrator.core.checkpoints import InMemoryCheckpointStore
+from src.agent_orchestrator.core.event_bus import TERMINAL_EVENT, WorkflowEventBus
+from src.agent_orchestrator.core.job_runner import JobNotRetryable, WorkflowJobRunner
+from src.agent_orchestrator.core.state_manager import StateManager
+from src.agent_orchestrator.core.workflow_engine import WorkflowEngine
+from src.agent_orchestrator.db.models import TaskStatus
+from tests.fixtures.fakes import FakeAgents, FakeDbOps
+
+
+def make_engine(agents, checkpoints=None):
+    return WorkflowEngine(task_router=None, agent_manager=agents, state_manager=StateManager(event_bus=WorkflowEventBus()),
+                          checkpoints=checkpoints if checkpoints is not None else InMemoryCheckpointStore())
+
+
+def chained(workflow_id=None):
+    return OrchestrationRequest(tasks=[AgentTask(agent_id="research", query="solar market")],
+                                workflow_id=workflow_id, mode="chained")
+
+
+def test_failed_decision_resumes_without_rerunning_research():
+    agents = FakeAgents()
+    engine = make_engine(agents)
+
+    first = asyncio.run(engine.run(chained("wf-1")))
+    assert [r.success for r in first.results] == [True, True, False]
+    assert agents.calls == ["research", "analysis", "decision"]
+
+    agents.fail_decision = False
+    second = asyncio.run(engine.run(chained("wf-1")))
+    assert all(r.success for r in second.results)
+    assert agents.calls == ["research", "analysis", "decision", "decision"]
+    assert second.results[0].result == first.results[0].result
+
+
+def test_anonymous_chained_runs_are_not_checkpointed():
+    agents = FakeAgents()
+    checkpoints = InMemoryCheckpointStore()
+    engine = make_engine(agents, checkpoints)
+
+    asyncio.run(engine.run(chained()))
+    asyncio.run(engine.run(chained()))
+    assert agents.calls.count("research") == 2
+    assert not checkpoints._entries
+
+
+def test_job_retry_resumes_failed_chained_job():
+    agents = FakeAgents()
+    db_ops = FakeDbOps()
+    runner = WorkflowJobRunner(make_engine(agents), db_ops, workers=1)
+
+    async def scenario():
+        workflow_id = await runner.submit(chained("job-1"))
+        await runner._queue.join()
+        assert db_ops.executions[workflow_id].status == TaskStatus.FAILED
+
+        agents.fail_decision = False
+        await runner.retry(workflow_id)
+        with pytest.raises(JobNotRetryable):
+            await runner.retry(workflow_id)  # already pending again
+        await runner._queue.join()
+        await runner.stop()
+        return workflow_id
+
+    workflow_id = asyncio.run(scenario())
+    assert db_ops.executions[workflow_id].status == TaskStatus.COMPLETED
+    assert agents.calls == ["research", "analysis", "decision", "decision"]
+
+
+def test_step_that_raises_ends_the_workflow():
+    class RaisingAgents(FakeAgents):
+        async def execute(self, agent, task):
+            if agent == "analysis":
+                raise RuntimeError("analysis crashed")
+            return await super().execute(agent, task)
+
+    engine = make_engine(RaisingAgents())
+    with pytest.raises(RuntimeError):
+        asyncio.run(engine.run(chained("wf-raise")))
+
+    bus = engine.state_manager.event_bus
+    assert bus.finished("wf-raise")
+    terminal = bus.history("wf-raise")[-1]
+    assert terminal.type == TERMINAL_EVENT and terminal.data["error"] == "analysis crashed"
+    assert engine.state_manager.workflows["wf-raise"].finished
@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+from src.agent_orchestrator.api.models import AgentResult, AgentTask
+from src.agent_orchestrator.core.dag_scheduler import DagScheduler, WorkflowGraphError
+
+
+def task(task_id=None, depends_on=(), agent_id="research"):
+    return AgentTask(agent_id=agent_id, query="q", task_id=task_id, depends_on=list(depends_on))
+
+
+class CountingRunner:
+    """Records how many tasks run at once, overall and per agent; tasks in `fail` return success=False"""
+
+    def __init__(self, delay=0.01, fail=(), delays=None):
+        self.delay = delay
+        self.delays = delays or {}
+        self.fail = set(fail)
+        self.active = 0
+        self.peak = 0
+        self.active_by_agent = {}
+        self.peak_by_agent = {}
+        self.ran = []
+        self.deps_seen = {}
+
+    async def __call__(self, t, agent_id, deps):
+        self.active += 1
+        self.active_by_agent[agent_id] = self.active_by_agent.get(agent_id, 0) + 1
+        self.peak = max(self.peak, self.active)
+        self.peak_by_agent[agent_id] = max(self.peak_by_agent.get(agent_id, 0), self.active_by_agent[agent_id])
+        try:
+            await asyncio.sleep(self.delays.get(t.task_id, self.delay))
+            self.ran.append(t.task_id)
+            self.deps_seen[t.task_id] = sorted(deps)
+            return AgentResult(agent_id=agent_id, success=t.task_id not in self.fail, result=t.task_id)
+        finally:
+            self.active -= 1
+            self.active_by_agent[agent_id] -= 1
+
+
+def test_plan_levels():
+    levels = DagScheduler().plan([task("a"), task("b", ["a"]), task("c", ["a"]), task("d", ["b", "c"])])
+    assert [sorted(level) for level in levels] == [[0], [1, 2], [3]]
+
+
+@pytest.mark.parametrize("tasks, message", [
+    ([task("a", ["b"]), task("b", ["a"])], "cycle"),
+    ([task("a", ["a"])], "cycle"),
+    ([task("a"), task("a")], "Duplicate"),
+    ([task(), task("0")], "Duplicate"),  # the first task's positional key is "0"
+    ([task("a", ["missing"])], "unknown"),
+])
+def test_plan_rejects_bad_graphs(tasks, message):
+    with pytest.raises(WorkflowGraphError, match=message):
+        DagScheduler().plan(tasks)
+
+
+def test_results_in_request_order():
+    tasks = [task(str(i)) for i in range(6)]
+    # Later tasks finish first, so request order cannot come from completion order
+    runner = CountingRunner(delays={str(i): 0.01 * (6 - i) for i in range(6)})
+    results = asyncio.run(DagScheduler(default_agent_concurrency=6).run([(t, "research") for t in tasks], runner))
+    assert [r.task_id for r in results] == [str(i) for i in range(6)]
+    assert [r.result for r in results] == [str(i) for i in range(6)]
+    assert runner.ran != [str(i) for i in range(6)]
+
+
+def test_dependencies_are_passed_and_failures_skip_dependents():
+    tasks = [task("a"), task("b", ["a"]), task("c", ["b"]), task("d")]
+    runner = CountingRunner(fail={"a"})
+    results = asyncio.run(DagScheduler().run([(t, "research") for t in tasks], runner))
+    by_id = {r.task_id: r for r in results}
+    assert not by_id["a"].success
+    assert not by_id["b"].success and by_id["b"].error == "Skipped: dependency failed (a)"
+    assert not by_id["c"].success and "dependency failed (b)" in by_id["c"].error
+    assert by_id["d"].success
+    assert sorted(runner.ran) == ["a", "d"]
+
+
+def test_dependents_see_dependency_results():
+    tasks = [task("a"), task("b"), task("c", ["a", "b"])]
+    runner = CountingRunner()
+    asyncio.run(DagScheduler().run([(t, "research") for t in tasks], runner))
+    assert runner.deps_seen["c"] == ["a", "b"]
+
+
+def test_runner_exception_becomes_failed_result():
+    async def runner(t, agent_id, deps):
+        raise RuntimeError("boom")
+
+    results = asyncio.run(DagScheduler().run([(task("a"), "research"), (task("b", ["a"]), "research")], runner))
+    assert results[0].error == "boom"
+    assert results[1].error.startswith("Skipped")
+
+
+def test_concurrency_caps_hold():
+    scheduler = DagScheduler(max_concurrency=3, agent_concurrency={"analysis": 1}, default_agent_concurrency=2)
+    routed = [(task(f"r{i}"), "research") for i in range(6)] + [(task(f"a{i}"), "analysis") for i in range(4)] \
+        + [(task(f"d{i}"), "decision") for i in range(6)]
+    runner = CountingRunner(delay=0.005)
+    results = asyncio.run(scheduler.run(routed, runner))
+    assert all(r.success for r in results)
+    assert runner.peak == 3
+    assert runner.peak_by_agent["research"] <= 2
+    assert runner.peak_by_agent["decision"] <= 2
+    assert runner.peak_by_agent["analysis"] == 1
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import time
+import uuid
+import pytest
+from src.agent_orchestrator.services.dataset_spool import DatasetSpool, DatasetTooLarge, detect_format
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def save(spool, *parts, **kwargs):
+    return asyncio.run(spool.save(chunks(*parts), **kwargs))
+
+
+def backdate(path: str, seconds: float):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_save_detects_format_and_locate_finds_it(tmp_path):
+    spool = DatasetSpool(directory=str(tmp_path))
+    saved = save(spool, b"PAR1", b"rest of the file", filename="upload.bin")
+    assert saved["format"] == "parquet" and saved["bytes"] == 20
+    found = spool.locate(saved["dataset_id"])
+    assert found["format"] == "parquet"
+    with open(found["path"], "rb") as f:
+        assert f.read() == b"PAR1rest of the file"
+    assert spool.delete(saved["dataset_id"])
+    assert spool.locate(saved["dataset_id"]) is None
+
+
+@pytest.mark.parametrize("dataset_id", [
+    "",
+    "../outside",
+    "../" + uuid.uuid4().hex,
+    uuid.uuid4().hex + "\n",
+    uuid.uuid4().hex.upper(),
+    uuid.uuid4().hex[:31],
+    uuid.uuid4().hex + ".csv",
+])
+def test_locate_and_delete_reject_bad_ids(tmp_path, dataset_id):
+    spool = DatasetSpool(directory=str(tmp_path / "spool"))
+    # A real file the bad id would resolve to if it were joined onto the directory unchecked
+    os.makedirs(spool.directory)
+    with open(os.path.join(spool.directory, f"{dataset_id.strip()}.csv"), "wb") as f:
+        f.write(b"a\n1\n")
+    assert spool.locate(dataset_id) is None
+    assert not spool.delete(dataset_id)
+
+
+@pytest.mark.parametrize("fmt", ["../csv", "csv/../../x", "exe"])
+def test_save_rejects_unknown_formats_without_leaving_files(tmp_path, fmt):
+    spool = DatasetSpool(directory=str(tmp_path))
+    with pytest.raises(ValueError):
+        save(spool, b"a,b\n1,2\n", fmt=fmt)
+    assert os.listdir(tmp_path) == []
+
+
+def test_oversized_upload_is_rejected_and_removed(tmp_path):
+    spool = DatasetSpool(directory=str(tmp_path), max_bytes=10)
+    with pytest.raises(DatasetTooLarge):
+        save(spool, b"a,b\n", b"1,2\n", b"3,4\n", filename="data.csv")
+    assert os.listdir(tmp_path) == []
+
+
+def test_sweep_deletes_expired_datasets_and_partial_uploads_only(tmp_path):
+    spool = DatasetSpool(directory=str(tmp_path), ttl=3600)
+    old = save(spool, b"a\n1\n", filename="old.csv")["dataset_id"]
+    fresh = save(spool, b"a\n1\n", filename="fresh.csv")["dataset_id"]
+    backdate(spool.locate(old)["path"], 7200)
+    abandoned = tmp_path / f"{uuid.uuid4().hex}.part"
+    abandoned.write_bytes(b"partial")
+    backdate(str(abandoned), 7200)
+    foreign = tmp_path / "notes.csv"
+    foreign.write_bytes(b"not ours")
+    backdate(str(foreign), 7200)
+
+    assert spool.sweep() == 2
+    assert spool.locate(old) is None and not abandoned.exists()
+    assert spool.locate(fresh) is not None and foreign.exists()
+    assert spool.expired == 2
+
+
+def test_save_sweeps_at_most_every_sweep_interval(tmp_path):
+    spool = DatasetSpool(directory=str(tmp_path), ttl=3600, sweep_interval=300)
+    first = save(spool, b"a\n1\n", filename="a.csv")["dataset_id"]
+    backdate(spool.locate(first)["path"], 7200)
+    save(spool, b"a\n1\n", filename="b.csv")  # within the interval: no sweep
+    assert spool.locate(first) is not None
+
+    spool._last_sweep -= 301
+    save(spool, b"a\n1\n", filename="c.csv")
+    assert spool.locate(first) is None
+
+
+@pytest.mark.parametrize("filename, head, fmt", [
+    (None, b"ARROW1\x00\x00", "arrow"),
+    (None, b"\xff\xff\xff\xff\x10\x00", "arrow"),
+    ("data.PQ", b"", "parquet"),
+    ("rows.jsonl", b"{}", "ndjson"),
+    ("table.csv", b"a,b", "csv"),
+    ("table.txt", b"a,b", None),
+])
+def test_detect_format(filename, head, fmt):
+    assert detect_format(filename, head) == fmt
@@ -0,0 +1,44 @@
+import asyncio
+from src.agent_orchestrator.core.event_bus import TERMINAL_EVENT, WorkflowEventBus
+
+
+async def collect(bus, workflow_id, **kwargs):
+    return [event async for event in bus.subscribe(workflow_id, **kwargs)]
+
+
+def test_replay_ends_at_terminal_event():
+    bus = WorkflowEventBus()
+    bus.publish("wf", "step", step="a")
+    bus.publish("wf", TERMINAL_EVENT)
+    events = asyncio.run(asyncio.wait_for(collect(bus, "wf", heartbeat=0.05), 1))
+    assert [e.type for e in events] == ["step", TERMINAL_EVENT]
+
+
+def test_resume_after_terminal_event_closes_the_stream():
+    bus = WorkflowEventBus()
+    bus.publish("wf", "step_started", step="a")
+    terminal = bus.publish("wf", TERMINAL_EVENT)
+    for after in (terminal.id, terminal.id + 5):
+        events = asyncio.run(asyncio.wait_for(collect(bus, "wf", last_event_id=after, heartbeat=0.05), 1))
+        assert events == []
+
+
+def test_resume_delivers_live_events_until_terminal():
+    bus = WorkflowEventBus()
+    first = bus.publish("wf", "step", step="a")
+
+    async def scenario():
+        consumer = asyncio.ensure_future(collect(bus, "wf", last_event_id=first.id))
+        await asyncio.sleep(0)
+        bus.publish("wf", "step", step="b")
+        bus.publish("wf", TERMINAL_EVENT)
+        return await asyncio.wait_for(consumer, 1)
+
+    events = asyncio.run(scenario())
+    assert [(e.type, e.data.get("step")) for e in events] == [("step", "b"), (TERMINAL_EVENT, None)]
+
+
+def test_unknown_workflow_ends_at_once_unless_created():
+    bus = WorkflowEventBus()
+    assert asyncio.run(collect(bus, "missing")) == []
+    assert not bus.has("missing")
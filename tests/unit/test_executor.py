@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+import numpy as np
+import pandas as pd
+from src.agent_orchestrator.api.models import AgentResult, AgentTask
+from src.agent_orchestrator.core.executor import AgentExecutor, _Packer, _run_limited, _unpack
+
+
+class SumAgent:
+    """Picklable: reports the sum of params["values"] and the worker's thread"""
+    cpu_bound = True
+
+    async def execute(self, task):
+        values = task.params["values"]
+        return AgentResult(agent_id=task.agent_id, success=True,
+                           result={"sum": float(np.sum(values)), "thread": threading.current_thread().name})
+
+
+class SpinAgent:
+    cpu_bound = True
+
+    async def execute(self, task):
+        while True:
+            pass
+
+
+class SleepAgent:
+    cpu_bound = True
+
+    async def execute(self, task):
+        time.sleep(0.3)
+        return AgentResult(agent_id=task.agent_id, success=True, result={})
+
+
+def task(**params):
+    return AgentTask(agent_id="analysis", query="q", params=params)
+
+
+def test_unpicklable_agent_falls_back_to_threads():
+    agent = SumAgent()
+    agent.callback = lambda: None  # lambdas cannot be pickled
+    executor = AgentExecutor(mode="process", workers=1)
+    try:
+        result = asyncio.run(executor.run(agent, task(values=[1, 2, 3])))
+    finally:
+        executor.close()
+    assert result.result["sum"] == 6.0
+    assert result.result["thread"].startswith("agent")
+    assert executor.stats()["fallbacks"] == 1 and executor.process_runs == 0
+
+
+def test_process_pool_runs_agent_with_shared_arrays():
+    values = np.arange(200_000, dtype=np.float64)
+    executor = AgentExecutor(mode="process", workers=1, shm_min_bytes=1024)
+    try:
+        result = asyncio.run(executor.run(SumAgent(), task(values=values)))
+    finally:
+        executor.close()
+    assert result.success and result.result["sum"] == float(values.sum())
+    assert executor.process_runs == 1 and executor.fallbacks == 0
+
+
+def test_cpu_limit_stops_a_spinning_agent():
+    executor = AgentExecutor(mode="process", workers=1, cpu_timeout=0.5)
+    try:
+        result = asyncio.run(executor.run(SpinAgent(), task()))
+    finally:
+        executor.close()
+    assert not result.success
+    assert "CPU time limit" in result.error
+    assert executor.pool_restarts == 0
+
+
+def test_thread_mode_gives_up_waiting_after_timeout():
+    executor = AgentExecutor(mode="thread", workers=1)
+    try:
+        result = asyncio.run(executor.run(SleepAgent(), task(), cpu_timeout=0.05))
+    finally:
+        executor.close()
+    assert not result.success and executor.timeouts == 1
+
+
+def test_packed_params_round_trip_through_shared_memory():
+    frame = pd.DataFrame({"x": np.arange(1000, dtype=np.float64), "label": ["a"] * 1000})
+    params = {"frame": frame, "nested": {"ids": np.arange(1000, dtype=np.int64)}, "small": np.ones(2), "name": "run"}
+    packer = _Packer(min_bytes=1024)
+    packed = packer.pack(params)
+    shm = packer.write()
+    try:
+        assert len(packer.arrays) == 2  # frame["x"] and nested["ids"]; small arrays and strings are pickled
+        unpacked = _unpack(packed, shm.buf)
+        pd.testing.assert_frame_equal(unpacked["frame"], frame)
+        np.testing.assert_array_equal(unpacked["nested"]["ids"], params["nested"]["ids"])
+        assert unpacked["name"] == "run"
+        del unpacked
+        shipped = task().model_copy(update={"params": {"values": packed["nested"]["ids"]}})
+        result = _run_limited(SumAgent(), shipped, shm.name, cpu_timeout=10)
+        assert result.result["sum"] == float(np.arange(1000).sum())
+    finally:
+        shm.close()
+        shm.unlink()
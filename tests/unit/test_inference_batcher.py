@@ -0,0 +1,93 @@
+import asyncio
+import json
+import httpx
+import pytest
+from src.agent_orchestrator.services.http_pool import HttpClientPool
+from src.agent_orchestrator.services.inference_batcher import InferenceBatcher
+from src.agent_orchestrator.services.rate_limiter import RateLimiter
+
+URL = "http://upstream/models/bert"
+
+
+def make_batcher(handler, **kwargs):
+    requests = []
+
+    async def record(request):
+        requests.append({"body": json.loads(request.content), "timeout": request.extensions["timeout"]["read"]})
+        return await handler(request)
+
+    pool = HttpClientPool(timeout=7)
+    pool._client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+    batcher = InferenceBatcher(http_pool=pool, enabled=True, rate_limiter=RateLimiter(enabled=False), **kwargs)
+    return batcher, requests
+
+
+async def echo(request):
+    inputs = json.loads(request.content)["inputs"]
+    if isinstance(inputs, list):
+        return httpx.Response(200, json=[{"echo": text} for text in inputs])
+    return httpx.Response(200, json={"echo": inputs})
+
+
+def test_concurrent_calls_are_sent_as_one_batch_in_order():
+    batcher, requests = make_batcher(echo, max_batch_size=16, max_wait=0.02)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.submit(URL, "key", f"q{i}") for i in range(5)))
+
+    assert asyncio.run(scenario()) == [{"echo": f"q{i}"} for i in range(5)]
+    assert len(requests) == 1
+    assert requests[0]["body"] == {"inputs": [f"q{i}" for i in range(5)]}
+    assert batcher.stats()["avg_batch_size"] == 5
+
+
+def test_full_batch_is_sent_without_waiting_and_params_split_batches():
+    batcher, requests = make_batcher(echo, max_batch_size=2, max_wait=10)
+
+    async def scenario():
+        full = await asyncio.wait_for(asyncio.gather(batcher.submit(URL, "key", "a"), batcher.submit(URL, "key", "b")), 1)
+        batcher.max_wait = 0.01
+        other = await asyncio.gather(batcher.submit(URL, "key", "c", {"top_k": 1}), batcher.submit(URL, "key", "d"))
+        return full, other
+
+    full, other = asyncio.run(scenario())
+    assert full == [{"echo": "a"}, {"echo": "b"}]
+    assert other == [{"echo": "c"}, {"echo": "d"}]
+    assert [r["body"] for r in requests[1:]] == [{"inputs": "c", "parameters": {"top_k": 1}}, {"inputs": "d"}]
+
+
+def test_single_call_keeps_the_unbatched_shape():
+    batcher, requests = make_batcher(echo, max_wait=0.005)
+    assert asyncio.run(batcher.submit(URL, "key", "only")) == {"echo": "only"}
+    assert requests[0]["body"] == {"inputs": "only"}
+
+
+def test_batch_uses_longest_caller_timeout_or_the_pool_default():
+    batcher, requests = make_batcher(echo, max_wait=0.01)
+
+    async def scenario():
+        await asyncio.gather(batcher.submit(URL, "key", "a", timeout=3), batcher.submit(URL, "key", "b", timeout=12),
+                             batcher.submit(URL, "key", "c"))
+        await batcher.submit(URL, "key", "d")
+
+    asyncio.run(scenario())
+    assert [r["timeout"] for r in requests] == [12, 7]
+
+
+def test_errors_and_bad_shapes_reach_every_caller():
+    async def short(request):
+        return httpx.Response(200, json=[{"echo": "only one"}])
+
+    async def unavailable(request):
+        return httpx.Response(503, json={"error": "loading"})
+
+    for handler, error in [(short, ValueError), (unavailable, httpx.HTTPStatusError)]:
+        batcher, _ = make_batcher(handler, max_wait=0.01)
+
+        async def scenario():
+            return await asyncio.gather(*(batcher.submit(URL, "key", f"q{i}") for i in range(3)),
+                                        return_exceptions=True)
+
+        outcomes = asyncio.run(scenario())
+        assert all(isinstance(o, error) for o in outcomes)
+        assert batcher.stats()["sending"] == 0
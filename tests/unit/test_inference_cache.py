@@ -0,0 +1,171 @@
+import asyncio
+import httpx
+import pytest
+from src.agent_orchestrator.services.huggingface_service import HuggingFaceService
+from src.agent_orchestrator.services.http_pool import HttpClientPool, _CountingTransport
+from src.agent_orchestrator.services.inference_batcher import InferenceBatcher
+from src.agent_orchestrator.services.inference_cache import InferenceCache
+from src.agent_orchestrator.services.rate_limiter import RateLimiter
+
+
+class Upstream:
+    """fetch() stand-in that counts calls and can be held open until released"""
+
+    def __init__(self, value="result", error=None):
+        self.calls = 0
+        self.value = value
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return self.value
+
+
+def test_concurrent_misses_share_one_call():
+    cache = InferenceCache(max_entries=10, ttl=60)
+
+    async def scenario():
+        upstream = Upstream()
+        waiters = [asyncio.ensure_future(cache.get_or_fetch("k", upstream)) for _ in range(10)]
+        await asyncio.sleep(0)
+        upstream.release.set()
+        results = await asyncio.gather(*waiters)
+        assert await cache.get_or_fetch("k", upstream) == "result"
+        return upstream, results
+
+    upstream, results = asyncio.run(scenario())
+    assert upstream.calls == 1
+    assert results == ["result"] * 10
+    assert (cache.misses, cache.coalesced, cache.hits) == (1, 9, 1)
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_failures_are_shared_but_not_cached():
+    cache = InferenceCache(max_entries=10, ttl=60)
+
+    async def scenario():
+        failing = Upstream(error=RuntimeError("503"))
+        waiters = [asyncio.ensure_future(cache.get_or_fetch("k", failing)) for _ in range(3)]
+        await asyncio.sleep(0)
+        failing.release.set()
+        outcomes = await asyncio.gather(*waiters, return_exceptions=True)
+        ok = Upstream()
+        ok.release.set()
+        return failing, outcomes, await cache.get_or_fetch("k", ok)
+
+    failing, outcomes, value = asyncio.run(scenario())
+    assert failing.calls == 1
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+    assert value == "result"
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    cache = InferenceCache(max_entries=10, ttl=60)
+
+    async def scenario():
+        upstream = Upstream()
+        first = asyncio.ensure_future(cache.get_or_fetch("k", upstream))
+        second = asyncio.ensure_future(cache.get_or_fetch("k", upstream))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        upstream.release.set()
+        return await second, first.cancelled()
+
+    assert asyncio.run(scenario()) == ("result", True)
+
+
+def test_entries_expire_after_ttl():
+    cache = InferenceCache(max_entries=10, ttl=0.05)
+
+    async def scenario():
+        upstream = Upstream()
+        upstream.release.set()
+        await cache.get_or_fetch("k", upstream)
+        await cache.get_or_fetch("k", upstream)
+        await asyncio.sleep(0.08)
+        await cache.get_or_fetch("k", upstream)
+        return upstream.calls
+
+    assert asyncio.run(scenario()) == 2
+    assert cache.hits == 1 and cache.misses == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = InferenceCache(max_entries=2, ttl=60)
+
+    async def scenario():
+        upstream = Upstream()
+        upstream.release.set()
+        for key in ["a", "b", "a", "c"]:
+            await cache.get_or_fetch(key, upstream)
+        return list(cache._entries)
+
+    assert asyncio.run(scenario()) == ["a", "c"]
+    assert cache.evictions == 1
+
+
+def test_bypass_skips_the_cache():
+    cache = InferenceCache(max_entries=10, ttl=60)
+
+    async def scenario():
+        upstream = Upstream()
+        upstream.release.set()
+        for _ in range(2):
+            await cache.get_or_fetch("k", upstream, bypass=True)
+        return upstream.calls
+
+    assert asyncio.run(scenario()) == 2
+    assert cache.bypassed == 2 and not cache._entries
+
+
+def test_key_normalizes_whitespace_only():
+    make_key = InferenceCache.make_key
+    assert make_key("m", "solar  market\n") == make_key("m", "solar market")
+    assert make_key("m", "solar market") != make_key("m", "Solar market")
+    assert make_key("m", "q", {"top_k": 1}) != make_key("m", "q", {"top_k": 2})
+    assert make_key("m", "q") != make_key("other", "q")
+
+
+def test_query_model_coalesces_onto_one_pooled_request():
+    posts = []
+
+    async def handler(request):
+        posts.append(request.url.path)
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json=[{"label": "ok"}])
+
+    pool = HttpClientPool(max_connections=4)
+    pool._client = httpx.AsyncClient(transport=_CountingTransport(pool, httpx.MockTransport(handler)))
+    service = HuggingFaceService(http_pool=pool, cache=InferenceCache(max_entries=10, ttl=60),
+                                 batcher=InferenceBatcher(enabled=False), rate_limiter=RateLimiter(enabled=False))
+
+    async def scenario():
+        results = await asyncio.gather(*(service.query_model("bert", "same  input") for _ in range(5)))
+        await pool.close()
+        return results
+
+    results = asyncio.run(scenario())
+    assert results == [[{"label": "ok"}]] * 5
+    assert len(posts) == 1
+    assert pool.requests_total == 1 and pool.in_flight == 0
+
+
+def test_pool_counts_failed_requests_down():
+    async def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    pool = HttpClientPool()
+    pool._client = httpx.AsyncClient(transport=_CountingTransport(pool, httpx.MockTransport(handler)))
+
+    async def scenario():
+        with pytest.raises(httpx.ConnectError):
+            await pool.client.post("http://upstream/model", json={})
+        await pool.close()
+
+    asyncio.run(scenario())
+    assert pool.requests_total == 1 and pool.in_flight == 0
@@ -0,0 +1,95 @@
+import asyncio
+from src.agent_orchestrator.api.models import AgentResult, AgentTask, OrchestrationRequest, OrchestrationResponse
+from src.agent_orchestrator.core.admission import AdmissionRejected
+from src.agent_orchestrator.core.event_bus import TERMINAL_EVENT, WorkflowEventBus
+from src.agent_orchestrator.core.job_runner import WorkflowJobRunner
+from src.agent_orchestrator.core.state_manager import StateManager
+from src.agent_orchestrator.core.workflow_engine import WorkflowEngine
+from src.agent_orchestrator.db.models import TaskStatus
+from tests.fixtures.fakes import FakeDbOps
+
+
+class Router:
+    async def route_many(self, tasks):
+        return [task.agent_id for task in tasks]
+
+
+class RejectingScheduler:
+    """Rejects the first `rejections` runs mid-workflow (e.g. the queue-time budget), then succeeds"""
+
+    def __init__(self, rejections: int):
+        self.rejections = rejections
+        self.runs = 0
+
+    async def run(self, routed, runner, reservation=None):
+        self.runs += 1
+        if self.runs <= self.rejections:
+            raise AdmissionRejected("research", 0.0, "queue time budget exceeded")
+        return [AgentResult(agent_id=agent_id, success=True, result={}, task_id=str(i))
+                for i, (_, agent_id) in enumerate(routed)]
+
+
+def make_runner(rejections: int):
+    bus = WorkflowEventBus()
+    engine = WorkflowEngine(task_router=Router(), agent_manager=None, state_manager=StateManager(event_bus=bus),
+                            scheduler=RejectingScheduler(rejections))
+    return WorkflowJobRunner(engine, FakeDbOps(), workers=1), bus
+
+
+def request():
+    return OrchestrationRequest(tasks=[AgentTask(agent_id="research", query="q")], workflow_id="job-1")
+
+
+def test_rejected_attempt_does_not_end_the_job_before_its_retry():
+    runner, bus = make_runner(rejections=1)
+
+    async def scenario():
+        await runner.submit(request())
+        events = asyncio.ensure_future(
+            asyncio.wait_for(_collect(bus.subscribe("job-1", create=True)), 5)
+        )
+        await runner._queue.join()
+        await runner.stop()
+        return await events
+
+    events = asyncio.run(scenario())
+    types = [e.type for e in events]
+    assert types.count(TERMINAL_EVENT) == 1
+    assert types.index("workflow_rejected") < types.index(TERMINAL_EVENT)
+    assert events[-1].data.get("error") is None
+    assert runner.db_ops.executions["job-1"].status == TaskStatus.COMPLETED
+    assert runner.engine.state_manager.workflows["job-1"].finished
+
+
+def test_last_rejection_fails_the_job_and_ends_its_stream():
+    runner, bus = make_runner(rejections=3)
+
+    async def scenario():
+        await runner.submit(request())
+        await runner._queue.join()
+        await runner.stop()
+
+    asyncio.run(scenario())
+    assert runner.db_ops.executions["job-1"].status == TaskStatus.FAILED
+    assert bus.finished("job-1")
+
+
+async def _collect(stream):
+    return [event async for event in stream if event is not None]
+
+
+def test_results_stored_by_the_task_queue_are_referenced_not_copied():
+    runner, _ = make_runner(rejections=0)
+    response = OrchestrationResponse(workflow_id="job-1", elapsed=0.1, results=[
+        AgentResult(agent_id="research", success=True, result={}, task_id="0", queue_wait=0.5, result_id="queued-0"),
+        AgentResult(agent_id="analysis", success=True, result={}, task_id="1"),
+    ])
+
+    async def scenario():
+        await runner.db_ops.create_workflow_execution("job-1")
+        await runner._record(response)
+
+    asyncio.run(scenario())
+    assert list(runner.db_ops.results) == ["job-1:1"]
+    assert runner.db_ops.labels == {"queued-0": ("job-1:0", 0.5)}
+    assert "result_id" not in response.results[0].model_dump()
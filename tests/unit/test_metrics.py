@@ -0,0 +1,80 @@
+import pytest
+from src.agent_orchestrator.core.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_counts_observations_into_upper_bounds():
+    histogram = Histogram((1.0, 2.0, 5.0))
+    for value in (0.5, 1.0, 1.5, 4.0, 10.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.count == 5
+    assert histogram.sum == pytest.approx(17.0)
+    assert histogram.mean == pytest.approx(3.4)
+
+
+def test_quantile_interpolates_within_bucket():
+    histogram = Histogram((1.0, 2.0, 4.0))
+    for value in (0.5, 0.5, 1.5, 1.5):
+        histogram.observe(value)
+    # rank 2 of 4 is the last observation of the first bucket
+    assert histogram.quantile(0.5) == pytest.approx(1.0)
+    # rank 3 is halfway through the second bucket (1, 2]
+    assert histogram.quantile(0.75) == pytest.approx(1.5)
+    assert histogram.quantile(1.0) == pytest.approx(2.0)
+
+
+def test_quantile_in_inf_bucket_returns_largest_bound():
+    histogram = Histogram((1.0, 2.0))
+    histogram.observe(100.0)
+    assert histogram.quantile(0.95) == 2.0
+
+
+def test_quantile_of_empty_histogram_is_none():
+    histogram = Histogram((1.0,))
+    assert histogram.quantile(0.5) is None
+    assert histogram.mean is None
+
+
+def test_render_prometheus_text_format():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.record_task("research", 0.05, True)
+    registry.record_task("research", 0.5, False)
+    registry.record_queue_wait("research", 0.2)
+    registry.add("workflows_in_progress", 1)
+    text = registry.render()
+    lines = text.splitlines()
+
+    assert text.endswith("\n")
+    assert "# TYPE agent_task_duration_seconds histogram" in lines
+    assert 'agent_task_duration_seconds_bucket{agent="research",le="0.1"} 1' in lines
+    assert 'agent_task_duration_seconds_bucket{agent="research",le="1"} 2' in lines
+    assert 'agent_task_duration_seconds_bucket{agent="research",le="+Inf"} 2' in lines
+    assert 'agent_task_duration_seconds_sum{agent="research"} 0.55' in lines
+    assert 'agent_task_duration_seconds_count{agent="research"} 2' in lines
+    assert 'agent_queue_wait_seconds_count{agent="research"} 1' in lines
+    assert "# TYPE agent_tasks_total counter" in lines
+    assert 'agent_tasks_total{agent="research",outcome="failure"} 1' in lines
+    assert 'agent_tasks_total{agent="research",outcome="success"} 1' in lines
+    assert "workflows_in_progress 1" in lines
+    # Metrics without samples are left out entirely
+    assert "hf_requests_total" not in text
+
+
+def test_render_escapes_label_values():
+    registry = MetricsRegistry(buckets=(1.0,))
+    registry.record_retry('a"b\\c\nd', "429")
+    assert 'agent_retries_total{agent="a\\"b\\\\c\\nd",reason="429"} 1' in registry.render().splitlines()
+
+
+def test_agent_summary():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.record_task("analysis", 0.05, True)
+    registry.record_task("analysis", 0.05, True)
+    registry.record_task("analysis", 0.5, False)
+    registry.record_retry("analysis", "503")
+    summary = registry.agent_summary("analysis")
+    assert summary["tasks"] == 3
+    assert summary["failures"] == 1
+    assert summary["success_rate"] == pytest.approx(2 / 3)
+    assert summary["retries"] == 1
+    assert summary["avg_queue_wait"] is None
@@ -0,0 +1,29 @@
+import asyncio
+from pymongo.errors import DuplicateKeyError
+from src.agent_orchestrator.services import rate_limiter as rate_limiter_module
+from src.agent_orchestrator.services.rate_limiter import MongoRateLimiter
+
+
+class RacingCollection:
+    """Raises DuplicateKeyError on the first upsert, like a concurrent first use from another node"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def find_one_and_update(self, *args, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            raise DuplicateKeyError("E11000 duplicate key error")
+        return {"rate": 10.0, "tokens": 4.0, "blocked_until": 0, "granted": True}
+
+
+def test_mongo_reserve_retries_duplicate_key_on_first_use(monkeypatch):
+    collection = RacingCollection()
+    monkeypatch.setattr(rate_limiter_module, "get_collection", lambda model: collection)
+    limiter = MongoRateLimiter(enabled=True, rate=10, burst=5)
+
+    waited = asyncio.run(limiter.acquire("http://upstream/model", "key"))
+
+    assert waited >= 0.0
+    assert collection.calls == 2
+    assert limiter.bucket("http://upstream/model", "key").acquired == 1
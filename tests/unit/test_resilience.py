@@ -0,0 +1,155 @@
+import asyncio
+import random
+import httpx
+import pytest
+from src.agent_orchestrator.services.resilience import (
+    BackoffPolicy, CircuitBreaker, CircuitOpenError, HedgePolicy, ResiliencePolicy
+)
+
+
+def expire(breaker: CircuitBreaker):
+    """Move the breaker's open timestamp back past reset_timeout"""
+    breaker.opened_at -= breaker.reset_timeout + 1
+
+
+def http_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://upstream/model")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.opened == 1
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+    assert breaker.retry_after() == pytest.approx(10, abs=0.5)
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_a_single_probe_then_closes():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    expire(breaker)
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()  # the probe is still in flight
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    expire(breaker)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.opened == 2
+    assert breaker.retry_after() == pytest.approx(10, abs=0.5)
+    assert not breaker.allow()
+
+
+def test_released_probe_lets_the_next_one_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    expire(breaker)
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_backoff_delay_within_full_jitter_bounds(seed):
+    backoff = BackoffPolicy(base_delay=0.5, max_delay=4.0, rng=random.Random(seed))
+    for attempt, ceiling in [(1, 0.5), (2, 1.0), (3, 2.0), (4, 4.0), (8, 4.0)]:
+        assert 0.0 <= backoff.delay(attempt) <= ceiling
+
+
+def test_backoff_honours_retry_after_up_to_max_delay():
+    backoff = BackoffPolicy(base_delay=0.1, max_delay=5.0, rng=random.Random(1))
+    assert backoff.delay(1, retry_after=3.0) >= 3.0
+    assert backoff.delay(1, retry_after=60.0) == 5.0
+    assert backoff.retries == 2
+
+
+def test_policy_retries_then_opens_circuit():
+    policy = ResiliencePolicy(max_attempts=3, backoff=BackoffPolicy(0, 0), hedge=HedgePolicy(enabled=False),
+                              failure_threshold=3, reset_timeout=30)
+    calls = []
+
+    async def attempt(n):
+        calls.append(n)
+        raise http_error(503)
+
+    async def scenario():
+        with pytest.raises(httpx.HTTPStatusError):
+            await policy.call("ep", attempt)
+        with pytest.raises(CircuitOpenError):
+            await policy.call("ep", attempt)
+
+    asyncio.run(scenario())
+    assert calls == [1, 2, 3]
+    assert policy.breaker("ep").state == "open"
+
+
+def test_policy_does_not_retry_client_errors():
+    policy = ResiliencePolicy(max_attempts=3, hedge=HedgePolicy(enabled=False), failure_threshold=1)
+    calls = []
+
+    async def attempt(n):
+        calls.append(n)
+        raise http_error(404)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(policy.call("ep", attempt))
+    assert calls == [1]
+    assert policy.breaker("ep").state == "closed"
+
+
+def test_half_open_probe_is_not_hedged():
+    hedge = HedgePolicy(enabled=True, initial_delay=0.01, min_delay=0.01)
+    policy = ResiliencePolicy(max_attempts=1, hedge=hedge, failure_threshold=1, reset_timeout=10)
+    breaker = policy.breaker("ep")
+    breaker.record_failure()
+    expire(breaker)
+    calls = []
+
+    async def attempt(n):
+        calls.append(n)
+        await asyncio.sleep(0.05)  # slower than the hedge delay
+        return "ok"
+
+    assert asyncio.run(policy.call("ep", attempt)) == "ok"
+    assert calls == [1]
+    assert hedge.hedged == 0
+    assert policy.breaker("ep").state == "closed"
+
+
+def test_prepare_wait_is_not_observed_as_latency():
+    hedge = HedgePolicy(enabled=True, initial_delay=1.0)
+    policy = ResiliencePolicy(max_attempts=1, hedge=hedge)
+
+    async def prepare():
+        await asyncio.sleep(0.1)  # e.g. queueing for a rate-limit token
+
+    async def attempt(n):
+        return "ok"
+
+    assert asyncio.run(policy.call("ep", attempt, prepare=prepare)) == "ok"
+    assert hedge._latencies["ep"][0] < 0.05
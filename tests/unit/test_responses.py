@@ -0,0 +1,64 @@
+import json
+from datetime import datetime
+import numpy as np
+import pytest
+from src.agent_orchestrator.api import responses
+from src.agent_orchestrator.api.models import AgentResult, OrchestrationResponse
+
+
+def strict_loads(body: bytes):
+    def reject(constant):
+        raise ValueError(f"invalid JSON constant {constant}")
+    return json.loads(body, parse_constant=reject)
+
+
+def content():
+    result = {
+        "nan": float("nan"), "inf": float("inf"), "ninf": -np.inf,
+        "np_nan": np.float64("nan"), "np32": np.float32(1.5), "np32_nan": np.float32("nan"),
+        "array": np.array([[1.0, np.nan], [np.inf, 2.0]]), "ints": np.arange(3),
+        "tuple": (1, float("nan")), "when": datetime(2024, 1, 2, 3, 4, 5), 3: "int key",
+    }
+    return OrchestrationResponse(workflow_id="wf", elapsed=float("nan"), results=[
+        AgentResult(agent_id="analysis", success=True, result={"stats": result}, task_id="0"),
+    ])
+
+
+EXPECTED_STATS = {
+    "nan": None, "inf": None, "ninf": None, "np_nan": None, "np32": 1.5, "np32_nan": None,
+    "array": [[1.0, None], [None, 2.0]], "ints": [0, 1, 2], "tuple": [1, None],
+    "when": "2024-01-02T03:04:05", "3": "int key",
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson":
+        if responses.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(responses, "orjson", None)
+    return request.param
+
+
+def test_non_finite_values_are_null_on_both_paths(encoder):
+    body = strict_loads(responses.dumps(content()))
+    assert body["elapsed"] is None
+    assert body["results"][0]["result"]["stats"] == EXPECTED_STATS
+
+
+def test_both_paths_agree():
+    if responses.orjson is None:
+        pytest.skip("orjson not installed")
+    fast = strict_loads(responses.dumps(content()))
+    orjson, responses.orjson = responses.orjson, None
+    try:
+        fallback = strict_loads(responses.dumps(content()))
+    finally:
+        responses.orjson = orjson
+    assert fast == fallback
+
+
+def test_fast_json_response_renders_valid_json(encoder):
+    response = responses.FastJSONResponse({"score": float("nan"), "values": [1.0, float("-inf")]})
+    assert strict_loads(response.body) == {"score": None, "values": [1.0, None]}
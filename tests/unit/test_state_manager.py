@@ -0,0 +1,88 @@
+import asyncio
+from src.agent_orchestrator.core.event_bus import TERMINAL_EVENT, WorkflowEventBus
+from src.agent_orchestrator.core.state_manager import StateManager
+
+
+def age(manager: StateManager, workflow_id: str, seconds: float):
+    """Move a workflow's last update back by seconds"""
+    manager.workflows[workflow_id].updated_at -= seconds
+
+
+def finish(manager: StateManager, workflow_id: str):
+    manager.set_status("step", "completed", workflow_id)
+    manager.workflow_event(workflow_id, TERMINAL_EVENT)
+
+
+def test_state_is_scoped_per_workflow():
+    manager = StateManager(max_workflows=10)
+    manager.set_status("fetch", "running", "wf-1")
+    manager.set_status("fetch", "completed", "wf-2")
+    assert manager.get_status("fetch", "wf-1") == "running"
+    assert manager.get_workflow("wf-2") == {"fetch": "completed"}
+    assert manager.get_status("fetch", "wf-3") == "unknown"
+    assert manager.get_workflow("wf-3") is None
+
+
+def test_finished_workflows_expire_after_finished_ttl():
+    manager = StateManager(max_workflows=10, finished_ttl=60, idle_ttl=3600)
+    finish(manager, "done")
+    manager.set_status("step", "running", "running")
+    age(manager, "done", 61)
+    age(manager, "running", 61)
+    manager.set_status("step", "running", "other")
+    assert set(manager.workflows) == {"running", "other"}
+    assert manager.evictions == 1
+
+
+def test_any_workflow_expires_after_idle_ttl():
+    manager = StateManager(max_workflows=10, finished_ttl=60, idle_ttl=600)
+    manager.set_status("step", "running", "stuck")
+    age(manager, "stuck", 601)
+    manager.set_status("step", "running", "other")
+    assert set(manager.workflows) == {"other"}
+
+
+def test_cap_evicts_least_recently_updated_finished_workflows_only():
+    manager = StateManager(max_workflows=3, finished_ttl=3600, idle_ttl=86400)
+    manager.set_status("step", "running", "running-1")
+    finish(manager, "done-1")
+    finish(manager, "done-2")
+    manager.set_status("step", "running", "running-2")
+    assert list(manager.workflows) == ["running-1", "done-2", "running-2"]
+
+    manager.set_status("step", "running", "running-3")
+    manager.set_status("step", "running", "running-4")
+    # Nothing finished is left to drop: running workflows exceed the cap instead of being evicted
+    assert list(manager.workflows) == ["running-1", "running-2", "running-3", "running-4"]
+    assert manager.evictions == 2
+
+
+def test_evicted_state_is_spilled():
+    spilled = {}
+
+    async def spill(workflow_id, steps):
+        spilled[workflow_id] = steps
+
+    async def scenario():
+        manager = StateManager(max_workflows=1, spill=spill)
+        finish(manager, "done")
+        manager.set_status("step", "running", "next")
+        await asyncio.sleep(0)
+        return manager
+
+    manager = asyncio.run(scenario())
+    assert spilled == {"done": {"step": "completed"}}
+    assert list(manager.workflows) == ["next"]
+
+
+def test_restart_makes_a_finished_workflow_running_again():
+    bus = WorkflowEventBus()
+    manager = StateManager(event_bus=bus, max_workflows=1)
+    finish(manager, "job")
+    assert manager.workflows["job"].finished and bus.finished("job")
+
+    manager.restart("job")
+    assert not manager.workflows["job"].finished
+    assert not bus.finished("job")
+    manager.set_status("step", "running", "other")  # over the cap, but "job" is running now
+    assert "job" in manager.workflows
@@ -0,0 +1,72 @@
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from src.agent_orchestrator.agents.analysis_agent import AnalysisAgent
+from src.agent_orchestrator.agents.streaming_analysis import ColumnAggregates, analyze_stream
+
+REL = 1e-13
+
+
+def frame(rows: int = 257, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "up": np.arange(rows) * 0.5 + rng.normal(size=rows),
+        "noise": rng.normal(100.0, 15.0, size=rows),
+        "down": -np.arange(rows) + rng.normal(scale=3.0, size=rows),
+        "constant": np.full(rows, 4.0),
+        "label": [f"r{i}" for i in range(rows)],
+    })
+    df.loc[rng.choice(rows, size=rows // 10, replace=False), "noise"] = np.nan
+    return df
+
+
+def close(a: float, b: float) -> bool:
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    return a == pytest.approx(b, rel=REL, abs=1e-12)
+
+
+def in_memory(df: pd.DataFrame):
+    agent = AnalysisAgent()
+    df = agent.preprocess_data(df)
+    block = agent.numeric_block(df)
+    return agent.compute_statistics(df, block), agent.detect_trends(df, block)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 13, 100, 256, 257, 1000])
+@pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+def test_stream_matches_in_memory(tmp_path, chunk_size, fmt):
+    df = frame()
+    path = tmp_path / f"data.{fmt}"
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    else:
+        df.to_json(path, orient="records", lines=True)
+    stats, trends = in_memory(pd.read_csv(path) if fmt == "csv" else pd.read_json(path, lines=True))
+
+    summary = analyze_stream(str(path), fmt, chunk_size)
+    assert summary.rows == len(df)
+    assert set(summary.stats) == set(stats)
+    for col, expected in stats.items():
+        for key, value in expected.items():
+            assert close(summary.stats[col][key], value), (col, key)
+    for col, corr in zip(summary.aggregates.columns, summary.aggregates.correlations().tolist()):
+        assert close(corr, trends[col]["corr"]), col
+
+
+def test_merged_chunks_match_single_pass_including_single_row_chunks():
+    values = frame(rows=50).select_dtypes(include=np.number).to_numpy(dtype=np.float64, na_value=np.nan)
+    whole = ColumnAggregates(["up", "noise", "down", "constant"])
+    whole.update(values)
+    chunked = ColumnAggregates(["up", "noise", "down", "constant"])
+    # Boundaries of uneven size, single rows and an empty chunk
+    for start, stop in [(0, 1), (1, 1), (1, 8), (8, 9), (9, 31), (31, 32), (32, 50)]:
+        chunked.update(values[start:stop])
+
+    for col in whole.columns:
+        for key, value in whole.statistics()[col].items():
+            assert close(chunked.statistics()[col][key], value), (col, key)
+    for a, b in zip(chunked.correlations().tolist(), whole.correlations().tolist()):
+        assert close(a, b)
+    assert chunked.rows == whole.rows == 50
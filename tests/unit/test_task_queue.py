@@ -0,0 +1,113 @@
+import asyncio
+from src.agent_orchestrator.api.models import AgentTask, AgentResult
+from src.agent_orchestrator.core.task_queue import InMemoryTaskQueue
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_task(query: str = "q") -> AgentTask:
+    return AgentTask(agent_id="research", query=query)
+
+
+def test_lease_hands_each_task_to_one_worker():
+    async def scenario():
+        queue = InMemoryTaskQueue()
+        task_id = await queue.enqueue("research", make_task())
+        first = await queue.lease("w1", ["research"], lease_seconds=30)
+        second = await queue.lease("w2", ["research"], lease_seconds=30)
+        return task_id, first, second
+
+    task_id, first, second = run(scenario())
+    assert first.task_id == task_id
+    assert first.attempts == 1
+    assert second is None
+
+
+def test_lease_only_matches_served_agents():
+    async def scenario():
+        queue = InMemoryTaskQueue()
+        await queue.enqueue("research", make_task())
+        return await queue.lease("w1", ["analysis"], lease_seconds=30)
+
+    assert run(scenario()) is None
+
+
+def test_expired_lease_is_taken_over_and_old_owner_cannot_complete():
+    async def scenario():
+        queue = InMemoryTaskQueue()
+        await queue.enqueue("research", make_task())
+        first = await queue.lease("w1", ["research"], lease_seconds=0.01)
+        await asyncio.sleep(0.02)
+        second = await queue.lease("w2", ["research"], lease_seconds=30)
+        result = AgentResult(agent_id="research", success=True, result={"v": 1})
+        stale = await queue.complete(first, "w1", result, 0.1)
+        fresh = await queue.complete(second, "w2", result, 0.2)
+        return first, second, stale, fresh, await queue.wait_result(first.task_id, timeout=1)
+
+    first, second, stale, fresh, result = run(scenario())
+    assert second.task_id == first.task_id
+    assert second.attempts == 2
+    assert stale is False
+    assert fresh is True
+    assert result.elapsed == 0.2
+
+
+def test_renew_keeps_the_lease():
+    async def scenario():
+        queue = InMemoryTaskQueue()
+        await queue.enqueue("research", make_task())
+        queued = await queue.lease("w1", ["research"], lease_seconds=0.05)
+        await asyncio.sleep(0.03)
+        renewed = await queue.renew(queued.task_id, "w1", lease_seconds=30)
+        await asyncio.sleep(0.03)
+        return renewed, await queue.lease("w2", ["research"], lease_seconds=30)
+
+    renewed, taken = run(scenario())
+    assert renewed is True
+    assert taken is None
+
+
+def test_complete_delivers_result_to_waiter():
+    async def scenario():
+        queue = InMemoryTaskQueue()
+        task_id = await queue.enqueue("research", make_task())
+        waiter = asyncio.ensure_future(queue.wait_result(task_id, timeout=1))
+        queued = await queue.lease("w1", ["research"], lease_seconds=30)
+        await queue.complete(queued, "w1", AgentResult(agent_id="research", success=True, result={"v": 1}), 0.5)
+        return await waiter
+
+    result = run(scenario())
+    assert result.success is True
+    assert result.result == {"v": 1}
+    assert result.elapsed == 0.5
+
+
+def test_task_fails_after_max_attempts():
+    async def scenario():
+        queue = InMemoryTaskQueue(max_attempts=2)
+        task_id = await queue.enqueue("research", make_task())
+        for worker in ("w1", "w2"):
+            assert await queue.lease(worker, ["research"], lease_seconds=0.01) is not None
+            await asyncio.sleep(0.02)
+        third = await queue.lease("w3", ["research"], lease_seconds=30)
+        return third, await queue.wait_result(task_id, timeout=1)
+
+    third, result = run(scenario())
+    assert third is None
+    assert result.success is False
+    assert "2 expired leases" in result.error
+
+
+def test_wait_result_times_out():
+    async def scenario():
+        queue = InMemoryTaskQueue()
+        task_id = await queue.enqueue("research", make_task())
+        try:
+            await queue.wait_result(task_id, timeout=0.01)
+        except TimeoutError:
+            return True
+        return False
+
+    assert run(scenario())
@@ -0,0 +1,94 @@
+import asyncio
+import random
+import re
+import pytest
+from benchmarks.bench_task_router import naive_route
+from src.agent_orchestrator.api.dependencies import AGENTS
+from src.agent_orchestrator.api.models import AgentTask
+from src.agent_orchestrator.core.keyword_matcher import KeywordMatcher
+from src.agent_orchestrator.core.task_router import TaskRouter
+
+# Queries that mention at most one agent's capabilities: the scored router must agree with the old scan
+CORPUS = [
+    "Research the latest solar panel prices",
+    "web search for EV charging networks",
+    "Find information about lithium supply",
+    "Run a statistics pass over the sales data",
+    "Give me insights from last quarter",
+    "ANALYSIS of churn",
+    "Make a decision on the vendor",
+    "Final recommendation and synthesis, please",
+    "summarise this paragraph",
+    "hello world",
+    "researchers websites searching",  # substrings still count without word boundaries
+    "metadata",
+]
+
+
+def route(router, query):
+    return asyncio.run(router.route_task(AgentTask(agent_id="any", query=query)))
+
+
+@pytest.mark.parametrize("query", CORPUS)
+def test_matches_baseline_router_on_corpus(query):
+    assert route(TaskRouter(agent_capabilities=AGENTS), query) == naive_route(AGENTS, query)
+
+
+def test_more_matches_beat_declaration_order():
+    router = TaskRouter(agent_capabilities=AGENTS)
+    query = "Use the web to back a decision with data statistics and insights"
+    assert naive_route(AGENTS, query) == "research"
+    assert router.score(query) == {"research": 1.0, "analysis": 3.0, "decision": 1.0}
+    assert route(router, query) == "analysis"
+
+
+def test_ties_go_to_earliest_match():
+    router = TaskRouter(agent_capabilities=AGENTS)
+    assert route(router, "a recommendation based on the data") == "decision"
+    assert route(router, "data behind the recommendation") == "analysis"
+
+
+def test_weights_and_word_boundaries():
+    router = TaskRouter(agent_capabilities={"research": {"search": 1.0, "web": 0.5},
+                                            "decision": {"decide": 2.0}}, word_boundaries=True)
+    assert router.score("web search, then decide") == {"research": 1.5, "decision": 2.0}
+    assert router.score("researching websites") == {}
+    assert route(router, "researching websites") == "research"  # default agent
+
+
+def test_route_many_matches_route_task():
+    router = TaskRouter(agent_capabilities=AGENTS)
+    tasks = [AgentTask(agent_id="any", query=q) for q in CORPUS]
+    assert asyncio.run(router.route_many(tasks)) == [route(router, q) for q in CORPUS]
+
+
+def naive_score(table, query, word_boundaries):
+    query = query.lower()
+    scores = {}
+    for agent_id, keywords in table.items():
+        for keyword, weight in keywords.items():
+            pattern = rf"(?<!\w){re.escape(keyword)}(?!\w)" if word_boundaries else re.escape(keyword)
+            if re.search(pattern, query):
+                scores[agent_id] = scores.get(agent_id, 0.0) + weight
+    return scores
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("word_boundaries", [False, True])
+def test_score_matches_naive_scan_on_random_tables(seed, word_boundaries):
+    rng = random.Random(seed)
+    alphabet = "abc"  # small alphabet so keywords overlap and nest
+
+    def word(lo, hi):
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(lo, hi)))
+
+    table = {f"agent_{a}": {word(1, 4): rng.choice([1.0, 0.5, 2.0]) for _ in range(5)} for a in range(6)}
+    router = TaskRouter(agent_capabilities=table, word_boundaries=word_boundaries)
+    for _ in range(50):
+        query = " ".join(word(1, 6) for _ in range(rng.randint(0, 8)))
+        assert router.score(query) == pytest.approx(naive_score(table, query, word_boundaries))
+
+
+def test_matcher_finds_overlapping_and_nested_keywords():
+    matcher = KeywordMatcher(["he", "she", "his", "hers"])
+    assert sorted(matcher.iter_matches("ushers")) == [(1, 1), (2, 0), (2, 3)]
@@ -0,0 +1,155 @@
+import asyncio
+import pytest
+from pymongo.errors import BulkWriteError
+from src.agent_orchestrator.db.write_behind import WriteBehindBuffer
+
+
+class FakeCollection:
+    """bulk_write records each UpdateOne's filter; `fail` is raised (once per entry) before writing"""
+
+    def __init__(self):
+        self.written = []
+        self.failures = []
+        self.during_write = None
+
+    async def bulk_write(self, ops, ordered=True):
+        if self.during_write:
+            hook, self.during_write = self.during_write, None
+            await hook()
+        if self.failures:
+            error = self.failures.pop(0)
+            if isinstance(error, BulkWriteError):
+                index = error.details["writeErrors"][0]["index"]
+                self.written.extend(op._filter["n"] for op in ops[:index])
+            raise error
+        self.written.extend(op._filter["n"] for op in ops)
+
+
+class FakeModel:
+    collection = FakeCollection()
+    inserted = []
+    insert_failures = []
+
+    @classmethod
+    def get_pymongo_collection(cls):
+        return cls.collection
+
+    @classmethod
+    async def insert_many(cls, docs):
+        if cls.insert_failures:
+            raise cls.insert_failures.pop(0)
+        cls.inserted.extend(docs)
+
+
+@pytest.fixture(autouse=True)
+def fresh_model():
+    FakeModel.collection = FakeCollection()
+    FakeModel.inserted = []
+    FakeModel.insert_failures = []
+
+
+def make_buffer(**kwargs):
+    # Flushed by hand; the interval never fires during a test
+    return WriteBehindBuffer(max_batch=1000, flush_interval=60, **kwargs)
+
+
+def update(buffer, n, wait=False):
+    return buffer.update(FakeModel, {"n": n}, {"$set": {"n": n}}, wait=wait)
+
+
+def bulk_error(index):
+    return BulkWriteError({"writeErrors": [{"index": index, "code": 11000, "errmsg": "duplicate key"}]})
+
+
+def test_failed_ops_are_requeued_ahead_of_new_ones():
+    buffer = make_buffer()
+
+    async def scenario():
+        await update(buffer, 1)
+        await update(buffer, 2)
+        FakeModel.collection.failures = [ConnectionError("down")]
+        # Enqueued while the failing flush is in progress
+        FakeModel.collection.during_write = lambda: update(buffer, 3)
+        await buffer.flush()
+        assert [op[2]._filter["n"] for op in buffer._pending] == [1, 2, 3]
+        assert [op[4] for op in buffer._pending] == [1, 1, 0]
+        await buffer.flush()
+        await buffer.close()
+
+    asyncio.run(scenario())
+    assert FakeModel.collection.written == [1, 2, 3]
+    assert buffer.stats()["retried"] == 2
+    assert buffer.stats()["dropped"] == 0
+
+
+def test_bulk_write_error_keeps_the_prefix_and_retries_the_rest():
+    buffer = make_buffer()
+
+    async def scenario():
+        for n in range(4):
+            await update(buffer, n)
+        FakeModel.collection.failures = [bulk_error(1)]
+        await buffer.flush()
+        # 0 is stored, 1 was rejected by the server and is not retried, 2 and 3 go again
+        assert [op[2]._filter["n"] for op in buffer._pending] == [2, 3]
+        await buffer.flush()
+        await buffer.close()
+
+    asyncio.run(scenario())
+    assert FakeModel.collection.written == [0, 2, 3]
+    assert buffer.stats()["dropped"] == 1
+    assert buffer.stats()["ops_written"] == 3
+
+
+def test_ops_are_dropped_after_max_retries():
+    buffer = make_buffer(max_retries=2)
+
+    async def scenario():
+        await update(buffer, 1)
+        FakeModel.collection.failures = [ConnectionError("down")] * 3
+        for _ in range(3):
+            await buffer.flush()
+        assert buffer._pending == []
+        await buffer.close()
+
+    asyncio.run(scenario())
+    assert FakeModel.collection.written == []
+    assert buffer.stats()["retried"] == 2
+    assert buffer.stats()["dropped"] == 1
+    assert buffer.stats()["errors"] == 3
+
+
+def test_durable_writes_get_the_error_and_are_not_retried():
+    buffer = make_buffer()
+
+    async def scenario():
+        FakeModel.insert_failures = [ConnectionError("down")]
+        with pytest.raises(ConnectionError):
+            await buffer.insert(FakeModel(), wait=True)
+        FakeModel.collection.failures = [bulk_error(0)]
+        with pytest.raises(BulkWriteError):
+            await update(buffer, 7, wait=True)
+        await update(buffer, 8, wait=True)
+        await buffer.close()
+
+    asyncio.run(scenario())
+    assert FakeModel.inserted == []
+    assert FakeModel.collection.written == [8]
+    assert buffer.stats()["retried"] == 0
+    assert buffer.stats()["dropped"] == 0
+
+
+def test_durable_bulk_prefix_succeeds():
+    buffer = make_buffer()
+
+    async def scenario():
+        FakeModel.collection.failures = [bulk_error(1)]
+        first = asyncio.ensure_future(update(buffer, 1, wait=True))
+        second = asyncio.ensure_future(update(buffer, 2, wait=True))
+        results = await asyncio.gather(first, second, return_exceptions=True)
+        await buffer.close()
+        return results
+
+    first, second = asyncio.run(scenario())
+    assert first is None
+    assert isinstance(second, BulkWriteError)